@@ -2,6 +2,7 @@ from qib import (
     lattice,
     field,
     operator,
+    linalg,
     circuit,
     transform,
     algorithms,
@@ -1,2 +1,3 @@
 from qib.algorithms import vqe
 from qib.algorithms import qubitization
+from qib.algorithms import dmrg
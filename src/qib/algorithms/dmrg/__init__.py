@@ -0,0 +1 @@
+from qib.algorithms.dmrg.dmrg import DMRG
@@ -0,0 +1,148 @@
+import math
+import numpy as np
+from qib.operator import FermiHubbardHamiltonian
+from qib.transform import jordan_wigner_encode_field_operator
+from qib.linalg import lanczos
+from qib.tensor_network import MatrixProductState, MatrixProductOperator
+from qib.tensor_network.mps import _truncation_rank
+
+
+class DMRG:
+    """
+    Two-site density matrix renormalization group (DMRG) algorithm
+    for approximating the ground state of a Hamiltonian as matrix product state.
+
+    Virtual bonds are truncated to at most `max_bond_dim`, discarding the
+    smallest singular values with relative weight up to `cutoff`.
+    Sweeps are performed until the energy change falls below `tol`
+    or `num_sweeps` is reached. The local eigenvalue problems are solved by
+    Lanczos iterations with `num_lanczos` steps, starting from the current state.
+    """
+    def __init__(self, max_bond_dim: int=32, num_sweeps: int=10, tol: float=1e-10,
+                 cutoff: float=1e-14, num_lanczos: int=20, rng: np.random.Generator=None):
+        self.max_bond_dim = max_bond_dim
+        self.num_sweeps = num_sweeps
+        self.tol = tol
+        self.cutoff = cutoff
+        self.num_lanczos = num_lanczos
+        if rng is None:
+            rng = np.random.default_rng()
+        self.rng = rng
+        # energies after each sweep
+        self.energies = []
+
+    def run(self, hamiltonian):
+        """
+        Approximate the ground state of `hamiltonian`, which can be a `MatrixProductOperator`,
+        an operator providing an `as_mpo` method (like `IsingHamiltonian`, `HeisenbergHamiltonian`
+        or `PauliOperator`), or a `FermiHubbardHamiltonian` (via the Jordan-Wigner encoding).
+
+        Returns the ground state energy and the ground state as `MatrixProductState`.
+        """
+        mpo = _as_mpo(hamiltonian)
+        n = mpo.nsites
+        dims = [w.shape[1] for w in mpo.tensors]
+        self.energies = []
+        if n == 1:
+            evals, evecs = np.linalg.eigh(mpo.tensors[0][0, :, :, 0])
+            self.energies.append(evals[0])
+            return evals[0], MatrixProductState([evecs[:, 0].reshape((1, dims[0], 1))])
+        # random initial state with maximal bond dimensions
+        bond_dims = [1] + [min(self.max_bond_dim, math.prod(dims[:i + 1]), math.prod(dims[i + 1:]))
+                           for i in range(n - 1)] + [1]
+        tensors = [self.rng.normal(size=(bond_dims[i], dims[i], bond_dims[i + 1])) for i in range(n)]
+        mps = MatrixProductState(tensors, center=n - 1).orthogonalize(0)
+        mps.tensors[0] /= mps.norm()
+        # cached left and right environments, with axes (bra bond, MPO bond, ket bond)
+        lenv = [None for _ in range(n)]
+        renv = [None for _ in range(n)]
+        lenv[0] = np.ones((1, 1, 1))
+        renv[n - 1] = np.ones((1, 1, 1))
+        for i in reversed(range(1, n)):
+            renv[i - 1] = _update_right_environment(renv[i], mps.tensors[i], mpo.tensors[i])
+        energy = np.inf
+        for _ in range(self.num_sweeps):
+            # left-to-right sweep
+            for i in range(n - 1):
+                e = self._optimize_two_sites(mps, mpo, lenv[i], renv[i + 1], i, True)
+                lenv[i + 1] = _update_left_environment(lenv[i], mps.tensors[i], mpo.tensors[i])
+            # right-to-left sweep
+            for i in reversed(range(n - 1)):
+                e = self._optimize_two_sites(mps, mpo, lenv[i], renv[i + 1], i, False)
+                renv[i] = _update_right_environment(renv[i + 1], mps.tensors[i + 1], mpo.tensors[i + 1])
+            self.energies.append(e)
+            if abs(energy - e) < self.tol:
+                energy = e
+                break
+            energy = e
+        return energy, mps
+
+    def _optimize_two_sites(self, mps: MatrixProductState, mpo: MatrixProductOperator,
+                            lenv: np.ndarray, renv: np.ndarray, i: int, move_right: bool):
+        """
+        Optimize the MPS tensors at sites `i` and `i + 1`, and move the
+        orthogonality center to site `i + 1` (if `move_right`) or `i`.
+        """
+        w1 = mpo.tensors[i]
+        w2 = mpo.tensors[i + 1]
+        theta = np.tensordot(mps.tensors[i], mps.tensors[i + 1], axes=(2, 0))
+        shape = theta.shape
+
+        def matvec(x):
+            x = x.reshape(shape)
+            # contract with left environment, MPO tensors and right environment
+            y = np.tensordot(lenv, x, axes=(2, 0))
+            y = np.tensordot(y, w1, axes=((1, 2), (0, 2)))
+            y = np.tensordot(y, w2, axes=((4, 1), (0, 2)))
+            y = np.tensordot(y, renv, axes=((1, 4), (2, 1)))
+            return y.reshape(-1)
+
+        e, theta = lanczos(matvec, theta.reshape(-1), self.num_lanczos)
+        theta = theta.reshape((shape[0]*shape[1], shape[2]*shape[3]))
+        u, s, vh = np.linalg.svd(theta, full_matrices=False)
+        chi, weight = _truncation_rank(s, self.max_bond_dim, self.cutoff)
+        mps.truncation_error += weight
+        u = u[:, :chi]
+        s = s[:chi] / np.linalg.norm(s[:chi])
+        vh = vh[:chi, :]
+        if move_right:
+            mps.tensors[i] = u.reshape((shape[0], shape[1], chi))
+            mps.tensors[i + 1] = (s[:, None] * vh).reshape((chi, shape[2], shape[3]))
+            mps.center = i + 1
+        else:
+            mps.tensors[i] = (u * s).reshape((shape[0], shape[1], chi))
+            mps.tensors[i + 1] = vh.reshape((chi, shape[2], shape[3]))
+            mps.center = i
+        return e
+
+
+def _as_mpo(hamiltonian) -> MatrixProductOperator:
+    """
+    Obtain the matrix product operator representation of a Hamiltonian.
+    """
+    if isinstance(hamiltonian, MatrixProductOperator):
+        return hamiltonian
+    if isinstance(hamiltonian, FermiHubbardHamiltonian):
+        return jordan_wigner_encode_field_operator(hamiltonian.as_field_operator()).as_mpo()
+    if hasattr(hamiltonian, "as_mpo"):
+        return hamiltonian.as_mpo()
+    raise ValueError(f"cannot construct matrix product operator for Hamiltonian of type {type(hamiltonian)}")
+
+
+def _update_left_environment(lenv: np.ndarray, a: np.ndarray, w: np.ndarray):
+    """
+    Contract left environment with MPS tensor `a`, its conjugate and MPO tensor `w`.
+    """
+    t = np.tensordot(lenv, a, axes=(2, 0))
+    t = np.tensordot(t, w, axes=((1, 2), (0, 2)))
+    return np.tensordot(a.conj(), t, axes=((0, 1), (0, 2))).transpose((0, 2, 1))
+
+
+def _update_right_environment(renv: np.ndarray, a: np.ndarray, w: np.ndarray):
+    """
+    Contract right environment with MPS tensor `a`, its conjugate and MPO tensor `w`.
+    """
+    t = np.tensordot(a, renv, axes=(2, 2))
+    t = np.tensordot(w, t, axes=((2, 3), (1, 3)))
+    return np.tensordot(a.conj(), t, axes=((1, 2), (1, 3)))
+
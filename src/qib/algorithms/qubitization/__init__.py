@@ -1,2 +1,3 @@
 from qib.algorithms.qubitization.eigenvalue_transformation import EigenvalueTransformation
 from qib.algorithms.qubitization.projector_controlled_phase_shift import ProjectorControlledPhaseShift
+from qib.algorithms.qubitization.qsp_phases import qsp_phase_angles, time_evolution_coefficients, eigenstate_filter_coefficients
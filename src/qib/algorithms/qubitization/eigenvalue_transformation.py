@@ -1,8 +1,9 @@
 import numpy as np
 from typing import Sequence, Union
 from qib.field import Qubit
-from qib.operator import Gate
+from qib.operator import Gate, BlockEncodingGate
 from qib.algorithms.qubitization.projector_controlled_phase_shift import ProjectorControlledPhaseShift
+from qib.algorithms.qubitization.qsp_phases import qsp_phase_angles
 from qib.circuit import Circuit
 
 
@@ -29,6 +30,15 @@ class EigenvalueTransformation:
         else:
             self.theta_seq = theta_seq
 
+    def set_polynomial(self, coeffs: Sequence[float], tol: float=1e-12, maxiter: int=1000):
+        """
+        Set the angles theta such that the real part of the transformed polynomial
+        is the polynomial with Chebyshev coefficients `coeffs` (see `qsp_phase_angles`).
+        """
+        if not isinstance(self.block_encoding, BlockEncodingGate):
+            raise ValueError("computing the angles requires a block encoding gate")
+        self.theta_seq = qsp_phase_angles(coeffs, self.block_encoding.method, tol, maxiter)
+
     @property
     def num_wires(self):
         """
@@ -66,31 +76,121 @@ class EigenvalueTransformation:
         Generate the matrix representation of the eigenvalue transformation.
         Format: |enc_extra> x |encoded_state>
         Auxiliary wire from 'auxiliary' method is not taken into account.
+
+        For a `BlockEncodingGate`, the matrix is assembled from the
+        transformation restricted to the invariant subspaces (see `spectral_blocks`).
         """
         if not self.theta_seq:
             raise ValueError("the angles 'theta' have not been initialized.")
+        if self._supports_spectral():
+            _, evecs, blocks = self.spectral_blocks()
+            return np.block([[(evecs * blocks[:, a, b]) @ evecs.conj().T for b in range(2)] for a in range(2)])
         matrix = np.identity(2**self.block_encoding.num_wires)
         num_particles = self.block_encoding.num_wires - self.block_encoding.num_aux_qubits
         id_for_projector = np.identity(2**num_particles)
         U_inv_matrix = self.block_encoding.inverse().as_matrix()
         U_matrix = self.block_encoding.as_matrix()
+        for theta, inv in self._sequence():
+            self.processing.set_theta(theta)
+            matrix = matrix @ np.kron(self.processing.as_matrix(), id_for_projector) \
+                            @ (U_inv_matrix if inv else U_matrix)
+        return matrix
+
+    def apply(self, psi: np.ndarray, method: str = "state"):
+        """
+        Apply the eigenvalue transformation to the state vector `psi` (or to each column of `psi`),
+        using the same format as `as_matrix`.
+
+        With method "state", the block encoding and the projector-controlled phase shifts
+        are applied alternately to the state, without forming any matrix of the full system.
+        With method "spectral", the state is transformed into the eigenbasis of the
+        encoded operator and the transformation is applied within the invariant
+        two-dimensional subspaces (see `spectral_blocks`).
+        """
+        if not self.theta_seq:
+            raise ValueError("the angles 'theta' have not been initialized.")
+        psi = np.asarray(psi)
+        dim = 2**self.block_encoding.num_wires
+        if psi.shape[0] != dim:
+            raise ValueError(f"state must have leading dimension {dim}, received {psi.shape[0]}")
+        if method == "spectral":
+            if not self._supports_spectral():
+                raise ValueError("spectral method requires a block encoding gate with a single encoding qubit")
+            _, evecs, blocks = self.spectral_blocks()
+            n = len(blocks)
+            c = np.stack((evecs.conj().T @ psi[:n], evecs.conj().T @ psi[n:]), axis=-1)
+            c = np.einsum(blocks, [0, 1, 2], c, [0, Ellipsis, 2], [0, Ellipsis, 1])
+            return np.concatenate((evecs @ c[..., 0], evecs @ c[..., 1]), axis=0)
+        if method != "state":
+            raise ValueError(f"invalid method '{method}', must be 'state' or 'spectral'")
+        if isinstance(self.block_encoding, BlockEncodingGate):
+            U_apply = self.block_encoding.apply
+            U_inv_apply = self.block_encoding.inverse().apply
+        else:
+            U_matrix = self.block_encoding.as_matrix()
+            U_inv_matrix = self.block_encoding.inverse().as_matrix()
+            U_apply = lambda x: U_matrix @ x
+            U_inv_apply = lambda x: U_inv_matrix @ x
+        # auxiliary (encoding) qubits correspond to the slowest varying indices
+        num_aux = 2**self.block_encoding.num_aux_qubits
+        psi = psi.astype(complex)
+        # rightmost factor acts first
+        for theta, inv in reversed(self._sequence()):
+            psi = U_inv_apply(psi) if inv else U_apply(psi)
+            self.processing.set_theta(theta)
+            phases = self.processing.as_diagonal()
+            psi = (psi.reshape((num_aux, -1) + psi.shape[1:]) *
+                   phases.reshape((num_aux,) + (psi.ndim)*(1,))).reshape(psi.shape)
+        return psi
+
+    def spectral_blocks(self):
+        """
+        Evaluate the eigenvalue transformation within the two-dimensional subspaces
+        spanned by |0>|v> and |1>|v>, for each eigenvector |v> of the encoded operator,
+        which are invariant under the block encoding (qubitization).
+
+        Returns the eigenvalues and eigenvectors of the encoded operator and the
+        2x2 blocks of the transformation, as array of shape (2^n, 2, 2);
+        the [0, 0] entries are the transformed polynomial evaluated at the eigenvalues.
+        """
+        if not self.theta_seq:
+            raise ValueError("the angles 'theta' have not been initialized.")
+        if not self._supports_spectral():
+            raise ValueError("spectral blocks require a block encoding gate with a single encoding qubit")
+        evals, evecs, U_blocks = self.block_encoding.invariant_blocks()
+        _, _, U_inv_blocks = self.block_encoding.inverse().invariant_blocks()
+        blocks = np.broadcast_to(np.identity(2, dtype=complex), U_blocks.shape)
+        for theta, inv in self._sequence():
+            self.processing.set_theta(theta)
+            phases = self.processing.as_diagonal()
+            blocks = blocks @ (phases[:, None] * (U_inv_blocks if inv else U_blocks))
+        return evals, evecs, blocks
+
+    def _sequence(self):
+        """
+        List of (theta, inverse) pairs of the processing angle and whether the
+        inverse block encoding is used, in the order of the matrix product.
+        """
+        seq = []
         if len(self.theta_seq) % 2 == 0:
             dim = len(self.theta_seq) // 2
             start = 0
         else:
             dim = (len(self.theta_seq)-1) // 2
-            self.processing.set_theta(self.theta_seq[0])
-            matrix = matrix @ np.kron(self.processing.as_matrix(), id_for_projector) \
-                            @ U_matrix
+            seq.append((self.theta_seq[0], False))
             start = 1
-        for i in range(start, dim):
-            self.processing.set_theta(self.theta_seq[2*i-start])
-            matrix = matrix @ np.kron(self.processing.as_matrix(), id_for_projector) \
-                            @ U_inv_matrix
-            self.processing.set_theta(self.theta_seq[2*i+1-start])
-            matrix = matrix @ np.kron(self.processing.as_matrix(), id_for_projector) \
-                            @ U_matrix
-        return matrix
+        for i in range(start, dim + start):
+            seq.append((self.theta_seq[2*i-start], True))
+            seq.append((self.theta_seq[2*i+1-start], False))
+        return seq
+
+    def _supports_spectral(self):
+        """
+        Whether the transformation can be evaluated within the invariant subspaces of the block encoding.
+        """
+        return (isinstance(self.block_encoding, BlockEncodingGate)
+                and self.block_encoding.num_aux_qubits == 1
+                and len(self.processing.projection_state) == 1)
 
     def as_circuit(self):
         """
@@ -103,21 +203,8 @@ class EigenvalueTransformation:
         if not self.theta_seq:
             raise ValueError("the angles 'theta' have not been initialized.")
         circuit = Circuit()
-
-        if len(self.theta_seq) % 2 == 0:
-            dim = len(self.theta_seq) // 2
-            start = 0
-        else:
-            dim = (len(self.theta_seq)-1)//2
-            self.processing.set_theta(self.theta_seq[0])
-            circuit.prepend_circuit(self.processing.as_circuit())
-            circuit.prepend_gate(self.block_encoding)
-            start = 1
-        for i in range(start, dim):
-            self.processing.set_theta(self.theta_seq[2*i-start])
-            circuit.prepend_circuit(self.processing.as_circuit())
-            circuit.prepend_gate(self.block_encoding.inverse())
-            self.processing.set_theta(self.theta_seq[2*i+1-start])
+        for theta, inv in self._sequence():
+            self.processing.set_theta(theta)
             circuit.prepend_circuit(self.processing.as_circuit())
-            circuit.prepend_gate(self.block_encoding)
+            circuit.prepend_gate(self.block_encoding.inverse() if inv else self.block_encoding)
         return circuit
@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.linalg import expm
 from typing import Sequence, Union
 from qib.field import Qubit
 from qib.operator import ControlledGate, PauliXGate, RzGate, PhaseFactorGate
@@ -106,15 +105,20 @@ class ProjectorControlledPhaseShift:
         Generate the matrix representation of the controlled gate.
         The extra wire from 'auxiliary' method is not taken into account.
         """
+        return np.diag(self.as_diagonal())
+
+    def as_diagonal(self):
+        """
+        Generate the diagonal entries of the (diagonal) matrix representation of the controlled gate,
+        i.e., the phase factor exp(i theta) for the projection state and exp(-i theta) otherwise.
+        """
         size_enc = len(self.projection_state)
         if any(s != 0 for s in self.projection_state):
             raise RuntimeError("The projection state can only have entries equal to 0.")
         binary_index = int(''.join(map(str,self.projection_state)), 2)
-        basis_state = np.zeros((2**size_enc))
-        basis_state[binary_index] = 1
-        matrix = np.outer(basis_state, basis_state)
-        mat_ref = expm(1j*self.theta*(2*matrix - np.identity(2**size_enc)))
-        return mat_ref
+        diag = np.full(2**size_enc, np.exp(-1j*self.theta))
+        diag[binary_index] = np.exp(1j*self.theta)
+        return diag
 
     def as_circuit(self):
         """
@@ -0,0 +1,196 @@
+import numpy as np
+from numpy.polynomial import chebyshev
+from scipy.optimize import minimize
+from scipy.special import jv
+from typing import Sequence
+from qib.operator import BlockEncodingMethod
+
+
+def qsp_phase_angles(coeffs: Sequence[float], method: BlockEncodingMethod = BlockEncodingMethod.Wx,
+                     tol: float = 1e-12, maxiter: int = 1000):
+    """
+    Find the angles `theta_seq` of an `EigenvalueTransformation` such that the real part
+    of the transformed polynomial (the top-left entry of the spectral blocks) is
+    the polynomial f(x) = sum_k coeffs[k] T_k(x) in the Chebyshev basis.
+
+    The degree of the transformation is `len(coeffs) - 1`, and f must have the parity
+    of the degree and satisfy |f(x)| < 1 on [-1, 1]. The symmetric phase factors
+    of the standard quantum signal processing (QSP) convention are optimized by
+    a quasi-Newton method with analytic gradients, starting from half the Chebyshev
+    coefficients, and converted to the angles for the block encoding `method`.
+
+    Reference:
+        Yulong Dong, Xiang Meng, K. Birgitta Whaley, Lin Lin
+        Efficient phase-factor evaluation in quantum signal processing
+        Phys. Rev. A 103, 042419 (2021)
+    """
+    coeffs = np.asarray(coeffs, dtype=float)
+    d = len(coeffs) - 1
+    if d < 1:
+        raise ValueError("polynomial must have degree at least 1")
+    if np.any(np.abs(coeffs[(d + 1) % 2::2]) > tol):
+        raise ValueError(f"polynomial must have the parity of its degree {d}")
+    phi = _qsp_symmetric_phases(coeffs, tol, maxiter)
+    return _qsp_to_theta_seq(phi, method)
+
+
+def _qsp_symmetric_phases(coeffs: np.ndarray, tol: float, maxiter: int):
+    """
+    Find symmetric phase factors phi_0, ..., phi_d of the standard QSP convention
+    e^{i phi_0 Z} W(x) e^{i phi_1 Z} ... W(x) e^{i phi_d Z}, with W(x) = e^{i arccos(x) X},
+    such that the imaginary part of the top-left entry is the polynomial with Chebyshev coefficients `coeffs`.
+    """
+    d = len(coeffs) - 1
+    # number of independent phases
+    dr = (d + 2) // 2
+    # positive Chebyshev nodes
+    x = np.cos((2*np.arange(1, dr + 1) - 1) * np.pi / (4*dr))
+    f = chebyshev.chebval(x, coeffs)
+    # initialization from Chebyshev coefficients (linear response for small phases)
+    phi0 = np.array([coeffs[d - 2*j] / 2 if d - 2*j > 0 else coeffs[0] for j in range(dr)])
+
+    def loss(phi_red):
+        phi = _qsp_full_phases(phi_red, d)
+        a, b = _qsp_unitary(phi, x)
+        r = a.imag - f
+        # gradient with respect to full phases
+        g = _qsp_gradient(phi, x, a, b) @ r
+        # symmetrize
+        g_red = g[:dr] + g[::-1][:dr]
+        if d % 2 == 0:
+            # middle phase only appears once
+            g_red[-1] = g[dr - 1]
+        return 0.5 * np.dot(r, r) / dr, g_red / dr
+
+    res = minimize(loss, phi0, jac=True, method="L-BFGS-B",
+                   options={ "maxiter": maxiter, "ftol": 0.25*tol**2, "gtol": tol**2 })
+    phi = _qsp_full_phases(res.x, d)
+    a, _ = _qsp_unitary(phi, x)
+    err = np.linalg.norm(a.imag - f, np.inf)
+    # accept residuals limited by floating-point precision
+    if err > np.sqrt(tol):
+        raise RuntimeError(f"QSP phase factor optimization did not converge, remaining error {err}")
+    return phi
+
+
+def _qsp_full_phases(phi_red: np.ndarray, d: int):
+    """
+    Construct the full symmetric phase factors from the independent ones.
+    """
+    if d % 2 == 0:
+        return np.concatenate((phi_red, phi_red[-2::-1]))
+    return np.concatenate((phi_red, phi_red[::-1]))
+
+
+def _qsp_unitary(phi: np.ndarray, x: np.ndarray):
+    """
+    Evaluate the QSP unitary [[a, b], [-b^*, a^*]] with phase factors `phi`
+    at the points `x`, returning `a` and `b` as vectors.
+    """
+    s = np.sqrt(1 - x**2)
+    a = np.full(len(x), np.exp(1j*phi[0]))
+    b = np.zeros(len(x), dtype=complex)
+    for p in phi[1:]:
+        # multiply by W(x), then by e^{i p Z}
+        a, b = (a*x + 1j*s*b) * np.exp(1j*p), (1j*s*a + b*x) * np.exp(-1j*p)
+    return a, b
+
+
+def _qsp_gradient(phi: np.ndarray, x: np.ndarray, a: np.ndarray, b: np.ndarray):
+    """
+    Derivatives of the imaginary part of the top-left entry of the QSP unitary
+    (with entries `a` and `b`) with respect to the phase factors, as matrix of shape (len(phi), len(x)).
+    """
+    s = np.sqrt(1 - x**2)
+    grad = np.zeros((len(phi), len(x)))
+    # prefix product before phase j
+    pa = np.ones(len(x), dtype=complex)
+    pb = np.zeros(len(x), dtype=complex)
+    for j, p in enumerate(phi):
+        # suffix product starting at phase j, computed as prefix^dagger @ U
+        sa = pa.conj()*a + pb*b.conj()
+        sb = pa.conj()*b - pb*a.conj()
+        # derivative of top-left entry is i (pa sa + pb sb^*)
+        grad[j] = (pa*sa + pb*sb.conj()).real
+        pa, pb = pa * np.exp(1j*p), pb * np.exp(-1j*p)
+        if j < len(phi) - 1:
+            pa, pb = pa*x + 1j*s*pb, 1j*s*pa + pb*x
+    return grad
+
+
+def _qsp_to_theta_seq(phi: np.ndarray, method: BlockEncodingMethod):
+    """
+    Convert symmetric phase factors of the standard QSP convention (with `Im P = f`)
+    to the angles of an `EigenvalueTransformation` with block encoding `method` (with `Re P = f`).
+
+    Each block encoding factor (or its inverse) is represented as c e^{i alpha Z} W(x) e^{i alpha Z}.
+    """
+    d = len(phi) - 1
+    factors = {
+        BlockEncodingMethod.Wx:  ((1, 0.), (-1, np.pi/2)),
+        BlockEncodingMethod.Wxi: ((-1, np.pi/2), (1, 0.)),
+        BlockEncodingMethod.R:   ((-1j, np.pi/4), (-1j, np.pi/4)),
+    }
+    if method not in factors:
+        raise NotImplementedError(f"encoding method {method} not supported yet")
+    # the last factor is the block encoding itself, preceded by alternating inverse and non-inverse factors
+    c = [factors[method][(d - 1 - k) % 2][0] for k in range(d)]
+    alpha = [factors[method][(d - 1 - k) % 2][1] for k in range(d)]
+    phi = np.array(phi, dtype=float)
+    # shift outer phases such that the real part of the overall polynomial is the target
+    gamma = np.prod(c)
+    beta = np.angle(-1j / gamma) / 2
+    phi[0] += beta
+    phi[d] += beta
+    # the last factor contributes the trailing phase alpha[d - 1];
+    # conjugation by e^{i (phi_d - alpha[d - 1]) Z} leaves the top-left entry invariant
+    phi[0] += phi[d] - alpha[d - 1]
+    theta = [phi[k] - alpha[k] - (alpha[k - 1] if k > 0 else 0) for k in range(d)]
+    return [float(np.mod(t, 2*np.pi)) for t in theta]
+
+
+def time_evolution_coefficients(t: float, degree: int):
+    """
+    Chebyshev coefficients of the Jacobi-Anger expansions of cos(t x) and sin(t x),
+    truncated to the largest even and odd degree not exceeding `degree`, respectively.
+    """
+    k = np.arange(degree + 1)
+    c = 2 * jv(k, t) * np.where(k % 4 < 2, 1, -1)
+    c[0] /= 2
+    ccos = np.where(k % 2 == 0, c, 0)
+    csin = np.where(k % 2 == 1, c, 0)
+    return ccos[:degree + 1 - degree % 2], csin[:degree + degree % 2]
+
+
+def eigenstate_filter_coefficients(delta: float, degree: int):
+    """
+    Chebyshev coefficients of the eigenstate filtering polynomial
+    R(x) = T_l(-1 + 2 (x^2 - delta^2) / (1 - delta^2)) / T_l(-1 - 2 delta^2 / (1 - delta^2))
+    of even degree 2 l (largest even degree not exceeding `degree`), which is 1 at x = 0
+    and exponentially small for delta <= |x| <= 1.
+
+    Reference:
+        Lin Lin, Yu Tong
+        Near-optimal ground state preparation
+        Quantum 4, 372 (2020)
+    """
+    if not 0 < delta < 1:
+        raise ValueError("'delta' must be between 0 and 1")
+    l = degree // 2
+    if l < 1:
+        raise ValueError("degree must be at least 2")
+    a0 = np.arccosh(1 + 2*delta**2 / (1 - delta**2))
+
+    def filter_func(x):
+        y = -1 + 2*(x**2 - delta**2) / (1 - delta**2)
+        r = np.empty_like(y)
+        inside = y < -1
+        # ratio of hyperbolic cosines, avoiding overflow
+        a = np.arccosh(-y[inside])
+        r[inside] = np.exp(l*(a - a0)) * (1 + np.exp(-2*l*a)) / (1 + np.exp(-2*l*a0))
+        r[~inside] = (-1)**l * np.cos(l*np.arccos(y[~inside])) * 2*np.exp(-l*a0) / (1 + np.exp(-2*l*a0))
+        return r
+
+    c = chebyshev.chebinterpolate(filter_func, 2*l)
+    c[1::2] = 0
+    return c
@@ -1,9 +1,8 @@
 from copy import copy
 from typing import Sequence
-import numpy as np
 from qib.operator import Gate
 from qib.field import Field
-from qib.tensor_network import SymbolicTensor, SymbolicTensorNetwork, TensorNetwork
+from qib.tensor_network import CircuitNetworkBuilder
 from qib.util import map_particle_to_wire
 
 
@@ -72,36 +71,21 @@ class Circuit:
             mat = g.as_circuit_matrix(fields) @ mat
         return mat
 
-    def as_tensornet(self, fields: Sequence[Field]):
+    def as_tensornet(self, fields: Sequence[Field], debug=False):
         """
         Generate a tensor network representation of the circuit.
+
+        If `debug` is True, the consistency of the network is checked after appending each gate.
         """
-        # create a tensor network consisting of identity wires
-        stn = SymbolicTensorNetwork()
-        # virtual tensor for open axes
         wiredims = []
         for f in fields:
             wiredims += f.lattice.nsites * [f.local_dim]
-        # total number of wires
-        nwires = len(wiredims)
-        # connect input and output open axes
-        stn.add_tensor(SymbolicTensor(-1, 2*wiredims, 2*list(range(nwires)), None))
-        stn.generate_bonds()
-        net = TensorNetwork(stn, {})
-        assert net.is_consistent()
+        # start from a tensor network consisting of identity wires
+        builder = CircuitNetworkBuilder(wiredims, debug)
         for gate in self.gates:
             prtcl = gate.particles()
             iwire = [map_particle_to_wire(fields, p) for p in prtcl]
             if any(iw < 0 for iw in iwire):
                 raise RuntimeError("particle not found among fields")
-            gate_net = gate.as_tensornet()
-            assert gate_net.num_open_axes == 2*len(prtcl)
-            net.merge(gate_net, list(zip(iwire, list(range(len(prtcl), 2*len(prtcl))))))
-            # permute open axes
-            perm = list(range(2*nwires))
-            for i in iwire:
-                perm.remove(i)
-            perm += iwire
-            net.transpose(np.argsort(perm))
-            assert net.is_consistent()
-        return net
+            builder.append(gate.as_tensornet(), iwire)
+        return builder.build()
@@ -1,4 +1,6 @@
 import abc
+import numpy as np
+from scipy import sparse
 
 
 class AbstractLattice(abc.ABC):
@@ -26,6 +28,37 @@ class AbstractLattice(abc.ABC):
         Construct the adjacency matrix, indicating nearest neighbors.
         """
 
+    def sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format.
+        """
+        return self._memoize("sparse_adjacency", lambda: sparse.csr_matrix(self.adjacency_matrix())).copy()
+
+    def edges(self) -> np.ndarray:
+        """
+        List the nearest neighbor edges (i, j) with i < j,
+        as array of shape (number of edges, 2) sorted lexicographically.
+        """
+        def construct_edges():
+            i, j = sparse.triu(self.sparse_adjacency_matrix(), k=1).nonzero()
+            edges = np.stack((i, j), axis=1).astype(int)
+            return edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+        return self._memoize("edges", construct_edges).copy()
+
+    def edge_coloring(self) -> list:
+        """
+        Partition the nearest neighbor edges into layers of disjoint edges (matchings),
+        each returned as array of shape (number of edges in layer, 2).
+
+        Two-qubit gates acting on the edges of a layer can be applied in parallel.
+        The default implementation colors the edges greedily,
+        using at most 2 d - 1 layers for maximum vertex degree d.
+        """
+        def construct_layers():
+            edges = self.edges()
+            return _edge_layers(edges, _greedy_edge_colors(self.nsites, edges))
+        return [layer.copy() for layer in self._memoize("edge_coloring", construct_layers)]
+
     @abc.abstractmethod
     def index_to_coord(self, i: int) -> tuple:
         """
@@ -37,3 +70,139 @@ class AbstractLattice(abc.ABC):
         """
         Map lattice coordinate to linear index.
         """
+
+    def indices_to_coords(self, indices) -> np.ndarray:
+        """
+        Map linear indices to lattice coordinates,
+        returned as array of shape (number of indices, number of coordinates).
+        """
+        return np.array([self.index_to_coord(i) for i in np.reshape(indices, -1)])
+
+    def coords_to_indices(self, coords) -> np.ndarray:
+        """
+        Map lattice coordinates, given as array of shape
+        (number of sites, number of coordinates), to linear indices.
+        """
+        return np.array([self.coord_to_index(tuple(c)) for c in coords], dtype=int)
+
+    def _memoize(self, key: str, func):
+        """
+        Compute geometry data (like adjacency or coordinate tables) by calling `func`
+        on first use and cache the result, since lattices are immutable after construction.
+        """
+        cache = self.__dict__.setdefault("_geometry_cache", {})
+        if key not in cache:
+            cache[key] = func()
+        return cache[key]
+
+
+def _adjacency_from_pairs(nsites: int, i: np.ndarray, j: np.ndarray):
+    """
+    Construct a sparse (CSR) adjacency matrix with entries 1 at the index pairs (i, j).
+    """
+    adj = sparse.csr_matrix((np.ones(len(i), dtype=int), (i, j)), shape=(nsites, nsites))
+    # entries of pairs listed multiple times
+    adj.data[:] = 1
+    return adj
+
+
+def _greedy_edge_colors(nsites: int, edges: np.ndarray) -> np.ndarray:
+    """
+    Greedily assign to each edge the smallest color not used by the edges
+    adjacent to its endpoints.
+    """
+    used = [set() for _ in range(nsites)]
+    colors = np.zeros(len(edges), dtype=int)
+    for k, (i, j) in enumerate(edges):
+        c = 0
+        while c in used[i] or c in used[j]:
+            c += 1
+        used[i].add(c)
+        used[j].add(c)
+        colors[k] = c
+    return colors
+
+
+def _kempe_edge_colors(nsites: int, edges: np.ndarray, ncolors: int, colors: np.ndarray=None):
+    """
+    Try to color the edges using `ncolors` colors, starting from the (partial)
+    coloring `colors` (negative entries for uncolored edges).
+
+    An uncolored edge (u, v) is assigned a color free at both endpoints if available.
+    Otherwise, for colors a free at u and b free at v, the colors of the alternating
+    a-b path (Kempe chain) starting at v are exchanged, which frees a at v unless
+    the path ends at u. Returns None if this fails for an edge.
+    """
+    # neighbor of each site connected by an edge of a given color, or -1
+    nbr = np.full((nsites, ncolors), -1, dtype=int)
+    index = {}
+    result = np.full(len(edges), -1, dtype=int)
+    for k, (i, j) in enumerate(edges):
+        index[(i, j)] = k
+        index[(j, i)] = k
+        if colors is not None and 0 <= colors[k] < ncolors and nbr[i, colors[k]] < 0 and nbr[j, colors[k]] < 0:
+            nbr[i, colors[k]] = j
+            nbr[j, colors[k]] = i
+            result[k] = colors[k]
+    for k in np.nonzero(result < 0)[0]:
+        u, v = edges[k]
+        free_u = np.nonzero(nbr[u] < 0)[0]
+        free_v = np.nonzero(nbr[v] < 0)[0]
+        common = np.intersect1d(free_u, free_v)
+        if len(common) > 0:
+            c = common[0]
+        else:
+            c = _kempe_exchange(nbr, result, index, u, v, free_u, free_v)
+            if c is None:
+                c = _kempe_exchange(nbr, result, index, v, u, free_v, free_u)
+            if c is None:
+                return None
+        nbr[u, c] = v
+        nbr[v, c] = u
+        result[k] = c
+    return result
+
+
+def _kempe_exchange(nbr, colors, index, u, v, free_u, free_v):
+    """
+    Exchange the colors of an alternating path starting at `v` such that
+    a color free at `u` becomes free at `v` as well, and return this color,
+    or None if all alternating paths end at `u`.
+    """
+    for a in free_u:
+        for b in free_v:
+            path = []
+            w, c = v, a
+            while nbr[w, c] >= 0:
+                path.append((w, nbr[w, c], c))
+                w = nbr[w, c]
+                c = b if c == a else a
+            if w == u:
+                continue
+            for (i, j, c) in path:
+                nbr[i, c] = -1
+                nbr[j, c] = -1
+            for (i, j, c) in path:
+                c = b if c == a else a
+                nbr[i, c] = j
+                nbr[j, c] = i
+                colors[index[(i, j)]] = c
+            return a
+    return None
+
+
+def _is_proper_edge_coloring(nsites: int, edges: np.ndarray, colors: np.ndarray) -> bool:
+    """
+    Whether the edges of each color are disjoint.
+    """
+    if len(edges) == 0:
+        return True
+    keys = np.concatenate((edges[:, 0], edges[:, 1])) * (np.max(colors) + 1) + np.tile(colors, 2)
+    return len(np.unique(keys)) == 2*len(edges)
+
+
+def _edge_layers(edges: np.ndarray, colors: np.ndarray) -> list:
+    """
+    Group the edges by color, skipping unused colors.
+    """
+    return [edges[colors == c] for c in np.unique(colors)]
@@ -1,7 +1,7 @@
-import math
 import numpy as np
 from typing import Sequence
-from qib.lattice import AbstractLattice
+from qib.lattice import AbstractLattice, IntegerLattice
+from qib.lattice.abstract_lattice import _adjacency_from_pairs, _edge_layers
 from qib.lattice.shifted_lattice_convention import ShiftedLatticeConvention
 
 
@@ -82,6 +82,18 @@ class BrickLattice(AbstractLattice):
         If delete == True, the 2 extra points are eliminated from the adjacency matrix.
         Otherwise, they are just disconnected (corresponding rows and columns are 0)
         """
+        return self.sparse_adjacency_matrix().toarray()
+
+    def sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format.
+        """
+        return self._memoize("sparse_adjacency", self._construct_sparse_adjacency_matrix).copy()
+
+    def _construct_sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format (without caching).
+        """
         # An equivalent square graph is built.
         if self.convention == ShiftedLatticeConvention.COLS_SHIFTED_UP:
             d_square = 0
@@ -91,92 +103,78 @@ class BrickLattice(AbstractLattice):
             d_square = 1
             parity_shift_condition = (self.shape[0]>1)
 
-        adj = np.zeros((self.nsites_square, self.nsites_square), dtype=int)
-        idx = np.arange(self.nsites_square).reshape(self.shape_square)
+        square_lattice = IntegerLattice(self.shape_square, pbc=False)
+        rows = []
+        cols = []
         # the y axis for COLS_SHIFTED_UP and x axis for ROWS_SHIFTED_LEFT are treated like the square graph case.
-        # the other axis only has half of the connections.
+        # the other axis only has half of the connections (alternating rungs).
         for d in range(self.ndim):
             for s in [-1, 1]:
-                ids = np.roll(idx, s, axis=d)
-                # single out axis `d`
-                seld = (math.prod(self.shape_square[:d]), self.shape_square[d], math.prod(self.shape_square[d+1:]))
-                idx_cut = idx.reshape(seld)
-                ids_cut = ids.reshape(seld)
-                if s == 1:
-                    idx_cut = idx_cut[:, 1:, :]
-                    ids_cut = ids_cut[:, 1:, :]
-                elif s == -1:
-                    idx_cut = idx_cut[:, :-1, :]
-                    ids_cut = ids_cut[:, :-1, :]
-                else:
-                    assert False
-                if d == d_square:
-                    for (i, j) in zip(idx_cut.reshape(-1), ids_cut.reshape(-1)):
-                        adj[i, j] = 1
-                else:
-                    for (i, j) in zip(idx_cut.reshape(-1), ids_cut.reshape(-1)):
-                        if parity_shift_condition:
-                            if (s == -1 and (i+i//self.shape_square[1])%2 == 0) or (s == 1 and (i+i//self.shape_square[1])%2 == 1):
-                                adj[i, j] = 1
-                        else:
-                            if (s == -1 and i%2 == 0) or (s == 1 and i%2 == 1):
-                                adj[i, j] = 1
+                i, j = square_lattice._axis_shift_pairs(d, s)
+                if d != d_square:
+                    if parity_shift_condition:
+                        parity = (i + i//self.shape_square[1]) % 2
+                    else:
+                        parity = i % 2
+                    keep = (parity == 0) if s == -1 else (parity == 1)
+                    i = i[keep]
+                    j = j[keep]
+                rows.append(i)
+                cols.append(j)
+        i = np.concatenate(rows)
+        j = np.concatenate(cols)
+        # disconnect the 2 extra points
+        extra = self._extra_points()
+        keep = ~np.isin(i, extra) & ~np.isin(j, extra)
+        i = i[keep]
+        j = j[keep]
         if self.delete:
-            adj = self._delete_extra_points(adj)
-        else:
-            adj = self._disconnect_extra_points(adj)
-        return adj
+            # eliminate the 2 extra points and relabel the remaining sites
+            relabel = np.cumsum(~np.isin(np.arange(self.nsites_square), extra)) - 1
+            i = relabel[i]
+            j = relabel[j]
+        return _adjacency_from_pairs(self.nsites, i, j)
 
-    def _delete_extra_points(self, adj):
+    def _extra_points(self) -> list:
         """
-        Deletes the 2 extra points from the adjacency matrix.
+        Linear indices of the 2 extra points in the equivalent square lattice (if any).
         """
         if self.convention == ShiftedLatticeConvention.COLS_SHIFTED_UP and self.shape[1]>1:
-            adj = np.delete(adj, (self.shape_square[0]-1)*self.shape_square[1], 0)
-            adj = np.delete(adj, (self.shape_square[0]-1)*self.shape_square[1], 1)
             if self.shape_square[1]%2 == 0:
-                adj = np.delete(adj, -1, 0)
-                adj = np.delete(adj, -1, 1)
+                return [(self.shape_square[0]-1)*self.shape_square[1], self.nsites_square-1]
             else:
-                adj = np.delete(adj, self.shape_square[1]-1, 0)
-                adj = np.delete(adj, self.shape_square[1]-1, 1)
+                return [self.shape_square[1]-1, (self.shape_square[0]-1)*self.shape_square[1]]
         if self.convention == ShiftedLatticeConvention.ROWS_SHIFTED_LEFT and self.shape[0]>1:
-            adj = np.delete(adj, self.shape_square[1]-1, 0)
-            adj = np.delete(adj, self.shape_square[1]-1, 1)
             if self.shape_square[0]%2 == 1:
-                adj = np.delete(adj, (self.shape_square[0]-1)*self.shape_square[1]-1, 0)
-                adj = np.delete(adj, (self.shape_square[0]-1)*self.shape_square[1]-1, 1)
+                return [self.shape_square[1]-1, (self.shape_square[0]-1)*self.shape_square[1]]
             else:
-                adj = np.delete(adj, -1, 0)
-                adj = np.delete(adj, -1, 1)
-
-        return adj
+                return [self.shape_square[1]-1, self.nsites_square-1]
+        return []
 
-    def _disconnect_extra_points(self, adj):
-        """
-        Disconnects the 2 extra points from the adjacency matrix.
-        They are still counted in, but are not connected anymore to the rest of the lattice.
+    def edge_coloring(self) -> list:
         """
-        if self.convention == ShiftedLatticeConvention.COLS_SHIFTED_UP and self.shape[1]>1:
-            adj[(self.shape_square[0]-1)*self.shape_square[1], :] = 0
-            adj[:, (self.shape_square[0]-1)*self.shape_square[1]] = 0
-            if self.shape_square[1]%2 == 0:
-                adj[-1, :] = 0
-                adj[:, -1] = 0
-            else:
-                adj[self.shape_square[1]-1, :] = 0
-                adj[:, self.shape_square[1]-1] = 0
-        if self.convention == ShiftedLatticeConvention.ROWS_SHIFTED_LEFT and self.shape[0]>1:
-            adj[self.shape_square[1]-1, :] = 0
-            adj[:, self.shape_square[1]-1] = 0
-            if self.shape_square[0]%2 == 1:
-                adj[(self.shape_square[0]-1)*self.shape_square[1], :] = 0
-                adj[:, (self.shape_square[0]-1)*self.shape_square[1]] = 0
-            else:
-                adj[-1, :] = 0
-                adj[:, -1] = 0
+        Partition the nearest neighbor edges into layers of disjoint edges (matchings),
+        each returned as array of shape (number of edges in layer, 2).
 
-        return adj
+        Edges along the fully connected axis of the equivalent square lattice are colored
+        by the parity of their lower coordinate. The remaining edges form a matching;
+        each of them is assigned a parity color not used at its endpoints if available,
+        and otherwise a third color, resulting in the optimal number of (at most) 3 layers.
+        """
+        def construct_layers():
+            edges = self.edges()
+            coords = self.indices_to_coords(edges.reshape(-1)).reshape((len(edges), 2, 2))
+            d_square = 0 if self.convention == ShiftedLatticeConvention.COLS_SHIFTED_UP else 1
+            along = coords[:, 0, d_square] != coords[:, 1, d_square]
+            colors = np.where(along, np.minimum(coords[:, 0, d_square], coords[:, 1, d_square]) % 2, 2)
+            # parity colors used at each site
+            used = np.zeros((self.nsites, 2), dtype=bool)
+            used[edges[along, 0], colors[along]] = True
+            used[edges[along, 1], colors[along]] = True
+            for c in [1, 0]:
+                colors[~along & ~used[edges[:, 0], c] & ~used[edges[:, 1], c]] = c
+            return _edge_layers(edges, colors)
+        return [layer.copy() for layer in self._memoize("edge_coloring", construct_layers)]
 
     def index_to_coord(self, i: int) -> tuple:
         """
@@ -239,3 +237,26 @@ class BrickLattice(AbstractLattice):
                 else:
                     shift += 1
         return int(np.ravel_multi_index(c, self.shape_square)) - shift
+
+    def indices_to_coords(self, indices) -> np.ndarray:
+        """
+        Map linear indices to the equivalent square lattice coordinates,
+        returned as array of shape (number of indices, 2).
+        """
+        coords = self._memoize("coords", lambda: np.array(
+            [self.index_to_coord(i) for i in range(self.nsites)], dtype=int).reshape((-1, 2)))
+        return coords[np.reshape(indices, -1)]
+
+    def coords_to_indices(self, coords) -> np.ndarray:
+        """
+        Map equivalent square lattice coordinates, given as array of shape
+        (number of sites, 2), to linear indices.
+        Deleted extra points (if delete=True) are mapped to -1.
+        """
+        def construct_index_map():
+            index_map = np.full(self.shape_square, -1, dtype=int)
+            index_map[tuple(self.indices_to_coords(range(self.nsites)).T)] = np.arange(self.nsites)
+            return index_map
+        index_map = self._memoize("index_map", construct_index_map)
+        coords = np.asarray(coords, dtype=int).reshape((-1, 2))
+        return index_map[tuple(coords.T)]
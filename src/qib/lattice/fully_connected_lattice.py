@@ -33,10 +33,7 @@ class FullyConnectedLattice(AbstractLattice):
         """
         Construct the adjacency matrix, indicating nearest neighbors.
         """
-        adj = np.ones((self.nsites, self.nsites), dtype=int)
-        for n in range(self.nsites):
-            adj[n, n] = 0
-        return adj
+        return np.ones((self.nsites, self.nsites), dtype=int) - np.identity(self.nsites, dtype=int)
 
     def index_to_coord(self, i: int) -> tuple:
         """
@@ -52,3 +49,18 @@ class FullyConnectedLattice(AbstractLattice):
         for i, n in enumerate(self.shape):
             assert c[i] < n
         return int(np.ravel_multi_index(c, self.shape))
+
+    def indices_to_coords(self, indices) -> np.ndarray:
+        """
+        Map linear indices to lattice coordinates,
+        returned as array of shape (number of indices, number of coordinates).
+        """
+        return np.stack(np.unravel_index(np.reshape(indices, -1), self.shape), axis=-1)
+
+    def coords_to_indices(self, coords) -> np.ndarray:
+        """
+        Map lattice coordinates, given as array of shape
+        (number of sites, number of coordinates), to linear indices.
+        """
+        coords = np.asarray(coords, dtype=int).reshape((-1, self.ndim))
+        return np.ravel_multi_index(tuple(coords.T), self.shape)
@@ -44,16 +44,29 @@ class HexagonalLattice(AbstractLattice):
             \_/ \_/      . |_| |_| .
         """
         # Calculates shape, including 2 possible extra points
-        return BrickLattice(shape=self.shape, pbc=self.pbc, delete=True, convention=self.convention)
+        return self._memoize("brick_lattice", lambda: BrickLattice(
+            shape=self.shape, pbc=self.pbc, delete=True, convention=self.convention))
 
     def adjacency_matrix(self):
         """
         Construct the adjacency matrix, indicating nearest neighbors.
         Adj matrix built from the equivalent brick lattice (delete=True).
         """
-        # An equivalent brick graph is built.
-        equiv_lattice = self.equivalent_brick_lattice()
-        return equiv_lattice.adjacency_matrix()
+        return self.sparse_adjacency_matrix().toarray()
+
+    def sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format,
+        using the equivalent brick lattice (delete=True).
+        """
+        return self.equivalent_brick_lattice().sparse_adjacency_matrix()
+
+    def edge_coloring(self) -> list:
+        """
+        Partition the nearest neighbor edges into (at most) 3 layers of disjoint edges,
+        using the equivalent brick lattice.
+        """
+        return self.equivalent_brick_lattice().edge_coloring()
 
     def index_to_coord(self, i: int) -> tuple:
         """
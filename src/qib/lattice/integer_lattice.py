@@ -2,6 +2,7 @@ import math
 from typing import Sequence
 import numpy as np
 from qib.lattice import AbstractLattice
+from qib.lattice.abstract_lattice import _adjacency_from_pairs, _edge_layers
 
 
 class IntegerLattice(AbstractLattice):
@@ -35,30 +36,18 @@ class IntegerLattice(AbstractLattice):
         """
         Construct the adjacency matrix, indicating nearest neighbors.
         """
-        adj = np.zeros((self.nsites, self.nsites), dtype=int)
-        idx = np.arange(self.nsites).reshape(self.shape)
-        for d in range(self.ndim):
-            for s in [-1, 1]:
-                ids = np.roll(idx, s, axis=d)
-                if self.pbc[d]:
-                    for (i, j) in zip(idx.reshape(-1), ids.reshape(-1)):
-                        adj[i, j] = 1
-                else:
-                    # single out axis `d`
-                    seld = (math.prod(self.shape[:d]), self.shape[d], math.prod(self.shape[d+1:]))
-                    idx_cut = idx.reshape(seld)
-                    ids_cut = ids.reshape(seld)
-                    if s == 1:
-                        idx_cut = idx_cut[:, 1:, :]
-                        ids_cut = ids_cut[:, 1:, :]
-                    elif s == -1:
-                        idx_cut = idx_cut[:, :-1, :]
-                        ids_cut = ids_cut[:, :-1, :]
-                    else:
-                        assert False
-                    for (i, j) in zip(idx_cut.reshape(-1), ids_cut.reshape(-1)):
-                        adj[i, j] = 1
-        return adj
+        return self.sparse_adjacency_matrix().toarray()
+
+    def sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format.
+        """
+        def construct_adjacency():
+            pairs = [self._axis_shift_pairs(d, s) for d in range(self.ndim) for s in [-1, 1]]
+            return _adjacency_from_pairs(self.nsites,
+                                         np.concatenate([p[0] for p in pairs]),
+                                         np.concatenate([p[1] for p in pairs]))
+        return self._memoize("sparse_adjacency", construct_adjacency).copy()
 
     def adjacency_matrix_axis_shift(self, d: int, s: int):
         """
@@ -66,35 +55,95 @@ class IntegerLattice(AbstractLattice):
         """
         if not s in [-1, 1]:
             raise ValueError(f"invalid shift s = {s}, must be 1 or -1")
-        adj = np.zeros((self.nsites, self.nsites), dtype=int)
+        return _adjacency_from_pairs(self.nsites, *self._axis_shift_pairs(d, s)).toarray()
+
+    def _axis_shift_pairs(self, d: int, s: int):
+        """
+        Index pairs (i, j) of neighboring sites along axis `d` and shift `s`.
+        """
         idx = np.arange(self.nsites).reshape(self.shape)
         ids = np.roll(idx, s, axis=d)
-        if self.pbc[d]:
-            for (i, j) in zip(idx.reshape(-1), ids.reshape(-1)):
-                adj[i, j] = 1
-        else:
+        if not self.pbc[d]:
             # single out axis `d`
             seld = (math.prod(self.shape[:d]), self.shape[d], math.prod(self.shape[d+1:]))
-            idx_cut = idx.reshape(seld)
-            ids_cut = ids.reshape(seld)
+            idx = idx.reshape(seld)
+            ids = ids.reshape(seld)
             if s == 1:
-                idx_cut = idx_cut[:, 1:, :]
-                ids_cut = ids_cut[:, 1:, :]
-            elif s == -1:
-                idx_cut = idx_cut[:, :-1, :]
-                ids_cut = ids_cut[:, :-1, :]
+                idx = idx[:, 1:, :]
+                ids = ids[:, 1:, :]
             else:
-                assert False
-            for (i, j) in zip(idx_cut.reshape(-1), ids_cut.reshape(-1)):
-                adj[i, j] = 1
-        return adj
+                idx = idx[:, :-1, :]
+                ids = ids[:, :-1, :]
+        return idx.reshape(-1), ids.reshape(-1)
+
+    def edge_coloring(self) -> list:
+        """
+        Partition the nearest neighbor edges into layers of disjoint edges (matchings),
+        each returned as array of shape (number of edges in layer, 2).
+
+        The edges along each axis are colored by the parity of their lower coordinate.
+        An axis with periodic boundary conditions and odd length requires an
+        additional color for the wrap-around edges; the "even" edges of the subsequent
+        axis are then assigned the color not used at their endpoints by the preceding axis
+        (following the edge coloring of Cartesian products of graphs).
+        The number of layers is thus the maximum vertex degree, which is optimal,
+        except if all axes are periodic with odd length, in which case
+        one additional layer is required.
+        """
+        return [layer.copy() for layer in self._memoize("edge_coloring", self._construct_edge_coloring)]
+
+    def _construct_edge_coloring(self):
+        """
+        Construct the edge coloring (without caching).
+        """
+        edges = self.edges()
+        coords = self.indices_to_coords(edges.reshape(-1)).reshape((len(edges), 2, self.ndim))
+        # axis of each edge
+        axis = np.argmax(coords[:, 0, :] != coords[:, 1, :], axis=1)
+        ci = coords[np.arange(len(edges)), 0, axis]
+        cj = coords[np.arange(len(edges)), 1, axis]
+        wrap = np.abs(ci - cj) > 1
+        lower = np.where(wrap, np.array(self.shape)[axis] - 1, np.minimum(ci, cj))
+        site_coords = self.indices_to_coords(np.arange(self.nsites))
+        # periodic axes of odd length first, such that their additional colors can be merged
+        odd_pbc = [d for d in range(self.ndim) if self.pbc[d] and self.shape[d] % 2 == 1 and self.shape[d] > 1]
+        order = odd_pbc + [d for d in range(self.ndim) if d not in odd_pbc and self.shape[d] > 1]
+        colors = np.zeros(len(edges), dtype=int)
+        ncolors = 0
+        # per site, a color not used by the edges along the preceding axis
+        free = None
+        for d in order:
+            sel = axis == d
+            even = sel & (lower % 2 == 0) & ~wrap
+            odd = sel & (lower % 2 == 1)
+            if free is None:
+                c_even = np.full(self.nsites, ncolors)
+                ncolors += 1
+            else:
+                c_even = free
+            colors[even] = c_even[edges[even, 0]]
+            c_odd = ncolors
+            colors[odd] = c_odd
+            ncolors += 1
+            if d in odd_pbc:
+                c_wrap = ncolors
+                colors[sel & wrap] = c_wrap
+                ncolors += 1
+                x = site_coords[:, d]
+                free = np.where(x == 0, c_odd, np.where(x == self.shape[d] - 1, c_even, c_wrap))
+            else:
+                free = None
+        return _edge_layers(edges, colors)
 
     def index_to_coord(self, i: int) -> tuple:
         """
         Map linear index to lattice coordinate.
         """
         assert i < self.nsites
-        return np.unravel_index(i, self.shape)
+        if i < 0:
+            raise ValueError(f"invalid negative index {i}")
+        coords = self._memoize("coords", lambda: [tuple(c) for c in self.indices_to_coords(range(self.nsites)).tolist()])
+        return coords[i]
 
     def coord_to_index(self, c) -> int:
         """
@@ -102,4 +151,22 @@ class IntegerLattice(AbstractLattice):
         """
         for i, n in enumerate(self.shape):
             assert c[i] < n
-        return int(np.ravel_multi_index(c, self.shape))
+            if c[i] < 0:
+                raise ValueError(f"invalid negative coordinate {c}")
+        strides = self._memoize("strides", lambda: [math.prod(self.shape[d+1:]) for d in range(self.ndim)])
+        return int(sum(ci * s for ci, s in zip(c, strides)))
+
+    def indices_to_coords(self, indices) -> np.ndarray:
+        """
+        Map linear indices to lattice coordinates,
+        returned as array of shape (number of indices, number of coordinates).
+        """
+        return np.stack(np.unravel_index(np.reshape(indices, -1), self.shape), axis=-1)
+
+    def coords_to_indices(self, coords) -> np.ndarray:
+        """
+        Map lattice coordinates, given as array of shape
+        (number of sites, number of coordinates), to linear indices.
+        """
+        coords = np.asarray(coords, dtype=int).reshape((-1, self.ndim))
+        return np.ravel_multi_index(tuple(coords.T), self.shape)
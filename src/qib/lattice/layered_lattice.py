@@ -1,4 +1,5 @@
 import numpy as np
+from scipy import sparse
 from qib.lattice import AbstractLattice
 
 
@@ -30,10 +31,20 @@ class LayeredLattice(AbstractLattice):
         """
         Construct the adjacency matrix, indicating nearest neighbors.
         """
-        # a site is connected to all peer sites in the other layers
-        base_adj = self.base_lattice.adjacency_matrix()
-        layneigh = np.identity(self.base_lattice.nsites, dtype=int)
-        return np.block([i*[layneigh] + [base_adj] + (self.nlayers-i-1)*[layneigh] for i in range(self.nlayers)])
+        return self.sparse_adjacency_matrix().toarray()
+
+    def sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format.
+        """
+        def construct_adjacency():
+            # a site is connected to all peer sites in the other layers
+            base_adj = self.base_lattice.sparse_adjacency_matrix()
+            layconn = np.ones((self.nlayers, self.nlayers), dtype=int) - np.identity(self.nlayers, dtype=int)
+            adj = (sparse.kron(sparse.identity(self.nlayers, dtype=int), base_adj)
+                 + sparse.kron(layconn, sparse.identity(self.base_lattice.nsites, dtype=int)))
+            return sparse.csr_matrix(adj)
+        return self._memoize("sparse_adjacency", construct_adjacency).copy()
 
     def index_to_coord(self, i: int) -> tuple:
         """
@@ -49,3 +60,23 @@ class LayeredLattice(AbstractLattice):
         """
         assert c[0] < self.nlayers
         return c[0] * self.base_lattice.nsites + self.base_lattice.coord_to_index(c[1:])
+
+    def indices_to_coords(self, indices) -> np.ndarray:
+        """
+        Map linear indices to lattice coordinates,
+        returned as array of shape (number of indices, number of coordinates).
+        """
+        indices = np.reshape(indices, -1)
+        layers, base_indices = np.divmod(indices, self.base_lattice.nsites)
+        base_coords = self.base_lattice.indices_to_coords(base_indices).reshape((len(indices), -1))
+        return np.concatenate((layers[:, None], base_coords), axis=1)
+
+    def coords_to_indices(self, coords) -> np.ndarray:
+        """
+        Map lattice coordinates, given as array of shape
+        (number of sites, number of coordinates), to linear indices.
+        """
+        coords = np.asarray(coords).reshape((-1, self.ndim))
+        layers = coords[:, 0].astype(int)
+        assert np.all(layers < self.nlayers)
+        return layers * self.base_lattice.nsites + self.base_lattice.coords_to_indices(coords[:, 1:])
@@ -1,7 +1,8 @@
 import math
 from typing import Sequence
 import numpy as np
-from qib.lattice import AbstractLattice
+from qib.lattice import AbstractLattice, IntegerLattice
+from qib.lattice.abstract_lattice import _adjacency_from_pairs
 
 
 class OddFaceCenteredLattice(AbstractLattice):
@@ -43,52 +44,32 @@ class OddFaceCenteredLattice(AbstractLattice):
         Each site at an odd face center is considered to be a neighbor
         of the four corners of the face.
         """
-        adj = np.zeros((self.nsites, self.nsites), dtype=int)
+        return self.sparse_adjacency_matrix().toarray()
+
+    def sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format.
+        """
+        return self._memoize("sparse_adjacency", self._construct_sparse_adjacency_matrix).copy()
+
+    def _construct_sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format (without caching).
+        """
         nverts = math.prod(self.shape)
         # conventional adjacency of an integer lattice
-        idx = np.arange(nverts).reshape(self.shape)
-        for d in range(self.ndim):
-            for s in [-1, 1]:
-                ids = np.roll(idx, s, axis=d)
-                if self.pbc[d]:
-                    for (i, j) in zip(idx.reshape(-1), ids.reshape(-1)):
-                        adj[i, j] = 1
-                else:
-                    # single out axis `d`
-                    seld = (math.prod(self.shape[:d]), self.shape[d], math.prod(self.shape[d+1:]))
-                    idx_cut = idx.reshape(seld)
-                    ids_cut = ids.reshape(seld)
-                    if s == 1:
-                        idx_cut = idx_cut[:, 1:, :]
-                        ids_cut = ids_cut[:, 1:, :]
-                    elif s == -1:
-                        idx_cut = idx_cut[:, :-1, :]
-                        ids_cut = ids_cut[:, :-1, :]
-                    else:
-                        assert False
-                    for (i, j) in zip(idx_cut.reshape(-1), ids_cut.reshape(-1)):
-                        adj[i, j] = 1
+        adj_verts = IntegerLattice(self.shape, pbc=self.pbc).sparse_adjacency_matrix().tocoo()
         # adjacency between face centers and corners
-        i = nverts  # counter
-        for x in range(self.shape[0] - 1):
-            for y in range(self.shape[1] - 1):
-                if (x + y) % 2 == 1:
-                    continue
-                # enumerate the four corners of the face
-                j = x*self.shape[1] + y
-                adj[i, j] = 1
-                adj[j, i] = 1
-                j = x*self.shape[1] + (y + 1)
-                adj[i, j] = 1
-                adj[j, i] = 1
-                j = (x + 1)*self.shape[1] + y
-                adj[i, j] = 1
-                adj[j, i] = 1
-                j = (x + 1)*self.shape[1] + (y + 1)
-                adj[i, j] = 1
-                adj[j, i] = 1
-                i += 1
-        return adj
+        x, y = np.meshgrid(np.arange(self.shape[0] - 1), np.arange(self.shape[1] - 1), indexing="ij")
+        odd = (x + y) % 2 == 0
+        x, y = x[odd], y[odd]
+        faces = nverts + np.arange(len(x))
+        # enumerate the four corners of the face
+        corners = np.concatenate([(x + dx)*self.shape[1] + (y + dy) for dx in (0, 1) for dy in (0, 1)])
+        faces = np.tile(faces, 4)
+        return _adjacency_from_pairs(self.nsites,
+                                     np.concatenate((adj_verts.row, faces, corners)),
+                                     np.concatenate((adj_verts.col, corners, faces)))
 
     def index_to_coord(self, i: int) -> tuple:
         """
@@ -122,6 +103,42 @@ class OddFaceCenteredLattice(AbstractLattice):
         # take offset by primary vertex qubits into account
         return math.prod(self.shape) + (x*(self.shape[1] - 1) + 1) // 2 + (y // 2)
 
+    def indices_to_coords(self, indices) -> np.ndarray:
+        """
+        Map linear indices to lattice coordinates,
+        returned as (float) array of shape (number of indices, 2).
+        """
+        indices = np.reshape(indices, -1)
+        nverts = math.prod(self.shape)
+        coords = np.zeros((len(indices), 2))
+        verts = indices < nverts
+        coords[verts] = np.stack(np.unravel_index(indices[verts], self.shape), axis=-1)
+        i = indices[~verts] - nverts
+        x = 2 * i // (self.shape[1] - 1)
+        y = 2 * (i - (x*(self.shape[1] - 1) + 1) // 2) + (x % 2)
+        coords[~verts] = np.stack((x + 0.5, y + 0.5), axis=-1)
+        return coords
+
+    def coords_to_indices(self, coords) -> np.ndarray:
+        """
+        Map lattice coordinates, given as array of shape (number of sites, 2),
+        to linear indices. Integer coordinates refer to vertices,
+        and half-integer coordinates to odd face centers.
+        """
+        coords = np.asarray(coords).reshape((-1, 2))
+        idx = np.floor(coords).astype(int)
+        faces = np.any(coords != idx, axis=1)
+        x, y = idx[faces, 0], idx[faces, 1]
+        if np.any((x + y) % 2 == 1):
+            raise ValueError("coordinates contain an invalid odd face index")
+        if np.any((x < 0) | (y < 0) | (x >= self.shape[0] - 1) | (y >= self.shape[1] - 1)):
+            raise ValueError("coordinates outside of the rectangular region")
+        indices = np.zeros(len(coords), dtype=int)
+        indices[~faces] = np.ravel_multi_index(tuple(idx[~faces].T), self.shape)
+        # take offset by primary vertex qubits into account
+        indices[faces] = math.prod(self.shape) + (x*(self.shape[1] - 1) + 1) // 2 + (y // 2)
+        return indices
+
     def edge_to_odd_face_index(self, i, j):
         """
         Find the adjacent "odd" face of edge (i, j),
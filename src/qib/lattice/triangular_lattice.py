@@ -1,7 +1,9 @@
 import math
 from typing import Sequence
 import numpy as np
-from qib.lattice import AbstractLattice
+from qib.lattice import AbstractLattice, IntegerLattice
+from qib.lattice.abstract_lattice import (_adjacency_from_pairs, _edge_layers, _greedy_edge_colors,
+                                         _kempe_edge_colors, _is_proper_edge_coloring)
 
 
 class TriangularLattice(AbstractLattice):
@@ -38,66 +40,120 @@ class TriangularLattice(AbstractLattice):
         """
         Construct the adjacency matrix, indicating nearest neighbors.
         """
-        adj = np.zeros((self.nsites, self.nsites), dtype=int)
+        return self.sparse_adjacency_matrix().toarray()
+
+    def sparse_adjacency_matrix(self):
+        """
+        Construct the adjacency matrix in sparse CSR format.
+        """
+        def construct_adjacency():
+            integer_lattice = IntegerLattice(self.shape, pbc=self.pbc)
+            pairs = [integer_lattice._axis_shift_pairs(d, s) for d in range(self.ndim) for s in [-1, 1]]
+            if self.ndim == 2:
+                # diagonal edges
+                pairs += [self._diagonal_shift_pairs(s) for s in [-1, 1]]
+            return _adjacency_from_pairs(self.nsites,
+                                         np.concatenate([p[0] for p in pairs]),
+                                         np.concatenate([p[1] for p in pairs]))
+        return self._memoize("sparse_adjacency", construct_adjacency).copy()
+
+    def _diagonal_shift_pairs(self, s: int):
+        """
+        Index pairs (i, j) of neighboring sites along the diagonal and shift `s`.
+        """
         idx = np.arange(self.nsites).reshape(self.shape)
-        for d in range(self.ndim):
-            for s in [-1, 1]:
-                ids = np.roll(idx, s, axis=d)
-                if self.pbc[d]:
-                    for (i, j) in zip(idx.reshape(-1), ids.reshape(-1)):
-                        adj[i, j] = 1
-                else:
-                    # single out axis `d`
-                    seld = (math.prod(self.shape[:d]), self.shape[d], math.prod(self.shape[d+1:]))
-                    idx_cut = idx.reshape(seld)
-                    ids_cut = ids.reshape(seld)
-                    if s == 1:
-                        idx_cut = idx_cut[:, 1:, :]
-                        ids_cut = ids_cut[:, 1:, :]
-                    elif s == -1:
-                        idx_cut = idx_cut[:, :-1, :]
-                        ids_cut = ids_cut[:, :-1, :]
-                    else:
-                        assert False
-                    for (i, j) in zip(idx_cut.reshape(-1), ids_cut.reshape(-1)):
-                        adj[i, j] = 1
-        # diagonal edge
-        for d in range(self.ndim-1):
-            for s in [-1, 1]:
-                ids = np.roll(idx, s, axis=0)
-                ids = np.roll(ids, s, axis=1)
-                if self.pbc[d]:
-                    for (i, j) in zip(idx.reshape(-1), ids.reshape(-1)):
-                        adj[i, j] = 1
-                else:
-                    if self.pbc[d+1]:
-                        seld = (math.prod(self.shape[:d]), self.shape[d], math.prod(self.shape[d+1:]))
-                        idx_cut = idx.reshape(seld)
-                        ids_cut = ids.reshape(seld)
-                        if s == 1:
-                            idx_cut = idx_cut[:, 1:, :]
-                            ids_cut = ids_cut[:, 1:, :]
-                        elif s == -1:
-                            idx_cut = idx_cut[:, :-1, :]
-                            ids_cut = ids_cut[:, :-1, :]
-                        else:
-                            assert False
-                    else:
-                    # single out axis `d` and `d+1`
-                        seld = (math.prod(self.shape[:d]), self.shape[d], self.shape[d+1], math.prod(self.shape[d+2:]))
-                        idx_cut = idx.reshape(seld)
-                        ids_cut = ids.reshape(seld)
-                        if s == 1:
-                            idx_cut = idx_cut[:, 1:, 1:, :]
-                            ids_cut = ids_cut[:, 1:, 1:, :]
-                        elif s == -1:
-                            idx_cut = idx_cut[:, :-1, :-1, :]
-                            ids_cut = ids_cut[:, :-1, :-1, :]
-                        else:
-                            assert False
-                    for (i, j) in zip(idx_cut.reshape(-1), ids_cut.reshape(-1)):
-                        adj[i, j] = 1
-        return adj
+        ids = np.roll(idx, (s, s), axis=(0, 1))
+        if not self.pbc[0]:
+            if self.pbc[1]:
+                # single out axis 0
+                cut = (slice(1, None),) if s == 1 else (slice(None, -1),)
+            else:
+                cut = 2*(slice(1, None),) if s == 1 else 2*(slice(None, -1),)
+            idx = idx[cut]
+            ids = ids[cut]
+        return idx.reshape(-1), ids.reshape(-1)
+
+    def edge_coloring(self) -> list:
+        """
+        Partition the nearest neighbor edges into layers of disjoint edges (matchings),
+        each returned as array of shape (number of edges in layer, 2).
+
+        The edges along the axes are colored as for the corresponding integer lattice,
+        and the diagonal edges by the parity of one of their coordinates.
+        This uses the maximum vertex degree as number of layers (which is optimal)
+        for open boundary conditions and periodic axes of even length.
+        Otherwise, such a coloring is searched for by exchanging colors along alternating
+        paths (Kempe chains); if the search fails, one additional layer is used,
+        as required for instance by a regular lattice with an odd number of sites.
+        """
+        return [layer.copy() for layer in self._memoize("edge_coloring", self._construct_edge_coloring)]
+
+    def _construct_edge_coloring(self):
+        """
+        Construct the edge coloring (without caching).
+        """
+        edges = self.edges()
+        adj = self.sparse_adjacency_matrix()
+        adj.setdiag(0)
+        degrees = np.asarray(adj.sum(axis=1)).reshape(-1)
+        max_degree = int(np.max(degrees)) if len(edges) > 0 else 0
+        structured = self._structured_edge_colorings(edges)
+        candidates = [colors for colors in structured
+                      if _is_proper_edge_coloring(self.nsites, edges, colors)]
+        best = min(candidates, key=lambda colors: len(np.unique(colors)), default=None)
+        if best is not None and len(np.unique(best)) <= max_degree:
+            return _edge_layers(edges, best)
+        # a regular graph with an odd number of vertices requires an additional color
+        # (each color class can cover at most nsites - 1 vertices)
+        if not (np.all(degrees == max_degree) and self.nsites % 2 == 1):
+            # start from the (partial) structured colorings or from scratch,
+            # with randomized edge orderings
+            seeds = structured + [None]
+            rng = np.random.default_rng(42)
+            for attempt in range(8 * len(seeds)):
+                seed = seeds[attempt % len(seeds)]
+                perm = np.arange(len(edges)) if attempt < len(seeds) else rng.permutation(len(edges))
+                colors = _kempe_edge_colors(self.nsites, edges[perm], max_degree,
+                                            seed[perm] if seed is not None else None)
+                if colors is not None:
+                    return _edge_layers(edges, colors[np.argsort(perm)])
+        if best is not None and len(np.unique(best)) <= max_degree + 1:
+            return _edge_layers(edges, best)
+        colors = _kempe_edge_colors(self.nsites, edges, max_degree + 1)
+        if colors is None:
+            colors = _greedy_edge_colors(self.nsites, edges)
+        return _edge_layers(edges, colors)
+
+    def _structured_edge_colorings(self, edges: np.ndarray) -> list:
+        """
+        Candidate colorings using the edge coloring of the integer lattice for edges
+        along the axes, and the parity of the first or second coordinate for diagonal edges.
+        Note that the candidates are not necessarily proper colorings.
+        """
+        colors = np.full(len(edges), -1)
+        # edges along axes coincide with the edges of the integer lattice
+        int_layers = IntegerLattice(self.shape, pbc=self.pbc).edge_coloring()
+        keys = edges[:, 0] * self.nsites + edges[:, 1]
+        for c, layer in enumerate(int_layers):
+            colors[np.isin(keys, layer[:, 0] * self.nsites + layer[:, 1])] = c
+        diag = colors < 0
+        if not np.any(diag):
+            return [colors]
+        # diagonal edges forming a matching require a single color only
+        if len(np.unique(edges[diag])) == 2*np.count_nonzero(diag):
+            colors[diag] = len(int_layers)
+            return [colors]
+        coords = self.indices_to_coords(edges[diag].reshape(-1)).reshape((-1, 2, self.ndim))
+        shape = np.array(self.shape)
+        # lower endpoint of each diagonal edge
+        lower = np.where(np.all((coords[:, 1] - coords[:, 0] - 1) % shape == 0, axis=1, keepdims=True),
+                         coords[:, 0], coords[:, 1])
+        candidates = []
+        for p in range(self.ndim):
+            candidate = colors.copy()
+            candidate[diag] = len(int_layers) + lower[:, p] % 2
+            candidates.append(candidate)
+        return candidates
 
     def index_to_coord(self, i: int) -> tuple:
         """
@@ -113,3 +169,18 @@ class TriangularLattice(AbstractLattice):
         for i, n in enumerate(self.shape):
             assert c[i] < n
         return int(np.ravel_multi_index(c, self.shape))
+
+    def indices_to_coords(self, indices) -> np.ndarray:
+        """
+        Map linear indices to lattice coordinates,
+        returned as array of shape (number of indices, number of coordinates).
+        """
+        return np.stack(np.unravel_index(np.reshape(indices, -1), self.shape), axis=-1)
+
+    def coords_to_indices(self, coords) -> np.ndarray:
+        """
+        Map lattice coordinates, given as array of shape
+        (number of sites, number of coordinates), to linear indices.
+        """
+        coords = np.asarray(coords, dtype=int).reshape((-1, self.ndim))
+        return np.ravel_multi_index(tuple(coords.T), self.shape)
@@ -0,0 +1,5 @@
+from qib.linalg.parallel import (ParallelCSRMatrix, parallel_matvec, as_parallel_operator,
+                                 set_num_threads, get_num_threads)
+from qib.linalg.linear_operator import as_linear_operator, sector_indices
+from qib.linalg.krylov import lanczos, expm_krylov, ground_state, lowest_eigenpairs, spectral_norm
+from qib.linalg.spectral import cached_eigh, is_eigh_cached
@@ -0,0 +1,157 @@
+import numpy as np
+from scipy.linalg import eigh_tridiagonal
+from scipy.sparse.linalg import LinearOperator, eigsh
+from qib.operator import AbstractOperator
+from qib.linalg.linear_operator import as_linear_operator
+
+
+def _lanczos_iteration(matvec, v0: np.ndarray, numiter: int):
+    """
+    Perform up to `numiter` Lanczos iterations (with full reorthogonalization)
+    starting from `v0`.
+
+    Returns the diagonal and off-diagonal entries of the tridiagonal matrix,
+    the orthonormal Krylov basis vectors and the norm of the final residual
+    (zero in case the Krylov subspace is invariant).
+    """
+    v = v0 / np.linalg.norm(v0)
+    vlist = [v]
+    alpha = []
+    beta = []
+    w = matvec(v)
+    alpha.append(np.vdot(v, w).real)
+    w = w - alpha[-1] * v
+    for _ in range(1, min(numiter, len(v0))):
+        b = np.linalg.norm(w)
+        if b < 1e-12 * abs(alpha[0]) + 1e-14:
+            # invariant Krylov subspace
+            return np.array(alpha), np.array(beta), vlist, 0.
+        v = w / b
+        for u in vlist:
+            v = v - np.vdot(u, v) * u
+        v /= np.linalg.norm(v)
+        beta.append(b)
+        vlist.append(v)
+        w = matvec(v) - b * vlist[-2]
+        alpha.append(np.vdot(v, w).real)
+        w = w - alpha[-1] * v
+    bnext = np.linalg.norm(w) if len(vlist) < len(v0) else 0.
+    return np.array(alpha), np.array(beta), vlist, bnext
+
+
+def lanczos(matvec, v0: np.ndarray, numiter: int):
+    """
+    Approximate the lowest eigenvalue and corresponding eigenvector of a Hermitian
+    linear operator by `numiter` Lanczos iterations (with full reorthogonalization)
+    starting from `v0`.
+    """
+    alpha, beta, vlist, _ = _lanczos_iteration(matvec, v0, numiter)
+    evals, evecs = eigh_tridiagonal(alpha, beta)
+    x = sum(c * u for c, u in zip(evecs[:, 0], vlist))
+    return evals[0], x / np.linalg.norm(x)
+
+
+def expm_krylov(matvec, v: np.ndarray, t: float, numiter: int=30, tol: float=1e-12):
+    """
+    Compute :math:`e^{-i A t} v` for a Hermitian linear operator `A`
+    (specified by its `matvec` function) based on Lanczos iterations.
+
+    The time interval is split into steps such that the estimated
+    Krylov approximation error per step is bounded by `tol` (relative to the norm of `v`).
+    """
+    v = np.asarray(v, dtype=complex)
+    nrm = np.linalg.norm(v)
+    if nrm == 0 or t == 0:
+        return v.copy()
+    trem = t
+    dt = t
+    while trem != 0:
+        if abs(dt) > abs(trem):
+            dt = trem
+        alpha, beta, vlist, bnext = _lanczos_iteration(matvec, v, numiter)
+        evals, evecs = eigh_tridiagonal(alpha, beta)
+        vnrm = np.linalg.norm(v)
+        while True:
+            # coefficients of exp(-i dt T) e_1 in Krylov basis
+            c = evecs @ (np.exp(-1j*dt*evals) * evecs[0, :].conj())
+            if bnext * abs(c[-1]) * vnrm <= tol * nrm:
+                break
+            dt /= 2
+        v = vnrm * sum(ci * u for ci, u in zip(c, vlist))
+        trem -= dt
+        if abs(trem) < 1e-14 * abs(t):
+            break
+    return v
+
+
+def ground_state(op: AbstractOperator, sector=None, tol: float=1e-10, numiter: int=50,
+                 maxrestarts: int=100, v0: np.ndarray=None, rng: np.random.Generator=None):
+    """
+    Compute the ground state energy and ground state of a Hermitian operator
+    by restarted Lanczos iterations, without forming a dense matrix.
+
+    If `sector` is specified (see `sector_indices`), the computation is restricted
+    to the corresponding particle number sector, and the returned state is expressed
+    in the basis of the sector. A spin-resolved sector `(N_up, N_down)` fixes the
+    total spin projection, but a restriction to total spin eigenspaces is not supported.
+    Iterations are restarted from the current approximation until the residual norm
+    is below `tol` (relative to the energy), at most `maxrestarts` times.
+    """
+    if maxrestarts < 1:
+        raise ValueError(f"maximum number of restarts must be positive, received {maxrestarts}")
+    A = as_linear_operator(op, sector)
+    if v0 is None:
+        if rng is None:
+            rng = np.random.default_rng()
+        v0 = rng.normal(size=A.shape[0])
+        if np.issubdtype(A.dtype, np.complexfloating):
+            v0 = v0 + 1j*rng.normal(size=A.shape[0])
+    x = v0
+    for _ in range(maxrestarts):
+        e, x = lanczos(A.matvec, x, numiter)
+        if np.linalg.norm(A.matvec(x) - e * x) <= tol * max(1, abs(e)):
+            break
+    return e, x
+
+
+def lowest_eigenpairs(op: AbstractOperator, k: int, sector=None, tol: float=0):
+    """
+    Compute the `k` lowest eigenvalues and corresponding eigenvectors
+    of a Hermitian operator, using the implicitly restarted Lanczos method
+    (via `scipy.sparse.linalg.eigsh`) on a matrix-free representation.
+
+    If `sector` is specified (see `sector_indices`), the computation is restricted
+    to the corresponding particle number sector, and the returned eigenvectors
+    are expressed in the basis of the sector.
+    """
+    A = as_linear_operator(op, sector)
+    n = A.shape[0]
+    if k < 1 or k > n:
+        raise ValueError(f"number of eigenpairs must be between 1 and {n}, received {k}")
+    if n <= max(2*k + 1, 32):
+        # small problem, use dense diagonalization
+        evals, evecs = np.linalg.eigh(A.matmat(np.identity(n)))
+        return evals[:k], evecs[:, :k]
+    evals, evecs = eigsh(A, k=k, which='SA', tol=tol)
+    sort_indices = np.argsort(evals)
+    return evals[sort_indices], evecs[:, sort_indices]
+
+
+def spectral_norm(op: AbstractOperator, tol: float=1e-8):
+    """
+    Estimate the spectral norm of an operator by the implicitly restarted
+    Lanczos method, applied to the operator itself if it is Hermitian,
+    and to :math:`A^{\\dagger} A` otherwise.
+
+    Can be used to normalize a Hamiltonian before block encoding it.
+    """
+    A = as_linear_operator(op)
+    n = A.shape[0]
+    if op.is_hermitian():
+        if n <= 32:
+            return np.max(np.abs(np.linalg.eigvalsh(A.matmat(np.identity(n)))))
+        return abs(eigsh(A, k=1, which='LM', tol=tol, return_eigenvectors=False)[0])
+    if n <= 32:
+        return np.linalg.norm(A.matmat(np.identity(n)), ord=2)
+    AhA = LinearOperator(A.shape, matvec=lambda x: A.rmatvec(A.matvec(x)), dtype=A.dtype)
+    return np.sqrt(abs(eigsh(AhA, k=1, which='LA', tol=tol, return_eigenvectors=False)[0]))
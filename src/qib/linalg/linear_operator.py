@@ -0,0 +1,142 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator
+from qib.operator import AbstractOperator, PauliString, WeightedPauliString, PauliOperator
+from qib.operator import FieldOperator, FermiHubbardHamiltonian, MolecularHamiltonian
+from qib.util import sector_basis_states
+from qib.util.util import _bit_parity
+from qib.linalg.parallel import as_parallel_operator, _row_partition, _run_row_blocks
+
+
+# maximum memory used for caching diagonal factors and permutations of Pauli operators
+_cache_max_bytes = 2**28
+
+
+def sector_indices(nqubits: int, sector):
+    """
+    Indices of the computational basis states (in ascending order)
+    belonging to a particle number sector.
+
+    `sector` is either the total number of particles `N` (or `(N,)`), i.e., the Hamming
+    weight of the basis states, or a tuple `(N_up, N_down)` specifying the
+    number of particles in the first and second half of the qubits, i.e.,
+    in the spin-up and spin-down layers of a spinful lattice.
+    Using the convention that qubit 0 corresponds to the most significant bit.
+    """
+    return sector_basis_states(nqubits, sector)
+
+
+def _pauli_terms(op):
+    """
+    Represent an operator by its number of qubits and a list of
+    (weight, Hermitian phase factor, z bit mask, x bit mask), such that the terms
+    are the Hermitian Pauli strings (phase * Z^z X^x) multiplied by the weights,
+    or return None if the operator is not a Pauli operator.
+    """
+    if isinstance(op, PauliString):
+        pstrings = [WeightedPauliString(op, 1)]
+    elif isinstance(op, WeightedPauliString):
+        pstrings = [op]
+    elif isinstance(op, PauliOperator):
+        pstrings = op.pstrings
+    elif hasattr(op, "as_pauli_operator"):
+        pstrings = op.as_pauli_operator().pstrings
+    else:
+        return None
+    nqubits = pstrings[0].num_qubits if pstrings else 0
+    terms = []
+    for ps in pstrings:
+        if ps.weight == 0:
+            continue
+        # qubit 0 corresponds to the most significant bit
+        zmask = sum(int(b) << (nqubits - 1 - i) for i, b in enumerate(ps.paulis.z))
+        xmask = sum(int(b) << (nqubits - 1 - i) for i, b in enumerate(ps.paulis.x))
+        weight = ps.weight * [1., -1j, -1., 1j][ps.paulis.q]
+        phase = [1., -1j, -1., 1j][int(np.dot(ps.paulis.z, ps.paulis.x)) % 4]
+        terms.append((weight, phase, zmask, xmask))
+    return nqubits, terms
+
+
+def as_linear_operator(op: AbstractOperator, sector=None) -> LinearOperator:
+    """
+    Represent an operator as matrix-free `scipy.sparse.linalg.LinearOperator`,
+    optionally restricted to a particle number sector (see `sector_indices`),
+    which must be conserved by the operator.
+
+    Pauli operators (including Hamiltonians providing `as_pauli_operator`) are
+    applied to vectors without forming a matrix, based on bit operations on
+    the basis state indices; other operators use their sparse matrix representation,
+    with multi-threaded matrix-vector products (see `as_parallel_operator`).
+    """
+    pauli_terms = _pauli_terms(op)
+    if pauli_terms is not None:
+        nqubits, terms = pauli_terms
+        idx = np.arange(2**nqubits, dtype=np.int64) if sector is None else sector_indices(nqubits, sector)
+        dtype = complex if any(np.iscomplex(w * p) for w, p, _, _ in terms) else float
+
+        # group terms by X bit masks, which determine the permutation of basis states
+        groups = {}
+        for weight, phase, zmask, xmask in terms:
+            groups.setdefault(xmask, []).append((weight, phase, zmask))
+        # cache permutations and diagonal factors if sufficient memory is available
+        # (complex diagonal entries, and positions and validity flags for a sector)
+        use_cache = len(groups) * len(idx) * (16 if sector is None else 25) <= _cache_max_bytes
+        cache = {}
+
+        def diagonal(xmask, adjoint, r0=0, r1=len(idx)):
+            # (Z^z X^x x)[i] = (-1)^|i & z| x[i ^ x]
+            d = 0
+            for weight, phase, zmask in groups[xmask]:
+                c = (np.conj(weight) if adjoint else weight) * phase
+                d = d + c * (1 - 2*_bit_parity(idx[r0:r1] & zmask))
+            return np.real(d) if dtype == float else d
+
+        def permutation(xmask, r0=0, r1=len(idx)):
+            jdx = idx[r0:r1] ^ xmask
+            if sector is None:
+                return jdx, None
+            pos = np.minimum(np.searchsorted(idx, jdx), len(idx) - 1)
+            return pos, (idx[pos] == jdx)
+
+        # blocks of rows processed in parallel
+        bounds = _row_partition(len(idx))
+
+        def matvec(x, adjoint=False):
+            x = np.reshape(x, -1)
+            y = np.zeros(len(idx), dtype=np.result_type(dtype, x.dtype))
+            if use_cache:
+                for xmask in groups:
+                    if (xmask, adjoint) not in cache:
+                        cache[(xmask, adjoint)] = (diagonal(xmask, adjoint), permutation(xmask))
+
+            def block_matvec(r0, r1):
+                for xmask in groups:
+                    if use_cache:
+                        d, (pos, valid) = cache[(xmask, adjoint)]
+                        d = d[r0:r1] if np.ndim(d) > 0 else d
+                        pos = pos[r0:r1]
+                        valid = valid[r0:r1] if valid is not None else None
+                    else:
+                        d = diagonal(xmask, adjoint, r0, r1)
+                        pos, valid = permutation(xmask, r0, r1)
+                    xp = x[pos]
+                    if valid is not None:
+                        # entries outside of the sector vanish
+                        xp = np.where(valid, xp, 0)
+                    y[r0:r1] += d * xp
+
+            _run_row_blocks(bounds, block_matvec)
+            return y
+
+        return LinearOperator((len(idx), len(idx)), matvec=matvec,
+                              rmatvec=lambda x: matvec(x, True), dtype=dtype)
+    if sector is not None and isinstance(op, (FieldOperator, FermiHubbardHamiltonian, MolecularHamiltonian)):
+        # assemble the matrix restricted to the sector directly
+        return as_parallel_operator(op.as_matrix(sector=sector))
+    mat = op.as_matrix()
+    mat = sparse.csr_matrix(mat)
+    if sector is not None:
+        nqubits = int(np.log2(mat.shape[0]))
+        idx = sector_indices(nqubits, sector)
+        mat = mat[idx][:, idx]
+    return as_parallel_operator(mat)
@@ -0,0 +1,165 @@
+import os
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator
+
+
+# number of threads used for sparse matrix products (None: number of available CPUs)
+_num_threads = None
+# minimum number of stored entries per thread for parallel execution
+_min_nnz_per_thread = 2**15
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def set_num_threads(num_threads: int):
+    """
+    Set the number of threads used for parallel sparse matrix products
+    (None to use the number of available CPUs).
+    """
+    global _num_threads, _executor
+    if num_threads is not None and num_threads < 1:
+        raise ValueError("number of threads must be positive")
+    with _executor_lock:
+        _num_threads = num_threads
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def get_num_threads() -> int:
+    """
+    Get the number of threads used for parallel sparse matrix products.
+    """
+    if _num_threads is not None:
+        return _num_threads
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _get_executor():
+    """
+    Get the (lazily created) shared thread pool.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_num_threads())
+        return _executor
+
+
+def _row_partition(nrows: int, min_rows: int=2**15, num_threads: int=None) -> np.ndarray:
+    """
+    Partition `nrows` rows into at most `num_threads` contiguous blocks
+    of at least `min_rows` rows, returned as block boundaries.
+    """
+    if num_threads is None:
+        num_threads = get_num_threads()
+    nparts = max(1, min(num_threads, nrows // max(min_rows, 1)))
+    return np.linspace(0, nrows, nparts + 1).astype(int)
+
+
+def _run_row_blocks(bounds: np.ndarray, func):
+    """
+    Call `func(r0, r1)` for each row block [r0, r1) specified by the boundaries `bounds`,
+    using the shared thread pool if there is more than one block.
+    """
+    if len(bounds) <= 2:
+        func(bounds[0], bounds[-1])
+        return
+    # propagate exceptions raised by the threads
+    for f in [_get_executor().submit(func, r0, r1) for r0, r1 in zip(bounds[:-1], bounds[1:])]:
+        f.result()
+
+
+class ParallelCSRMatrix:
+    """
+    Compressed sparse row (CSR) matrix partitioned into blocks of consecutive rows
+    with balanced numbers of stored entries, such that matrix-vector and matrix-matrix
+    products are evaluated by a thread pool, one block per thread.
+
+    The products of the blocks are computed by the SciPy sparse kernels,
+    which release the global interpreter lock.
+    """
+    def __init__(self, mat, num_threads: int=None):
+        mat = sparse.csr_matrix(mat)
+        if num_threads is None:
+            num_threads = get_num_threads()
+        nparts = max(1, min(num_threads, mat.nnz // _min_nnz_per_thread, mat.shape[0]))
+        # row boundaries, balancing the number of stored entries
+        bounds = np.searchsorted(mat.indptr, np.linspace(0, mat.nnz, nparts + 1), side="left")
+        bounds[0] = 0
+        bounds[-1] = mat.shape[0]
+        bounds = np.unique(bounds)
+        self.shape = mat.shape
+        self.dtype = mat.dtype
+        self.mat = mat
+        self.row_bounds = bounds
+        self.blocks = [mat[r0:r1] for r0, r1 in zip(bounds[:-1], bounds[1:])]
+        self._adjoint = None
+
+    @property
+    def num_blocks(self) -> int:
+        """
+        Number of row blocks.
+        """
+        return len(self.blocks)
+
+    def dot(self, x: np.ndarray) -> np.ndarray:
+        """
+        Compute the product of the matrix with the vector or matrix `x`.
+        """
+        x = np.asarray(x)
+        if x.shape[0] != self.shape[1]:
+            raise ValueError(f"dimension mismatch: matrix has {self.shape[1]} columns, operand has {x.shape[0]} rows")
+        y = np.empty((self.shape[0],) + x.shape[1:], dtype=np.result_type(self.dtype, x.dtype))
+        block_index = { r0: k for k, r0 in enumerate(self.row_bounds[:-1]) }
+
+        def block_product(r0, r1):
+            y[r0:r1] = self.blocks[block_index[r0]] @ x
+
+        _run_row_blocks(self.row_bounds, block_product)
+        return y
+
+    def __matmul__(self, x):
+        return self.dot(x)
+
+    def adjoint(self):
+        """
+        Conjugate transpose of the matrix, as (cached) `ParallelCSRMatrix`.
+        """
+        if self._adjoint is None:
+            self._adjoint = ParallelCSRMatrix(self.mat.conj().T.tocsr(), len(self.blocks))
+            self._adjoint._adjoint = self
+        return self._adjoint
+
+
+def parallel_matvec(mat, x: np.ndarray, num_threads: int=None) -> np.ndarray:
+    """
+    Compute the product of the sparse matrix `mat` with the vector or matrix `x`,
+    using a thread pool over blocks of rows (see `ParallelCSRMatrix`).
+
+    For repeated products with the same matrix, construct a `ParallelCSRMatrix`
+    (or use `as_parallel_operator`) to avoid partitioning the matrix each time.
+    """
+    if not isinstance(mat, ParallelCSRMatrix):
+        mat = ParallelCSRMatrix(mat, num_threads)
+    return mat.dot(x)
+
+
+def as_parallel_operator(mat, num_threads: int=None) -> LinearOperator:
+    """
+    Represent a sparse matrix as `scipy.sparse.linalg.LinearOperator`
+    with multi-threaded matrix-vector and matrix-matrix products.
+    """
+    pmat = mat if isinstance(mat, ParallelCSRMatrix) else ParallelCSRMatrix(mat, num_threads)
+    return LinearOperator(pmat.shape,
+                          matvec=lambda x: pmat.dot(np.reshape(x, -1)),
+                          rmatvec=lambda x: pmat.adjoint().dot(np.reshape(x, -1)),
+                          matmat=pmat.dot,
+                          rmatmat=lambda x: pmat.adjoint().dot(x),
+                          dtype=pmat.dtype)
@@ -0,0 +1,78 @@
+import enum
+import weakref
+import numpy as np
+from scipy import sparse
+from qib.operator import AbstractOperator
+
+
+# cached eigendecompositions, indexed by operator object IDs
+_eigh_cache = {}
+
+
+def _parameters(obj, active=None):
+    """
+    Represent the parameters of an operator (recursively including its terms,
+    like Pauli strings or field operator terms) as comparable nested tuple.
+
+    Arrays are represented by their data type, shape and raw bytes, such that
+    comparing parameters costs much less than assembling the matrix representation.
+    Other objects (like fields) are included as they are.
+    """
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, enum.Enum)):
+        return obj
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return (obj.dtype.str, obj.shape, obj.tobytes())
+    if sparse.issparse(obj):
+        obj = obj.tocoo()
+        return (obj.shape, _parameters(obj.row), _parameters(obj.col), _parameters(obj.data))
+    if isinstance(obj, (list, tuple)):
+        return tuple(_parameters(x, active) for x in obj)
+    if isinstance(obj, dict):
+        return tuple((k, _parameters(v, active)) for k, v in sorted(obj.items()))
+    if type(obj).__module__.startswith("qib.operator"):
+        # guard against cyclic references
+        active = set() if active is None else active
+        if id(obj) in active:
+            return None
+        active.add(id(obj))
+        params = (type(obj), tuple((k, _parameters(v, active)) for k, v in sorted(vars(obj).items())
+                                   if not k.endswith("_cache")))
+        active.remove(id(obj))
+        return params
+    return obj
+
+
+def cached_eigh(op: AbstractOperator):
+    """
+    Compute the eigendecomposition of a Hermitian operator, as tuple of
+    eigenvalues (in ascending order) and eigenvectors (as columns).
+
+    The result is cached for the lifetime of the operator object, and recomputed
+    if the parameters of the operator change. Thus repeated calls,
+    e.g., when forming matrix functions of the operator, avoid the O(8^n) cost
+    (and do not assemble the matrix representation again).
+    """
+    key = id(op)
+    params = _parameters(op)
+    entry = _eigh_cache.get(key)
+    if entry is not None:
+        ref, cparams, evals, evecs = entry
+        if ref() is op and cparams == params:
+            return evals, evecs
+    hmat = op.as_matrix()
+    evals, evecs = np.linalg.eigh(hmat.toarray() if sparse.issparse(hmat) else np.asarray(hmat))
+    # remove cache entry once the operator is deleted
+    ref = weakref.ref(op, lambda _, key=key: _eigh_cache.pop(key, None))
+    _eigh_cache[key] = (ref, params, evals, evecs)
+    return evals, evecs
+
+
+def is_eigh_cached(op: AbstractOperator) -> bool:
+    """
+    Whether an eigendecomposition of the operator object is currently cached
+    (without checking whether the operator has been modified since).
+    """
+    entry = _eigh_cache.get(id(op))
+    return entry is not None and entry[0]() is op
@@ -1,4 +1,5 @@
 import numpy as np
+from scipy import sparse
 from qib.field import ParticleType, Field
 from qib.lattice import LayeredLattice
 from qib.operator import AbstractOperator, FieldOperator, FieldOperatorTerm, IFOType, IFODesc
@@ -51,37 +52,36 @@ class FermiHubbardHamiltonian(AbstractOperator):
         """
         latt = self.field.lattice
         L = latt.nsites
-        adj = latt.adjacency_matrix()
+        # using sparse coefficient storage, since the interaction term
+        # has only O(L) non-zero coefficients among L^4 entries
         if self.spin:
             assert L % 2 == 0
-            kin_coeffs = -self.t * np.kron(np.identity(2), adj[:(L//2), :(L//2)])
-            int_coeffs = np.zeros((L, L, L, L))
-            for i in range(L//2):
-                int_coeffs[i, i, i + L//2, i + L//2] = self.u
+            adj = latt.base_lattice.sparse_adjacency_matrix()
+            kin_coeffs = -self.t * sparse.kron(sparse.identity(2), adj)
+            i = np.arange(L//2)
+            int_indices = np.stack((i, i, i + L//2, i + L//2), axis=-1)
         else:
-            kin_coeffs = -self.t * adj
-            int_coeffs = np.zeros((L, L, L, L))
-            for i in range(L):
-                for j in range(i + 1, L):
-                    if adj[i, j] != 0:
-                        int_coeffs[i, i, j, j] = self.u
+            kin_coeffs = -self.t * latt.sparse_adjacency_matrix()
+            i, j = latt.edges().T
+            int_indices = np.stack((i, i, j, j), axis=-1)
         # kinetic hopping term
         T = FieldOperatorTerm([IFODesc(self.field, IFOType.FERMI_CREATE),
                                IFODesc(self.field, IFOType.FERMI_ANNIHIL)],
                               kin_coeffs)
         # interaction term
-        V = FieldOperatorTerm([IFODesc(self.field, IFOType.FERMI_CREATE),
-                               IFODesc(self.field, IFOType.FERMI_ANNIHIL),
-                               IFODesc(self.field, IFOType.FERMI_CREATE),
-                               IFODesc(self.field, IFOType.FERMI_ANNIHIL)],
-                              int_coeffs)
+        V = FieldOperatorTerm.from_coo([IFODesc(self.field, IFOType.FERMI_CREATE),
+                                        IFODesc(self.field, IFOType.FERMI_ANNIHIL),
+                                        IFODesc(self.field, IFOType.FERMI_CREATE),
+                                        IFODesc(self.field, IFOType.FERMI_ANNIHIL)],
+                                       int_indices, np.full(len(int_indices), self.u), 4*(L,))
         return FieldOperator([T, V])
 
-    def as_matrix(self):
+    def as_matrix(self, sector=None):
         """
-        Generate the (sparse) matrix representation of the Hamiltonian.
+        Generate the (sparse) matrix representation of the Hamiltonian,
+        optionally restricted to a particle number sector (see `FieldOperator.as_matrix`).
         """
-        return self.as_field_operator().as_matrix()
+        return self.as_field_operator().as_matrix(sector)
 
     @property
     def nsites(self) -> int:
@@ -4,6 +4,12 @@ import numpy as np
 from scipy import sparse
 from qib.operator import AbstractOperator
 from qib.field import ParticleType, Field
+from qib.util import sector_basis_states, sector_basis_rank, in_sector
+from qib.util.util import _bit_parity
+
+
+# maximum number of entries of intermediate arrays when applying fermionic monomials to basis states
+_max_block_entries = 2**16
 
 
 class IFOType(enum.Enum):
@@ -67,13 +73,84 @@ class FieldOperatorTerm:
 
     Each summation index is associated with a field and the
     operator type (e.g., fermionic creation operator).
+
+    The coefficients are stored either as dense array, or in sparse coordinate (COO) format
+    (see `from_coo`, also used when passing a SciPy sparse matrix as `coeffs`),
+    such that only the non-zero coefficients are stored and iterated over.
     """
     def __init__(self, opdesc: Sequence[IFODesc], coeffs):
         self.opdesc = tuple(opdesc)
-        self.coeffs = np.asarray(coeffs)
-        if self.coeffs.ndim != len(self.opdesc):
+        if sparse.issparse(coeffs):
+            coeffs = sparse.coo_matrix(coeffs)
+            self._coeffs = None
+            self._indices = np.stack((coeffs.row, coeffs.col), axis=-1).astype(np.int64)
+            self._values = coeffs.data
+            self.shape = coeffs.shape
+        else:
+            self._coeffs = np.asarray(coeffs)
+            self._indices = None
+            self._values = None
+            self.shape = self._coeffs.shape
+        if len(self.shape) != len(self.opdesc):
             raise ValueError("number of operator descriptions must match dimension of coefficient array")
 
+    @classmethod
+    def from_coo(cls, opdesc: Sequence[IFODesc], indices, values, shape: Sequence[int]):
+        """
+        Construct a field operator term with coefficients in sparse coordinate (COO) format,
+        given the indices (as array of shape (number of entries, number of operators))
+        and values of the entries. Duplicate entries are summed.
+        """
+        term = cls.__new__(cls)
+        term.opdesc = tuple(opdesc)
+        term.shape = tuple(shape)
+        if len(term.shape) != len(term.opdesc):
+            raise ValueError("number of operator descriptions must match dimension of coefficient array")
+        values = np.reshape(np.asarray(values), -1)
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size != len(values) * len(term.shape):
+            raise ValueError("number of indices must match number of values")
+        indices = np.reshape(indices, (len(values), len(term.shape)))
+        if np.any(indices < 0) or np.any(indices >= np.array(term.shape, dtype=np.int64)):
+            raise ValueError("coefficient indices out of range")
+        term._coeffs = None
+        term._indices, term._values = _sum_duplicates(indices, values, term.shape)
+        return term
+
+    @property
+    def is_sparse(self) -> bool:
+        """
+        Whether the coefficients are stored in sparse coordinate format.
+        """
+        return self._coeffs is None
+
+    @property
+    def coeffs(self) -> np.ndarray:
+        """
+        Coefficients as dense array (constructed on demand for sparse storage).
+        """
+        if self._coeffs is not None:
+            return self._coeffs
+        coeffs = np.zeros(self.shape, dtype=self._values.dtype)
+        np.add.at(coeffs, tuple(self._indices.T), self._values)
+        return coeffs
+
+    def nonzero(self, tol: float=0.):
+        """
+        Indices (as array of shape (number of entries, number of operators))
+        and values of the coefficients with magnitude larger than `tol`.
+        """
+        if self._coeffs is not None:
+            indices, values = _nonzero_coefficients(self._coeffs)
+        else:
+            indices, values = self._indices, self._values
+            nz = values != 0
+            indices, values = indices[nz], values[nz]
+        if tol > 0:
+            keep = np.abs(values) > tol
+            indices, values = indices[keep], values[keep]
+        return indices, values
+
     def is_hermitian(self):
         """
         Whether the field operator term is Hermitian.
@@ -83,7 +160,18 @@ class FieldOperatorTerm:
                    (self.opdesc[i].otype == IFOType.adjoint(self.opdesc[n-1-i].otype))
                    for i in range(n)):
             return False
-        return np.allclose(self.coeffs, self.coeffs.conj().T)
+        if not self.is_sparse:
+            return np.allclose(self.coeffs, self.coeffs.conj().T)
+        if self.shape != self.shape[::-1]:
+            return False
+        # compare with conjugate transposed entries
+        ind, val = _sum_duplicates(self._indices, self._values, self.shape)
+        ind_adj, val_adj = _sum_duplicates(ind[:, ::-1], val.conj(), self.shape)
+        ind_all, inv = np.unique(np.concatenate((ind, ind_adj)), axis=0, return_inverse=True)
+        diff = np.zeros(len(ind_all), dtype=np.result_type(val.dtype, complex))
+        np.add.at(diff, np.reshape(inv, -1)[:len(ind)], val)
+        np.add.at(diff, np.reshape(inv, -1)[len(ind):], -val_adj)
+        return np.allclose(diff, 0)
 
     def fields(self):
         """
@@ -99,8 +187,10 @@ class FieldOperatorTerm:
         """
         Construct the adjoint (conjugate transpose) field operator term.
         """
-        return FieldOperatorTerm((desc.adjoint() for desc in reversed(self.opdesc)),
-                                 self.coeffs.conj().T)
+        opdesc = (desc.adjoint() for desc in reversed(self.opdesc))
+        if self.is_sparse:
+            return FieldOperatorTerm.from_coo(opdesc, self._indices[:, ::-1], self._values.conj(), self.shape[::-1])
+        return FieldOperatorTerm(opdesc, self.coeffs.conj().T)
 
     def __matmul__(self, other):
         """
@@ -108,6 +198,13 @@ class FieldOperatorTerm:
         """
         if not isinstance(other, FieldOperatorTerm):
             raise ValueError("expecting another field operator term for multiplication")
+        if self.is_sparse or other.is_sparse:
+            # outer product of non-zero entries
+            ind1, val1 = self.nonzero()
+            ind2, val2 = other.nonzero()
+            indices = np.concatenate((np.repeat(ind1, len(ind2), axis=0), np.tile(ind2, (len(ind1), 1))), axis=1)
+            return FieldOperatorTerm.from_coo(self.opdesc + other.opdesc, indices,
+                                              np.kron(val1, val2), self.shape + other.shape)
         coeffs = np.kron(self.coeffs.reshape(-1),
                         other.coeffs.reshape(-1)).reshape(self.coeffs.shape + other.coeffs.shape)
         return FieldOperatorTerm(self.opdesc + other.opdesc, coeffs)
@@ -188,9 +285,18 @@ class FieldOperator(AbstractOperator):
         """
         return FieldOperator([term.adjoint() for term in self.terms])
 
-    def as_matrix(self):
+    def as_matrix(self, sector=None):
         """
         Generate the (sparse) matrix representation of the operator.
+
+        Each fermionic monomial is applied to all basis states at once using
+        bit operations (see `_apply_fermi_monomial`), and the matrix is assembled
+        from the resulting entries in a single pass.
+
+        Optionally, the matrix is restricted to the particle number sector `sector`,
+        either `N`, `(N,)` or `(N_up, N_down)` (see `qib.util.sector_basis_states`), which
+        must be conserved by the operator. Only the basis states in the sector are
+        enumerated, and the matrix is assembled directly based on their combinatorial ranking.
         """
         fields = self.fields()
         if len(fields) != 1 or fields[0].ptype != ParticleType.FERMION:
@@ -198,37 +304,90 @@ class FieldOperator(AbstractOperator):
             raise NotImplementedError
         # number of lattice sites
         L = fields[0].lattice.nsites
-        # assemble fermionic creation operators based on Jordan-Wigner transformation
-        I = sparse.identity(2)
-        Z = sparse.csr_matrix([[ 1.,  0.], [ 0., -1.]])
-        U = sparse.csr_matrix([[ 0.,  0.], [ 1.,  0.]])
-        clist = []
-        for i in range(L):
-            c = sparse.identity(1)
-            for j in range(L):
-                if j < i:
-                    c = sparse.kron(c, I)
-                elif j == i:
-                    c = sparse.kron(c, U)
-                else:
-                    c = sparse.kron(c, Z)
-            clist.append(c)
-        # corresponding annihilation operators
-        alist = [c.conj().T for c in clist]
-        # assemble overall field operator
-        op = sparse.csr_matrix((2**L, 2**L))
+        if sector is None:
+            states = np.arange(2**L, dtype=np.int64)
+        else:
+            states = sector_basis_states(L, sector)
+        n = len(states)
+        rows = []
+        cols = []
+        vals = []
         for term in self.terms:
-            it = np.nditer(term.coeffs, flags=["multi_index"])
-            for coeff in it:
-                if coeff == 0:
-                    continue
-                fstring = sparse.identity(2**L)
-                for i, j in enumerate(it.multi_index):
-                    if term.opdesc[i].otype == IFOType.FERMI_CREATE:
-                        fstring = fstring @ clist[j]
-                    elif term.opdesc[i].otype == IFOType.FERMI_ANNIHIL:
-                        fstring = fstring @ alist[j]
-                    else:
-                        raise RuntimeError(f"expecting fermionic operator, but received {term.opdesc[i].otype}")
-                op += coeff * fstring
-        return op
+            for desc in term.opdesc:
+                if desc.otype not in (IFOType.FERMI_CREATE, IFOType.FERMI_ANNIHIL):
+                    raise RuntimeError(f"expecting fermionic operator, but received {desc.otype}")
+            otypes = [desc.otype for desc in term.opdesc]
+            # indices and values of non-zero coefficients
+            modes, coeffs = term.nonzero()
+            # process blocks of monomials, limiting the size of intermediate arrays
+            m = max(1, _max_block_entries // max(n, 1))
+            for k in range(0, len(coeffs), m):
+                out, sign = _apply_fermi_monomial(states, L, modes[k:k+m], otypes)
+                mi, nz = np.nonzero(sign)
+                rows.append(out[mi, nz])
+                cols.append(nz)
+                vals.append(coeffs[k:k+m][mi] * sign[mi, nz])
+        if not vals:
+            return sparse.csr_matrix((n, n))
+        rows = np.concatenate(rows)
+        if sector is not None:
+            if not np.all(in_sector(L, sector, rows)):
+                raise ValueError(f"operator does not conserve the particle number sector {sector}")
+            rows = sector_basis_rank(L, sector, rows)
+        return sparse.coo_matrix((np.concatenate(vals), (rows, np.concatenate(cols))),
+                                 shape=(n, n)).tocsr()
+
+
+def _nonzero_coefficients(coeffs: np.ndarray):
+    """
+    Indices (as array of shape (number of non-zero entries, coeffs.ndim))
+    and values of the non-zero entries of a coefficient array.
+    """
+    if coeffs.ndim == 0:
+        m = 1 if coeffs != 0 else 0
+        return np.zeros((m, 0), dtype=np.int64), np.reshape(coeffs, -1)[:m]
+    nz = np.nonzero(coeffs)
+    return np.stack(nz, axis=-1), coeffs[nz]
+
+
+def _sum_duplicates(indices: np.ndarray, values: np.ndarray, shape: Sequence[int]):
+    """
+    Sum duplicate entries of coefficients in coordinate format,
+    and sort the entries lexicographically by their indices.
+    """
+    if len(shape) == 0:
+        if len(values) == 0:
+            return indices, values
+        return np.zeros((1, 0), dtype=np.int64), np.array([np.sum(values)])
+    keys = np.ravel_multi_index(tuple(indices.T), shape)
+    keys, inv = np.unique(keys, return_inverse=True)
+    summed = np.zeros(len(keys), dtype=values.dtype)
+    np.add.at(summed, np.reshape(inv, -1), values)
+    return np.stack(np.unravel_index(keys, shape), axis=-1).astype(np.int64), summed
+
+
+def _apply_fermi_monomial(states: np.ndarray, L: int, modes: np.ndarray, otypes: Sequence[IFOType]):
+    """
+    Apply products of fermionic creation and annihilation operators
+    of types `otypes` (leftmost operator applied last) to the basis states `states`
+    (as integers, with mode 0 corresponding to the most significant bit).
+    Each row of `modes` specifies the modes the operators of one product act on.
+
+    Follows the Jordan-Wigner convention with creation operators
+    I x ... x I x [[0, 0], [1, 0]] x Z x ... x Z, i.e., the sign is determined
+    by the parity of the occupied modes with larger indices.
+    Returns the resulting basis states and sign factors (zero if the result vanishes),
+    as arrays of shape (number of products, number of states).
+    """
+    modes = np.asarray(modes, dtype=np.int64)
+    if modes.ndim == 1:
+        modes = modes[None, :]
+    out = np.broadcast_to(np.asarray(states, dtype=np.int64), (len(modes), len(states)))
+    sign = np.ones(out.shape)
+    for i in reversed(range(len(otypes))):
+        bit = (1 << (L - 1 - modes[:, i]))[:, None]
+        occupied = (out & bit) != 0
+        valid = ~occupied if otypes[i] == IFOType.FERMI_CREATE else occupied
+        sign = np.where(valid, sign * (1 - 2*_bit_parity(out & (bit - 1))), 0)
+        out = out ^ bit
+    return out, sign
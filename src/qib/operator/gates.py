@@ -3,12 +3,13 @@ from enum import Enum
 from copy import copy
 from typing import Sequence
 import numpy as np
-from scipy.linalg import expm, sqrtm, block_diag
+from scipy.linalg import block_diag
 from scipy.sparse import csr_matrix
 from qib.field import Field, Particle, Qubit
 from qib.operator import AbstractOperator
 from qib.tensor_network import SymbolicTensor, SymbolicBond, SymbolicTensorNetwork, TensorNetwork
 from qib.util import map_particle_to_wire
+from qib.linalg import as_linear_operator, expm_krylov, cached_eigh, is_eigh_cached
 
 
 class Gate(AbstractOperator):
@@ -1922,10 +1923,35 @@ class TimeEvolutionGate(Gate):
     def as_matrix(self):
         """
         Generate the matrix representation of the time evolution gate.
+
+        Based on the (cached) eigendecomposition of the Hermitian matrix
+        representation of `h`, such that gates with the same Hamiltonian
+        but different times reuse the decomposition.
+        """
+        evals, evecs = cached_eigh(self.h)
+        return (evecs * np.exp(-1j*self.t * evals)) @ evecs.conj().T
+
+    def apply(self, psi: np.ndarray, method: str=None):
+        """
+        Apply the time evolution gate to the state vector `psi`.
+
+        Supported methods:
+          - "eigh": based on the (cached) eigendecomposition of `h`,
+            with cost O(4^n) per application once the decomposition is available;
+          - "krylov": Lanczos-based Krylov subspace approximation using
+            matrix-free (or sparse) applications of `h`.
+        By default, "eigh" is used if `h` acts on at most 10 qubits
+        or its eigendecomposition is already cached, and "krylov" otherwise.
         """
-        hmat = self.h.as_matrix().toarray()
-        # TODO: exploit that `hmat` is Hermitian for computing the matrix exponential
-        return expm(-1j*self.t * hmat)
+        psi = np.asarray(psi)
+        if method is None:
+            method = "eigh" if (self.num_wires <= 10 or is_eigh_cached(self.h)) else "krylov"
+        if method == "eigh":
+            evals, evecs = cached_eigh(self.h)
+            return evecs @ (np.exp(-1j*self.t * evals) * (evecs.conj().T @ psi))
+        if method == "krylov":
+            return expm_krylov(as_linear_operator(self.h).matvec, psi, self.t)
+        raise ValueError(f"unknown method '{method}'")
 
     @property
     def num_wires(self):
@@ -2007,7 +2033,8 @@ class BlockEncodingMethod(Enum):
 class BlockEncodingGate(Gate):
     """
     Block encoding gate of a Hamiltonian `h`, assumed to be Hermitian
-    and normalized such that its spectral norm is bounded by 1.
+    and normalized such that its spectral norm is bounded by 1
+    (the spectral norm can be estimated by `qib.linalg.spectral_norm`).
     Output state is Hamiltonian applied to principal input state
     if auxiliary qubit(s) is initialized to |0>.
     """
@@ -2015,6 +2042,9 @@ class BlockEncodingGate(Gate):
         self.h = h
         self.method = method
         self.auxiliary_qubits = []
+        # cached matrices of h and of the square root of I - h^2,
+        # together with the eigenvectors of h they are based on
+        self._matrix_cache = None
 
     def is_hermitian(self):
         """
@@ -2055,11 +2085,13 @@ class BlockEncodingGate(Gate):
         """
         if self.method == BlockEncodingMethod.Wx:
             ginv = BlockEncodingGate(self.h, BlockEncodingMethod.Wxi)
+            ginv._matrix_cache = self._matrix_cache
             if self.auxiliary_qubits:
                 ginv.set_auxiliary_qubits(self.auxiliary_qubits)
             return ginv
         if self.method == BlockEncodingMethod.Wxi:
             ginv = BlockEncodingGate(self.h, BlockEncodingMethod.Wx)
+            ginv._matrix_cache = self._matrix_cache
             if self.auxiliary_qubits:
                 ginv.set_auxiliary_qubits(self.auxiliary_qubits)
             return ginv
@@ -2117,10 +2149,12 @@ class BlockEncodingGate(Gate):
         """
         Generate the matrix representation of the block encoding gate.
         Format: |ancillary> @ |encoded_state>
+
+        The matrix of `h` and the matrix square root are formed from the (cached)
+        eigendecomposition of `h`, which is shared by all block encoding gates of the same Hamiltonian.
         """
         # assuming that `h` is Hermitian and that its spectral norm is bounded by 1
-        hmat = self.h.as_matrix().toarray()
-        sq1h = sqrtm(np.identity(hmat.shape[0]) - hmat @ hmat)
+        hmat, sq1h = self._encoding_matrices()
         if self.method == BlockEncodingMethod.Wx:
             return np.block([[hmat, 1j*sq1h], [1j*sq1h, hmat]])
         if self.method == BlockEncodingMethod.Wxi:
@@ -2129,6 +2163,57 @@ class BlockEncodingGate(Gate):
             return np.block([[hmat, sq1h], [sq1h, -hmat]])
         raise NotImplementedError(f"encoding method {self.method} not supported yet")
 
+    def apply(self, psi: np.ndarray):
+        """
+        Apply the block encoding gate to the state vector `psi` (or to each column of `psi`),
+        with the auxiliary qubit corresponding to the slowest varying index.
+
+        The gate is applied in the (cached) eigenbasis of `h`,
+        without forming the matrix representation of the gate.
+        """
+        _, evecs, blocks = self.invariant_blocks()
+        psi = np.asarray(psi)
+        n = len(blocks)
+        if psi.shape[0] != 2*n:
+            raise ValueError(f"state must have leading dimension {2*n}, received {psi.shape[0]}")
+        # coefficients in eigenbasis, with auxiliary qubit as trailing dimension
+        c = np.stack((evecs.conj().T @ psi[:n], evecs.conj().T @ psi[n:]), axis=-1)
+        c = np.einsum(blocks, [0, 1, 2], c, [0, Ellipsis, 2], [0, Ellipsis, 1])
+        return np.concatenate((evecs @ c[..., 0], evecs @ c[..., 1]), axis=0)
+
+    def invariant_blocks(self):
+        """
+        Decompose the gate into its restrictions to the two-dimensional invariant subspaces
+        spanned by |0>|v> and |1>|v>, for each eigenvector |v> of `h`.
+
+        Returns the eigenvalues and eigenvectors of `h` (from the cached eigendecomposition)
+        and the corresponding 2x2 blocks of the gate, as array of shape (2^n, 2, 2).
+        """
+        evals, evecs = cached_eigh(self.h)
+        sq = np.sqrt(np.maximum(1 - evals**2, 0))
+        if self.method == BlockEncodingMethod.Wx:
+            blocks = np.array([[evals, 1j*sq], [1j*sq, evals]])
+        elif self.method == BlockEncodingMethod.Wxi:
+            blocks = np.array([[evals, -1j*sq], [-1j*sq, evals]])
+        elif self.method == BlockEncodingMethod.R:
+            blocks = np.array([[evals, sq], [sq, -evals]])
+        else:
+            raise NotImplementedError(f"encoding method {self.method} not supported yet")
+        return evals, evecs, np.moveaxis(blocks, -1, 0)
+
+    def _encoding_matrices(self):
+        """
+        Compute the matrix of `h` and the matrix square root of I - h^2
+        based on the cached eigendecomposition of `h`.
+        """
+        evals, evecs = cached_eigh(self.h)
+        if self._matrix_cache is None or self._matrix_cache[0] is not evecs:
+            sq = np.sqrt(np.maximum(1 - evals**2, 0))
+            self._matrix_cache = (evecs,
+                                  (evecs * evals) @ evecs.conj().T,
+                                  (evecs * sq) @ evecs.conj().T)
+        return self._matrix_cache[1:]
+
     def as_circuit_matrix(self, fields: Sequence[Field]):
         """
         Generate the sparse matrix representation of the gate
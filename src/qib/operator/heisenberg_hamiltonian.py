@@ -46,21 +46,18 @@ class HeisenbergHamiltonian(AbstractOperator):
         """
         latt = self.field.lattice
         L = latt.nsites
-        adj = latt.adjacency_matrix()
-        assert adj.shape == (L, L)
-        op = PauliOperator()
-
+        edges = latt.edges()
+        # Pauli strings are distinct, such that they can be collected directly
+        pstrings = []
         for k, gate in enumerate(['X', 'Y', 'Z']):
+            # interaction term, iterating over lattice edges
+            # site 0 corresponds to slowest varying index
+            for i, j in edges:
+                pstrings.append(WeightedPauliString(PauliString.from_single_paulis(L, (gate, i), (gate, j)), self.J[k]))
+            # field term
             for i in range(L):
-                for j in range(i + 1, L):
-                    if adj[i, j] == 0:
-                        continue
-                    # interaction term
-                    # site 0 corresponds to slowest varying index
-                    op.add_pauli_string(WeightedPauliString(PauliString.from_single_paulis(L, (gate, i), (gate, j)), self.J[k]))
-                # field term
-                op.add_pauli_string(WeightedPauliString(PauliString.from_single_paulis(L, (gate, i)), self.h[k]))
-        return op
+                pstrings.append(WeightedPauliString(PauliString.from_single_paulis(L, (gate, i)), self.h[k]))
+        return PauliOperator(pstrings)
 
     def as_matrix(self):
         """
@@ -69,6 +66,13 @@ class HeisenbergHamiltonian(AbstractOperator):
         op = self.as_pauli_operator()
         return op.as_matrix()
 
+    def as_mpo(self):
+        """
+        Generate the matrix product operator representation of the Hamiltonian,
+        with site ordering following the lattice.
+        """
+        return self.as_pauli_operator().as_mpo()
+
     @property
     def nsites(self) -> int:
         """
@@ -58,27 +58,24 @@ class IsingHamiltonian(AbstractOperator):
         """
         latt = self.field.lattice
         L = latt.nsites
-        adj = latt.adjacency_matrix()
-        assert adj.shape == (L, L)
-        op = PauliOperator()
         if self.convention == IsingConvention.ISING_ZZ:
             A = 'Z'
             B = 'X'
         else:
             A = 'X'
             B = 'Z'
+        # Pauli strings are distinct, such that they can be collected directly
+        pstrings = []
+        # interaction term, iterating over lattice edges
+        # site 0 corresponds to slowest varying index
+        for i, j in latt.edges():
+            pstrings.append(WeightedPauliString(PauliString.from_single_paulis(L, (A, i), (A, j)), self.J))
         for i in range(L):
-            for j in range(i + 1, L):
-                if adj[i, j] == 0:
-                    continue
-                # interaction term
-                # site 0 corresponds to fastest varying index
-                op.add_pauli_string(WeightedPauliString(PauliString.from_single_paulis(L, (A, i), (A, j)), self.J))
             # longitudinal field term
-            op.add_pauli_string(WeightedPauliString(PauliString.from_single_paulis(L, (A, i)), self.h))
+            pstrings.append(WeightedPauliString(PauliString.from_single_paulis(L, (A, i)), self.h))
             # transverse field term
-            op.add_pauli_string(WeightedPauliString(PauliString.from_single_paulis(L, (B, i)), self.g))
-        return op
+            pstrings.append(WeightedPauliString(PauliString.from_single_paulis(L, (B, i)), self.g))
+        return PauliOperator(pstrings)
 
     def as_matrix(self):
         """
@@ -87,6 +84,13 @@ class IsingHamiltonian(AbstractOperator):
         op = self.as_pauli_operator()
         return op.as_matrix()
 
+    def as_mpo(self):
+        """
+        Generate the matrix product operator representation of the Hamiltonian,
+        with site ordering following the lattice.
+        """
+        return self.as_pauli_operator().as_mpo()
+
     @property
     def nsites(self) -> int:
         """
@@ -85,11 +85,12 @@ class MolecularHamiltonian(AbstractOperator):
                                0.5 * self.vint.transpose((0, 1, 3, 2)))
         return FieldOperator([C, T, V])
 
-    def as_matrix(self):
+    def as_matrix(self, sector=None):
         """
-        Generate the (sparse) matrix representation of the Hamiltonian.
+        Generate the (sparse) matrix representation of the Hamiltonian,
+        optionally restricted to a particle number sector (see `FieldOperator.as_matrix`).
         """
-        return self.as_field_operator().as_matrix()
+        return self.as_field_operator().as_matrix(sector)
 
     @property
     def nsites(self) -> int:
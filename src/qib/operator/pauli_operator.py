@@ -3,6 +3,7 @@ import numpy as np
 from scipy import sparse
 from qib.operator import AbstractOperator
 from qib.field import ParticleType, Field
+from qib.tensor_network import MatrixProductOperator
 
 
 class PauliString(AbstractOperator):
@@ -374,6 +375,68 @@ class PauliOperator(AbstractOperator):
             op += ps.as_matrix()
         return op
 
+    def as_mpo(self, tol: float=1e-13):
+        """
+        Construct the matrix product operator (MPO) representation,
+        with site ordering following the qubit (lattice site) ordering.
+
+        The MPO is built by a finite-state automaton construction,
+        with virtual bond states "not started", "finished" and the
+        prefixes of the Pauli strings which have not been completed yet,
+        and compressed by truncated SVDs afterwards.
+        """
+        nqubits = self.num_qubits
+        if nqubits == 0:
+            raise RuntimeError("number of qubits not specified")
+        paulis = { 'I': np.identity(2),
+                   'X': np.array([[ 0.,  1. ], [ 1.,  0.]]),
+                   'Y': np.array([[ 0., -1j ], [ 1j,  0.]]),
+                   'Z': np.array([[ 1.,  0. ], [ 0., -1.]]) }
+        # virtual bond states, per bond between sites i-1 and i
+        start, end = "start", "end"
+        bond_states = [{ start: 0 }] + [{ start: 0, end: 1 } for _ in range(nqubits - 1)] + [{ end: 0 }]
+        # transitions per site, as dictionary (left state, right state) -> local operator
+        transitions = [{} for _ in range(nqubits)]
+        for i in range(nqubits):
+            transitions[i][(start, start)] = paulis['I']
+            transitions[i][(end, end)] = paulis['I']
+        for ps in self.pstrings:
+            # logical Pauli matrices at sites with z = x = 1 are Y matrices
+            coeff = ps.weight * [1., -1j, -1., 1j][ps.paulis.q]
+            if coeff == 0:
+                continue
+            support = [i for i in range(nqubits) if ps.paulis.get_pauli(i) != 'I']
+            if not support:
+                # multiple of identity
+                support = [0]
+            first, last = support[0], support[-1]
+            left = start
+            # non-identity local operators applied so far
+            prefix = ()
+            for i in range(first, last + 1):
+                p = ps.paulis.get_pauli(i)
+                if i == last:
+                    # coefficient is attached to the completing local operator
+                    key = (left, end)
+                    transitions[i][key] = transitions[i].get(key, 0) + coeff * paulis[p]
+                else:
+                    if p != 'I':
+                        prefix = prefix + ((i, p),)
+                    if prefix not in bond_states[i + 1]:
+                        bond_states[i + 1][prefix] = len(bond_states[i + 1])
+                    transitions[i][(left, prefix)] = paulis[p]
+                    left = prefix
+        tensors = []
+        for i in range(nqubits):
+            w = np.zeros((len(bond_states[i]), 2, 2, len(bond_states[i + 1])), dtype=complex)
+            for (a, b), op in transitions[i].items():
+                if a in bond_states[i] and b in bond_states[i + 1]:
+                    w[bond_states[i][a], :, :, bond_states[i + 1][b]] += op
+            tensors.append(w)
+        if all(np.isreal(w).all() for w in tensors):
+            tensors = [w.real for w in tensors]
+        return MatrixProductOperator(tensors).compress(tol)
+
     def remove_zero_weight_strings(self, tol=0.0):
         """
         Remove the redundant Pauli strings with weight zero.
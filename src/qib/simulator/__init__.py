@@ -1,3 +1,4 @@
 from qib.simulator.simulator import Simulator
 from qib.simulator.statevector_simulator import StatevectorSimulator
 from qib.simulator.tensor_network_simulator import TensorNetworkSimulator
+from qib.simulator.mps_simulator import MPSSimulator
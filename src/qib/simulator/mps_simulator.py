@@ -0,0 +1,38 @@
+from typing import Sequence
+from qib.simulator import Simulator
+from qib.circuit import Circuit
+from qib.field import Field
+from qib.tensor_network import MatrixProductState
+from qib.util import map_particle_to_wire
+
+
+class MPSSimulator(Simulator):
+    """
+    Matrix product state simulator, storing the quantum state as MPS
+    over the wires of the fields (in the order of `fields`).
+
+    Virtual bonds are truncated to at most `max_bond_dim` after applying a gate,
+    discarding the smallest singular values with relative weight up to `cutoff`.
+    """
+    def __init__(self, max_bond_dim: int=None, cutoff: float=1e-14):
+        self.max_bond_dim = max_bond_dim
+        self.cutoff = cutoff
+
+    def run(self, circ: Circuit, fields: Sequence[Field], description):
+        """
+        Run a quantum circuit simulation.
+
+        Returns the output state as `MatrixProductState`; the accumulated
+        truncation error is stored in its `truncation_error` member variable.
+        """
+        wiredims = []
+        for field in fields:
+            wiredims += field.lattice.nsites * [field.local_dim]
+        # assuming initial states is |0,...,0>
+        mps = MatrixProductState.basis_state(wiredims)
+        for gate in circ.gates:
+            iwire = [map_particle_to_wire(fields, p) for p in gate.particles()]
+            if any(iw < 0 for iw in iwire):
+                raise RuntimeError("particle not found among fields")
+            mps.apply_operator(gate.as_matrix(), iwire, self.max_bond_dim, self.cutoff)
+        return mps
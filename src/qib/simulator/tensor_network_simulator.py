@@ -1,10 +1,13 @@
 import numpy as np
 from typing import Sequence
 from qib.simulator import Simulator
-from qib.tensor_network import SymbolicTensor, SymbolicBond, SymbolicTensorNetwork, TensorNetwork
+from qib.tensor_network import SymbolicTensor, SymbolicBond, SymbolicTensorNetwork, TensorNetwork, CircuitNetworkBuilder
 from qib.tensor_network.tensor_network import to_full_tensor
 from qib.circuit import Circuit
 from qib.field import Field
+from qib.operator import (Gate, PauliXGate, PauliYGate, PauliZGate,
+                          PauliString, WeightedPauliString, PauliOperator)
+from qib.util import map_particle_to_wire
 
 
 class TensorNetworkSimulator(Simulator):
@@ -12,42 +15,219 @@ class TensorNetworkSimulator(Simulator):
     Tensor network simulator, contracting a circuit interpreted as tensor network.
     """
 
-    def run(self, circ: Circuit, fields: Sequence[Field], description):
+    def run(self, circ: Circuit, fields: Sequence[Field], description, lazy=False):
         """
         Run a quantum circuit simulation.
+
+        If `lazy` is True, the output is a `FullTensorView` of the
+        contracted network instead of the full (dense) tensor.
         """
-        # use |0> states as input
-        init_stn = SymbolicTensorNetwork()
-        init_data = {}
         local_dims = []
         for field in fields:
-            for j in range(field.lattice.nsites):
-                dataref = "|0>_" + str(field.local_dim)
-                i = len(local_dims)
-                init_stn.add_tensor(SymbolicTensor(i, (field.local_dim,), (i,), dataref))
-                if dataref not in init_data:
-                    ket0 = np.zeros(field.local_dim)
-                    ket0[0] = 1
-                    init_data[dataref] = ket0
-                local_dims.append(field.local_dim)
-        # virtual tensor for open axes
-        init_stn.add_tensor(SymbolicTensor(-1, local_dims, list(range(len(local_dims))), None))
-        # add bonds to specify open axes
-        for i in range(len(local_dims)):
-            init_stn.add_bond(SymbolicBond(i, (-1, i)))
-        init_net = TensorNetwork(init_stn, init_data)
+            local_dims += field.lattice.nsites * [field.local_dim]
+        # use |0> states as input
+        init_net = _initial_state_network(local_dims)
         assert init_net.is_consistent()
         assert init_net.num_open_axes == len(local_dims)
 
         net = circ.as_tensornet(fields)
         net.num_open_axes == 2*len(local_dims)
         # merge with init_net for initial |0> states
-        net.merge(init_net, [(len(local_dims) + i, i) for i in range(len(local_dims))])
+        net.merge(init_net, [(len(local_dims) + i, i) for i in range(len(local_dims))], copy_other=False)
 
         # for simplicity, output is full statevector
-        # TODO: tensor network simulation for computing expectation values of observables
         tensor, axes_map = net.contract_einsum()
 
         # in most use-cases, output axes are not duplicate,
         # so returning a tensor here for conceptual simplicity
-        return to_full_tensor(tensor, axes_map)
+        return to_full_tensor(tensor, axes_map, lazy)
+
+    def amplitude(self, circ: Circuit, fields: Sequence[Field], bitstring):
+        """
+        Compute the amplitude :math:`\\langle b | C | 0,...,0 \\rangle` of the
+        computational basis state specified by `bitstring` (one entry per quantum wire).
+        """
+        return self.amplitudes(circ, fields, [bitstring])[0]
+
+    def amplitudes(self, circ: Circuit, fields: Sequence[Field], bitstrings, open_wires: Sequence[int]=None):
+        """
+        Compute the amplitudes :math:`\\langle b | C | 0,...,0 \\rangle` for
+        a batch of computational basis states `b` specified by `bitstrings`.
+
+        The output wires are closed by basis vectors, and the contraction ordering
+        is determined once and shared by all bitstrings.
+        Optionally, the wires with indices in `open_wires` are left open;
+        the bitstrings then only specify the states of the remaining wires
+        (in ascending order), and the returned array contains a tensor of
+        amplitudes for the open wires per bitstring.
+        """
+        wiredims = []
+        for field in fields:
+            wiredims += field.lattice.nsites * [field.local_dim]
+        nwires = len(wiredims)
+        if open_wires is None:
+            open_wires = []
+        open_wires = sorted(open_wires)
+        if len(set(open_wires)) != len(open_wires) or any(iw < 0 or iw >= nwires for iw in open_wires):
+            raise ValueError(f"invalid open wires {open_wires}")
+        closed_wires = [iw for iw in range(nwires) if iw not in open_wires]
+        bitstrings = [[int(b) for b in bitstring] for bitstring in bitstrings]
+        for bitstring in bitstrings:
+            if len(bitstring) != len(closed_wires):
+                raise ValueError(f"bitstring must have length {len(closed_wires)}, received {len(bitstring)}")
+            if any(b < 0 or b >= wiredims[iw] for b, iw in zip(bitstring, closed_wires)):
+                raise ValueError(f"invalid bitstring {bitstring}")
+        net = circ.as_tensornet(fields)
+        # use |0> states as input
+        net.merge(_initial_state_network(wiredims), [(nwires + i, i) for i in range(nwires)], copy_other=False)
+        net.simplify()
+        # close output wires by basis vectors, with data set for each bitstring
+        close_stn = SymbolicTensorNetwork()
+        for k, iw in enumerate(closed_wires):
+            close_stn.add_tensor(SymbolicTensor(k, (wiredims[iw],), (k,), f"<b|_{iw}"))
+        close_stn.add_tensor(SymbolicTensor(-1, [wiredims[iw] for iw in closed_wires], list(range(len(closed_wires))), None))
+        for k in range(len(closed_wires)):
+            close_stn.add_bond(SymbolicBond(k, (-1, k)))
+        close_data = { f"<b|_{iw}": np.zeros(wiredims[iw]) for iw in closed_wires }
+        net.merge(TensorNetwork(close_stn, close_data), [(iw, k) for k, iw in enumerate(closed_wires)], copy_other=False)
+        assert net.num_open_axes == len(open_wires)
+        # shared contraction ordering
+        scaffold = net.net.greedy_contraction_scaffold()
+        amps = np.zeros((len(bitstrings),) + tuple(wiredims[iw] for iw in open_wires), dtype=complex)
+        for i, bitstring in enumerate(bitstrings):
+            for b, iw in zip(bitstring, closed_wires):
+                bra = np.zeros(wiredims[iw])
+                bra[b] = 1
+                net.data[f"<b|_{iw}"] = bra
+            tensor, axes_map, _ = net.contract_tree(scaffold)
+            amps[i] = to_full_tensor(tensor, axes_map)
+        return amps
+
+    def expectation(self, circ: Circuit, fields: Sequence[Field], observable):
+        """
+        Compute the expectation value :math:`\\langle \\psi | O | \\psi \\rangle` of an observable `O`
+        with respect to the output state of the circuit applied to :math:`|0,...,0\\rangle`.
+
+        The observable can be a `PauliOperator`, `WeightedPauliString` or `PauliString`
+        (acting on all quantum wires in `fields`), or a gate interpreted as local observable.
+        Each term is evaluated by contracting the closed network restricted to the
+        backward light cone of its support; the output state networks of
+        identical light cones are shared between terms, and each closed network
+        is simplified (see `TensorNetwork.simplify`) before contraction.
+        """
+        wiredims = []
+        for f in fields:
+            wiredims += f.lattice.nsites * [f.local_dim]
+        nwires = len(wiredims)
+        gate_wires = []
+        for gate in circ.gates:
+            iwire = [map_particle_to_wire(fields, p) for p in gate.particles()]
+            if any(iw < 0 for iw in iwire):
+                raise RuntimeError("particle not found among fields")
+            gate_wires.append(iwire)
+        # local observables, as list of (coefficient, [(wire, operator network), ...])
+        terms = []
+        if isinstance(observable, Gate):
+            iwire = [map_particle_to_wire(fields, p) for p in observable.particles()]
+            if any(iw < 0 for iw in iwire):
+                raise RuntimeError("particle not found among fields")
+            terms.append((1, [(iwire, observable.as_tensornet())]))
+        else:
+            if isinstance(observable, PauliString):
+                pstrings = [WeightedPauliString(observable, 1)]
+            elif isinstance(observable, WeightedPauliString):
+                pstrings = [observable]
+            elif isinstance(observable, PauliOperator):
+                pstrings = observable.pstrings
+            else:
+                raise ValueError(f"unsupported observable type {type(observable)}")
+            if any(wd != 2 for wd in wiredims):
+                raise ValueError("Pauli string observables require qubit wires")
+            pauli_nets = { 'X': PauliXGate().as_tensornet(),
+                           'Y': PauliYGate().as_tensornet(),
+                           'Z': PauliZGate().as_tensornet() }
+            for ps in pstrings:
+                if ps.num_qubits != nwires:
+                    raise ValueError(f"Pauli string acts on {ps.num_qubits} qubits, but fields have {nwires} wires")
+                # logical Pauli matrices at sites with z = x = 1 are Y matrices
+                coeff = ps.weight * [1., -1j, -1., 1j][ps.paulis.q]
+                ops = [([i], pauli_nets[ps.paulis.get_pauli(i)]) for i in range(nwires) if ps.paulis.get_pauli(i) != 'I']
+                terms.append((coeff, ops))
+        # output state networks of light cones, indexed by retained gates and wires
+        ket_cache = {}
+        value = 0
+        for coeff, ops in terms:
+            if coeff == 0:
+                continue
+            support = sorted({ iw for iwire, _ in ops for iw in iwire })
+            if not support:
+                # expectation value of identity
+                value += coeff
+                continue
+            # backward light cone: gates outside the light cone cancel with their inverses
+            cone = set(support)
+            kept = []
+            for k in reversed(range(len(circ.gates))):
+                if cone.intersection(gate_wires[k]):
+                    kept.append(k)
+                    cone.update(gate_wires[k])
+            kept.reverse()
+            cone = sorted(cone)
+            key = (tuple(kept), tuple(cone))
+            if key not in ket_cache:
+                ket = _light_cone_state_network([circ.gates[k] for k in kept], [gate_wires[k] for k in kept], cone, wiredims)
+                ket_cache[key] = (ket, ket.conj())
+            ket, bra = ket_cache[key]
+            # local wire indices within light cone
+            local_index = { iw: i for i, iw in enumerate(cone) }
+            n = len(cone)
+            opbuilder = CircuitNetworkBuilder([wiredims[iw] for iw in cone])
+            for iwire, opnet in ops:
+                opbuilder.append(opnet, [local_index[iw] for iw in iwire])
+            net = opbuilder.build()
+            # sandwich observable between output state and its conjugate
+            net.merge(ket, [(n + i, i) for i in range(n)])
+            net.merge(bra, [(i, i) for i in range(n)])
+            assert net.num_open_axes == 0
+            tensor, _, _ = net.simplify().contract_tree()
+            value += coeff * tensor[()]
+        if observable.is_hermitian():
+            return np.real(value)
+        return value
+
+
+def _initial_state_network(local_dims: Sequence[int]):
+    """
+    Construct the tensor network representation of the |0,...,0> state.
+    """
+    init_stn = SymbolicTensorNetwork()
+    init_data = {}
+    for i, d in enumerate(local_dims):
+        dataref = "|0>_" + str(d)
+        init_stn.add_tensor(SymbolicTensor(i, (d,), (i,), dataref))
+        if dataref not in init_data:
+            ket0 = np.zeros(d)
+            ket0[0] = 1
+            init_data[dataref] = ket0
+    # virtual tensor for open axes
+    init_stn.add_tensor(SymbolicTensor(-1, local_dims, list(range(len(local_dims))), None))
+    # add bonds to specify open axes
+    for i in range(len(local_dims)):
+        init_stn.add_bond(SymbolicBond(i, (-1, i)))
+    return TensorNetwork(init_stn, init_data)
+
+
+def _light_cone_state_network(gates: Sequence[Gate], gate_wires, cone: Sequence[int], wiredims: Sequence[int]):
+    """
+    Construct the tensor network representation of the output state of the gates
+    (acting on wires `gate_wires`) applied to |0,...,0>, restricted to the wires `cone`.
+    """
+    local_index = { iw: i for i, iw in enumerate(cone) }
+    local_dims = [wiredims[iw] for iw in cone]
+    builder = CircuitNetworkBuilder(local_dims)
+    for gate, iwire in zip(gates, gate_wires):
+        builder.append(gate.as_tensornet(), [local_index[iw] for iw in iwire])
+    net = builder.build()
+    n = len(cone)
+    net.merge(_initial_state_network(local_dims), [(n + i, i) for i in range(n)], copy_other=False)
+    return net
@@ -1,2 +1,5 @@
 from qib.tensor_network.tensor_network import TensorNetwork
 from qib.tensor_network.symbolic_network import SymbolicTensor, SymbolicBond, SymbolicTensorNetwork
+from qib.tensor_network.circuit_builder import CircuitNetworkBuilder
+from qib.tensor_network.mps import MatrixProductState
+from qib.tensor_network.mpo import MatrixProductOperator
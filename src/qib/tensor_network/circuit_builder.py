@@ -0,0 +1,122 @@
+from typing import Sequence
+import numpy as np
+from qib.tensor_network.symbolic_network import SymbolicTensor, SymbolicBond, SymbolicTensorNetwork
+from qib.tensor_network.tensor_network import TensorNetwork
+
+
+class CircuitNetworkBuilder:
+    """
+    Incremental builder of the tensor network representation of a quantum circuit.
+
+    The network starts as a collection of identity wires. Gate networks are
+    appended one at a time, with their tensors and bonds copied into the circuit
+    network using fresh IDs, such that the cost per gate only depends on the size
+    of the gate network (and not on the size of the circuit network built so far).
+
+    Open axes follow the convention of `Circuit.as_tensornet`: the first `nwires`
+    axes are the output wires and the last `nwires` axes the input wires.
+    """
+    def __init__(self, wiredims: Sequence[int], debug=False):
+        self.wiredims = list(wiredims)
+        self.debug = debug
+        nwires = len(self.wiredims)
+        stn = SymbolicTensorNetwork()
+        # virtual tensor for open axes, connecting input and output axes
+        self.open_tensor = SymbolicTensor(-1, 2*self.wiredims, 2*list(range(nwires)), None)
+        stn.add_tensor(self.open_tensor)
+        for i in range(nwires):
+            stn.add_bond(SymbolicBond(i, (-1, -1)))
+        self.net = TensorNetwork(stn, {})
+        # next available tensor and bond IDs
+        self.next_tid = 0
+        self.next_bid = nwires
+        if self.debug:
+            assert self.net.is_consistent(verbose=True)
+
+    @property
+    def nwires(self) -> int:
+        """
+        Number of quantum wires.
+        """
+        return len(self.wiredims)
+
+    def append(self, other: TensorNetwork, iwire: Sequence[int]):
+        """
+        Append a gate network acting on wires `iwire`, with open axes ordered as
+        output axes followed by input axes (same ordering as `iwire`).
+
+        The symbolic network of `other` is not modified.
+        """
+        stn = self.net.net
+        m = len(iwire)
+        other_open = other.net.tensors[-1]
+        if other_open.ndim != 2*m:
+            raise ValueError(f"gate network must have {2*m} open axes, but has {other_open.ndim}")
+        for k, iw in enumerate(iwire):
+            if iw < 0 or iw >= self.nwires:
+                raise ValueError(f"wire index {iw} out of range")
+            if other_open.shape[k] != self.wiredims[iw] or other_open.shape[m + k] != self.wiredims[iw]:
+                raise ValueError(f"dimensions of gate axes do not match dimension of wire {iw}")
+        # fresh tensor IDs
+        tid_map = { -1: -1 }
+        for tid in other.net.tensors.keys():
+            if tid != -1:
+                tid_map[tid] = self.next_tid
+                self.next_tid += 1
+        # join gate input axes with current wire output bonds
+        bid_map = {}
+        for k, iw in enumerate(iwire):
+            obid = other_open.bids[m + k]
+            wbid = self.open_tensor.bids[iw]
+            # remove reference to circuit output axis from wire bond
+            stn.bonds[wbid].tids.remove(-1)
+            if obid not in bid_map:
+                bid_map[obid] = wbid
+            elif bid_map[obid] != wbid:
+                # gate bond connects several input wires
+                stn.merge_bonds(bid_map[obid], wbid)
+        # copy gate bonds
+        num_inputs = {}
+        for k in range(m):
+            obid = other_open.bids[m + k]
+            num_inputs[obid] = num_inputs.get(obid, 0) + 1
+        for obid, obond in other.net.bonds.items():
+            tids = [tid_map[tid] for tid in obond.tids]
+            # remove references to gate input axes
+            for _ in range(num_inputs.get(obid, 0)):
+                tids.remove(-1)
+            if obid in bid_map:
+                bond = stn.bonds[bid_map[obid]]
+                bond.tids += tids
+                bond.tids.sort()
+            else:
+                bid_map[obid] = self.next_bid
+                stn.add_bond(SymbolicBond(self.next_bid, tids))
+                self.next_bid += 1
+        # copy gate tensors
+        for tid, otensor in other.net.tensors.items():
+            if tid == -1:
+                continue
+            stn.add_tensor(SymbolicTensor(tid_map[tid], otensor.shape,
+                                          [bid_map[bid] for bid in otensor.bids],
+                                          otensor.dataref))
+        # gate output axes become new circuit output axes
+        for k, iw in enumerate(iwire):
+            self.open_tensor.bids[iw] = bid_map[other_open.bids[k]]
+        # include tensor data from gate network
+        for key, value in other.data.items():
+            if key in self.net.data:
+                if self.net.data[key] is not value and not np.array_equal(self.net.data[key], value):
+                    raise ValueError(f"tensor data entries for {key} in the to-be joined networks do not match")
+            else:
+                self.net.data[key] = value
+        if self.debug:
+            assert self.net.is_consistent(verbose=True)
+        # enable chaining
+        return self
+
+    def build(self) -> TensorNetwork:
+        """
+        Return the tensor network representation of the circuit.
+        """
+        return self.net
@@ -0,0 +1,68 @@
+import numpy as np
+from typing import Sequence
+
+
+class MatrixProductOperator:
+    """
+    Matrix product operator (MPO), storing a tensor of shape
+    (left virtual bond, physical output, physical input, right virtual bond) per site.
+    """
+    def __init__(self, tensors: Sequence[np.ndarray]):
+        if not tensors:
+            raise ValueError("MPO must consist of at least one tensor")
+        for i, w in enumerate(tensors):
+            if w.ndim != 4:
+                raise ValueError(f"MPO tensor at site {i} must have degree 4, received {w.ndim}")
+            if i > 0 and tensors[i - 1].shape[3] != w.shape[0]:
+                raise ValueError(f"virtual bond dimensions between sites {i - 1} and {i} do not match")
+        if tensors[0].shape[0] != 1 or tensors[-1].shape[3] != 1:
+            raise ValueError("leading and trailing virtual bond dimensions must be 1")
+        self.tensors = list(tensors)
+
+    @property
+    def nsites(self) -> int:
+        """
+        Number of sites.
+        """
+        return len(self.tensors)
+
+    @property
+    def bond_dims(self) -> list:
+        """
+        Virtual bond dimensions between neighboring sites.
+        """
+        return [w.shape[3] for w in self.tensors[:-1]]
+
+    def compress(self, tol: float=1e-13, max_bond_dim: int=None):
+        """
+        Compress the virtual bonds in-place by a left-to-right sweep of
+        QR decompositions followed by a right-to-left sweep of truncated SVDs,
+        discarding singular values below `tol` times the largest singular value.
+        """
+        for i in range(self.nsites - 1):
+            w = self.tensors[i]
+            q, r = np.linalg.qr(w.reshape((-1, w.shape[3])))
+            self.tensors[i] = q.reshape(w.shape[:3] + (q.shape[1],))
+            self.tensors[i + 1] = np.tensordot(r, self.tensors[i + 1], axes=(1, 0))
+        for i in reversed(range(1, self.nsites)):
+            w = self.tensors[i]
+            u, s, vh = np.linalg.svd(w.reshape((w.shape[0], -1)), full_matrices=False)
+            chi = max(1, int(np.count_nonzero(s > tol * s[0]))) if len(s) > 0 and s[0] > 0 else 1
+            if max_bond_dim is not None:
+                chi = min(chi, max_bond_dim)
+            self.tensors[i] = vh[:chi, :].reshape((chi,) + w.shape[1:])
+            self.tensors[i - 1] = np.tensordot(self.tensors[i - 1], u[:, :chi] * s[:chi], axes=(3, 0))
+        # enable chaining
+        return self
+
+    def as_matrix(self) -> np.ndarray:
+        """
+        Contract the MPO to the full (dense) matrix,
+        with the first site corresponding to the slowest varying index.
+        """
+        op = self.tensors[0]
+        for w in self.tensors[1:]:
+            # combine physical output and input axes of the sites
+            op = np.einsum(op, [0, 1, 2, 3], w, [3, 4, 5, 6], [0, 1, 4, 2, 5, 6])
+            op = op.reshape((op.shape[0], op.shape[1]*op.shape[2], op.shape[3]*op.shape[4], op.shape[5]))
+        return op[0, :, :, 0]
@@ -0,0 +1,202 @@
+import numpy as np
+from typing import Sequence
+
+
+class MatrixProductState:
+    """
+    Matrix product state (MPS), storing a tensor of shape
+    (left virtual bond, physical, right virtual bond) per site.
+
+    The state is kept in mixed canonical form, with all tensors left of the
+    orthogonality center `center` left-orthonormal and all tensors right of it
+    right-orthonormal. The accumulated (relative) weight of the singular values
+    discarded by truncations is recorded in `truncation_error`.
+    """
+    def __init__(self, tensors: Sequence[np.ndarray], center: int=0):
+        if not tensors:
+            raise ValueError("MPS must consist of at least one tensor")
+        for i, a in enumerate(tensors):
+            if a.ndim != 3:
+                raise ValueError(f"MPS tensor at site {i} must have degree 3, received {a.ndim}")
+            if i > 0 and tensors[i - 1].shape[2] != a.shape[0]:
+                raise ValueError(f"virtual bond dimensions between sites {i - 1} and {i} do not match")
+        if tensors[0].shape[0] != 1 or tensors[-1].shape[2] != 1:
+            raise ValueError("leading and trailing virtual bond dimensions must be 1")
+        if center < 0 or center >= len(tensors):
+            raise ValueError(f"orthogonality center {center} out of range")
+        self.tensors = list(tensors)
+        self.center = center
+        self.truncation_error = 0.
+
+    @classmethod
+    def basis_state(cls, dims: Sequence[int], indices: Sequence[int]=None):
+        """
+        Construct the MPS representation of the computational basis state
+        with local dimensions `dims` and state `indices` (|0,...,0> by default).
+        """
+        if indices is None:
+            indices = len(dims) * [0]
+        if len(indices) != len(dims):
+            raise ValueError("number of basis state indices must be equal to number of sites")
+        tensors = []
+        for d, i in zip(dims, indices):
+            a = np.zeros((1, d, 1))
+            a[0, i, 0] = 1
+            tensors.append(a)
+        return cls(tensors)
+
+    @property
+    def nsites(self) -> int:
+        """
+        Number of sites.
+        """
+        return len(self.tensors)
+
+    @property
+    def dims(self) -> list:
+        """
+        Local physical dimensions.
+        """
+        return [a.shape[1] for a in self.tensors]
+
+    @property
+    def bond_dims(self) -> list:
+        """
+        Virtual bond dimensions between neighboring sites.
+        """
+        return [a.shape[2] for a in self.tensors[:-1]]
+
+    def orthogonalize(self, i: int):
+        """
+        Shift the orthogonality center to site `i` by QR decompositions.
+        """
+        if i < 0 or i >= self.nsites:
+            raise ValueError(f"site {i} out of range")
+        while self.center < i:
+            c = self.center
+            a = self.tensors[c]
+            q, r = np.linalg.qr(a.reshape((-1, a.shape[2])))
+            self.tensors[c] = q.reshape((a.shape[0], a.shape[1], q.shape[1]))
+            self.tensors[c + 1] = np.tensordot(r, self.tensors[c + 1], axes=(1, 0))
+            self.center += 1
+        while self.center > i:
+            c = self.center
+            a = self.tensors[c]
+            q, r = np.linalg.qr(a.reshape((a.shape[0], -1)).T)
+            self.tensors[c] = q.T.reshape((q.shape[1], a.shape[1], a.shape[2]))
+            self.tensors[c - 1] = np.tensordot(self.tensors[c - 1], r.T, axes=(2, 0))
+            self.center -= 1
+        # enable chaining
+        return self
+
+    def norm(self) -> float:
+        """
+        Norm of the state.
+        """
+        return np.linalg.norm(self.tensors[self.center])
+
+    def apply_operator(self, op: np.ndarray, sites: Sequence[int], max_bond_dim: int=None, cutoff: float=0.):
+        """
+        Apply the operator `op` (as matrix, with the first site in `sites`
+        corresponding to the slowest varying index) to the state.
+
+        Non-adjacent sites are moved next to each other by swaps before
+        applying the operator, and moved back afterwards.
+        Virtual bonds are truncated to at most `max_bond_dim`, discarding the
+        smallest singular values with relative weight up to `cutoff`.
+        Truncation preserves the norm of the state (the retained singular values
+        are rescaled), such that non-unitary operators still scale the norm.
+
+        Returns the relative weight discarded by truncation.
+        """
+        sites = list(sites)
+        k = len(sites)
+        if k == 0:
+            return 0.
+        if len(set(sites)) != k or any(s < 0 or s >= self.nsites for s in sites):
+            raise ValueError(f"invalid sites {sites}")
+        dims = [self.tensors[s].shape[1] for s in sites]
+        if op.shape != 2 * (int(np.prod(dims)),):
+            raise ValueError(f"operator must be a square matrix of dimension {int(np.prod(dims))}")
+        # order operator axes by sites
+        perm = list(np.argsort(sites))
+        op = np.reshape(op, dims + dims)
+        op = np.transpose(op, perm + [k + p for p in perm])
+        sorted_sites = sorted(sites)
+        # move sites next to each other
+        swaps = []
+        for j in range(1, k):
+            for s in reversed(range(sorted_sites[0] + j, sorted_sites[j])):
+                swaps.append(s)
+        discarded = 0.
+        for s in swaps:
+            discarded += self._apply_block(s, 2, None, max_bond_dim, cutoff)
+        discarded += self._apply_block(sorted_sites[0], k, op, max_bond_dim, cutoff)
+        # move sites back to their original positions
+        for s in reversed(swaps):
+            discarded += self._apply_block(s, 2, None, max_bond_dim, cutoff)
+        return discarded
+
+    def _apply_block(self, i: int, k: int, op: np.ndarray, max_bond_dim: int, cutoff: float):
+        """
+        Apply an operator (of shape dims + dims) to the adjacent sites i, ..., i + k - 1,
+        or swap sites i and i + 1 if `op` is None.
+        """
+        self.orthogonalize(i)
+        theta = self.tensors[i]
+        for j in range(1, k):
+            theta = np.tensordot(theta, self.tensors[i + j], axes=(theta.ndim - 1, 0))
+        if op is None:
+            theta = np.transpose(theta, (0, 2, 1, 3))
+        else:
+            theta = np.tensordot(op, theta, axes=(list(range(k, 2*k)), list(range(1, k + 1))))
+            theta = np.moveaxis(theta, k, 0)
+        # split into site tensors by successive SVDs
+        discarded = 0.
+        for j in range(k - 1):
+            dl = theta.shape[0]
+            d = theta.shape[1]
+            rest = theta.shape[2:]
+            u, s, vh = np.linalg.svd(theta.reshape((dl*d, -1)), full_matrices=False)
+            chi, weight = _truncation_rank(s, max_bond_dim, cutoff)
+            discarded += weight
+            u = u[:, :chi]
+            if chi < len(s):
+                # retain norm of the state
+                s = s[:chi] * (np.linalg.norm(s) / np.linalg.norm(s[:chi]))
+            vh = vh[:chi, :]
+            self.tensors[i + j] = u.reshape((dl, d, chi))
+            theta = (s[:, None] * vh).reshape((chi,) + rest)
+        self.tensors[i + k - 1] = theta
+        self.center = i + k - 1
+        self.truncation_error += discarded
+        return discarded
+
+    def as_vector(self) -> np.ndarray:
+        """
+        Contract the MPS to the full state vector,
+        with the first site corresponding to the slowest varying index.
+        """
+        psi = self.tensors[0]
+        for a in self.tensors[1:]:
+            psi = np.tensordot(psi, a, axes=(psi.ndim - 1, 0))
+        return psi.reshape(-1)
+
+
+def _truncation_rank(s: np.ndarray, max_bond_dim: int, cutoff: float):
+    """
+    Determine the number of retained (descending) singular values `s`,
+    and the relative weight of the discarded ones.
+    """
+    w = s**2
+    total = np.sum(w)
+    if total == 0:
+        return 1, 0.
+    # relative weight of trailing singular values
+    tail = np.cumsum(w[::-1])[::-1] / total
+    chi = len(s)
+    while chi > 1 and tail[chi - 1] <= cutoff:
+        chi -= 1
+    if max_bond_dim is not None:
+        chi = min(chi, max_bond_dim)
+    return chi, (tail[chi] if chi < len(s) else 0.)
@@ -1,4 +1,5 @@
 import copy
+import heapq
 from typing import Sequence
 from qib.tensor_network.contraction_tree import ContractionTreeNode
 
@@ -288,10 +289,13 @@ class SymbolicTensorNetwork:
         assert all(ax >= 0 for ax in axes)
         return axes
 
-    def merge(self, other, join_axes: Sequence[tuple]=None):
+    def merge(self, other, join_axes: Sequence[tuple]=None, copy_other=True):
         """
         Merge network with another symbolic tensor network,
         and join open axes specified as [(openax_self, openax_other), ...].
+
+        If `copy_other` is False, the tensors and bonds of `other` are taken over
+        without a copy (and possibly renamed), i.e., `other` must not be used afterwards.
         """
         if join_axes is None:
             join_axes = []
@@ -301,8 +305,9 @@ class SymbolicTensorNetwork:
             if joinax[1] < 0 or joinax[1] >= other.num_open_axes:
                 raise ValueError(f"to-be joined open axis index {joinax[1]} of second network out of range")
         num_open_axes_orig = self.num_open_axes
-        # require a deep copy since the IDs in the 'other' network might change
-        other = copy.deepcopy(other)
+        if copy_other:
+            # require a deep copy since the IDs in the 'other' network might change
+            other = copy.deepcopy(other)
         # ensure that tensor IDs in the two networks are disjoint
         shared_tids = self.tensors.keys() & other.tensors.keys()
         tmp_open_tid = -1
@@ -353,6 +358,81 @@ class SymbolicTensorNetwork:
         # enable chaining
         return self
 
+    def greedy_contraction_scaffold(self):
+        """
+        Construct a contraction ordering (scaffold) for `build_contraction_tree`
+        by greedily contracting the pair of connected (intermediate) tensors
+        which minimizes the size of the resulting tensor
+        minus the sizes of the input tensors.
+        """
+        tids = self.tensor_ids()
+        if not tids:
+            raise RuntimeError("network does not contain any tensors")
+        # bond dimensions and tensors referenced by bonds
+        bond_dims = {}
+        bond_tids = {}
+        for bond in self.bonds.values():
+            tensor = self.tensors[bond.tids[-1]]
+            bond_dims[bond.bid] = tensor.shape[tensor.bids.index(bond.bid)]
+            bond_tids[bond.bid] = set(bond.tids)
+
+        def size(bids):
+            s = 1
+            for bid in bids:
+                s *= bond_dims[bid]
+            return s
+
+        # intermediate tensors: scaffold, member tensor IDs, attached bonds and size
+        clusters = {}
+        cluster_of = {}
+        for tid in tids:
+            bids = set(self.tensors[tid].bids)
+            clusters[tid] = (tid, { tid }, bids, size(bids))
+            cluster_of[tid] = tid
+        next_cid = max(tids) + 1
+
+        def neighbors(cid):
+            return { cluster_of[tid] for bid in clusters[cid][2] for tid in bond_tids[bid] if tid != -1 } - { cid }
+
+        def merged_bonds(ca, cb):
+            members = ca[1] | cb[1]
+            # bonds which are not fully contracted
+            return { bid for bid in ca[2] | cb[2] if -1 in bond_tids[bid] or not bond_tids[bid] <= members }
+
+        def push_pair(cid_a, cid_b):
+            ca, cb = clusters[cid_a], clusters[cid_b]
+            cost = size(merged_bonds(ca, cb)) - ca[3] - cb[3]
+            heapq.heappush(heap, (cost, min(cid_a, cid_b), max(cid_a, cid_b)))
+
+        heap = []
+        for cid in clusters:
+            for nb in neighbors(cid):
+                if cid < nb:
+                    push_pair(cid, nb)
+        while len(clusters) > 1:
+            cid_a = cid_b = None
+            while heap:
+                _, a, b = heapq.heappop(heap)
+                # skip entries referring to already contracted tensors
+                if a in clusters and b in clusters:
+                    cid_a, cid_b = a, b
+                    break
+            if cid_a is None:
+                # remaining intermediate tensors are disconnected,
+                # form outer product of the two smallest ones
+                cid_a, cid_b = sorted(clusters.keys(), key=lambda cid: clusters[cid][3])[:2]
+            ca = clusters.pop(cid_a)
+            cb = clusters.pop(cid_b)
+            bids = merged_bonds(ca, cb)
+            cid = next_cid
+            next_cid += 1
+            for tid in ca[1] | cb[1]:
+                cluster_of[tid] = cid
+            clusters[cid] = ([ca[0], cb[0]], ca[1] | cb[1], bids, size(bids))
+            for nb in neighbors(cid):
+                push_pair(cid, nb)
+        return next(iter(clusters.values()))[0]
+
     def build_contraction_tree(self, scaffold) -> ContractionTreeNode:
         """
         Build the contraction tree based on the contraction ordering in `scaffold`,
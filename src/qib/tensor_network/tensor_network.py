@@ -1,9 +1,15 @@
+import copy
+import itertools
 from typing import Sequence
 import numpy as np
 from qib.tensor_network.symbolic_network import SymbolicTensor, SymbolicBond, SymbolicTensorNetwork
 from qib.tensor_network.contraction_tree import perform_tree_contraction
 
 
+# counter for unique data references of tensors resulting from absorption
+_absorbed_counter = itertools.count()
+
+
 class TensorNetwork:
     """
     Tensor network, consisting of a symbolic network representation,
@@ -65,14 +71,17 @@ class TensorNetwork:
         # enable chaining
         return self
 
-    def merge(self, other, join_axes: Sequence[tuple]=None):
+    def merge(self, other, join_axes: Sequence[tuple]=None, copy_other=True):
         """
         Merge network with another tensor network,
         and join open axes specified as [(openax_self, openax_other), ...].
+
+        If `copy_other` is False, the symbolic network of `other` is taken over
+        without a copy, i.e., `other` must not be used afterwards.
         """
         if join_axes is None:
             join_axes = []
-        self.net.merge(other.net, join_axes)
+        self.net.merge(other.net, join_axes, copy_other)
         # include tensor data from other network
         for k in other.data:
             if k in self.data:
@@ -82,6 +91,16 @@ class TensorNetwork:
         # enable chaining
         return self
 
+    def conj(self):
+        """
+        Construct the complex conjugate network, as new network.
+        """
+        stn = copy.deepcopy(self.net)
+        for tensor in stn.tensors.values():
+            if tensor.tid != -1:
+                tensor.dataref = f"conj({tensor.dataref})"
+        return TensorNetwork(stn, { f"conj({k})": np.conj(v) for k, v in self.data.items() })
+
     def contract_einsum(self):
         """
         Contract the overall network by a single call of np.einsum.
@@ -98,16 +117,19 @@ class TensorNetwork:
         shape = self.shape
         for j in idxout:
             if not any(j in tidx[i] for i in range(len(tidx))):
-                args.append(np.ones(shape[axes_map.index(j)]))
+                args.append(np.ones(shape[axes_map.index(idxout.index(j))]))
                 args.append([j])
         args.append(idxout)
         return np.einsum(*args, optimize=True), axes_map
 
-    def contract_tree(self, scaffold):
+    def contract_tree(self, scaffold=None):
         """
         Contract the overall network based on the
         contraction tree specified by `scaffold`.
+        If `scaffold` is None, a greedy contraction ordering is used.
         """
+        if scaffold is None:
+            scaffold = self.net.greedy_contraction_scaffold()
         # binary tree contraction of network
         tree = self.net.build_contraction_tree(scaffold)
         # map logical output axes to axes of tree root tensor
@@ -146,6 +168,216 @@ class TensorNetwork:
         # return contracted tensor, axes map and tree
         return cnt, axes_map, tree
 
+    def simplify(self, tol: float=1e-12, max_pair_size: int=2**16):
+        """
+        Simplify the network in-place, without changing the represented tensor, by
+          - removing pairs of tensors which contract to the identity,
+            like a gate followed by its inverse, or a gate in a ket network
+            and its conjugate counterpart in the corresponding bra network,
+          - removing rank-2 tensors equal to the identity, i.e., identity wires,
+          - absorbing rank-1 and rank-2 tensors into neighboring tensors.
+
+        For a network representing :math:`\\langle \\psi | O | \\psi \\rangle`
+        with :math:`|\\psi\\rangle` the output state of a circuit, the pair removal
+        eliminates all gates outside the backward light cone of `O`.
+        Pairs of tensors are only compared if each has at most `max_pair_size` entries.
+        """
+        while True:
+            changed = self._cancel_identity_pairs(tol, max_pair_size)
+            changed = self._remove_identity_tensors(tol) or changed
+            if not changed:
+                # rank simplifications only after all pairs have been cancelled,
+                # since absorbed tensors no longer match their counterparts
+                if not self._absorb_low_rank_tensors():
+                    break
+        # remove data entries which are not referenced any more
+        datarefs = { tensor.dataref for tensor in self.net.tensors.values() if tensor.tid != -1 }
+        self.data = { k: v for k, v in self.data.items() if k in datarefs }
+        # enable chaining
+        return self
+
+    def _remove_tensor_references(self, tid: int):
+        """
+        Remove tensor with ID `tid` and its references from the connected bonds.
+        """
+        tensor = self.net.tensors.pop(tid)
+        for bid in tensor.bids:
+            bond = self.net.bonds[bid]
+            bond.tids.remove(tid)
+            if not bond.tids:
+                del self.net.bonds[bid]
+
+    def _add_absorbed_data(self, data: np.ndarray):
+        """
+        Store the data of a tensor resulting from absorption, and return its reference.
+        """
+        data = np.asarray(data)
+        dataref = f"absorbed_{next(_absorbed_counter)}"
+        self.data[dataref] = data
+        return dataref
+
+    def _cancel_identity_pairs(self, tol: float, max_pair_size: int) -> bool:
+        """
+        Remove pairs of connected tensors which contract to the identity
+        between their remaining axes (in order). Bonds shared by the two tensors
+        and further tensors (hyperedges, e.g., control wires) are treated as spectators,
+        i.e., the contraction must result in the identity for each of their indices.
+        """
+        stn = self.net
+        changed = False
+        worklist = [tid for tid in stn.tensors.keys() if tid != -1]
+        while worklist:
+            tid_a = worklist.pop()
+            if tid_a not in stn.tensors:
+                continue
+            ta = stn.tensors[tid_a]
+            if np.prod(ta.shape, dtype=int) > max_pair_size:
+                continue
+            neighbors = sorted({ tid for bid in ta.bids for tid in stn.bonds[bid].tids if tid not in (-1, tid_a) })
+            for tid_b in neighbors:
+                tb = stn.tensors[tid_b]
+                if tb.ndim != ta.ndim or sorted(tb.shape) != sorted(ta.shape):
+                    continue
+                if not self._is_identity_pair(ta, tb, tol):
+                    continue
+                shared = set(ta.bids) & set(tb.bids)
+                rem_a = [bid for bid in ta.bids if bid not in shared]
+                rem_b = [bid for bid in tb.bids if bid not in shared]
+                # neighbors of the removed tensors might form new pairs
+                worklist += [tid for bid in rem_a + rem_b + list(shared)
+                             for tid in stn.bonds[bid].tids if tid not in (-1, tid_a, tid_b)]
+                self._remove_tensor_references(tid_a)
+                self._remove_tensor_references(tid_b)
+                # connect remaining axes of the two tensors
+                for bid_a, bid_b in zip(rem_a, rem_b):
+                    stn.merge_bonds(bid_a, bid_b)
+                changed = True
+                break
+        return changed
+
+    def _is_identity_pair(self, ta, tb, tol: float) -> bool:
+        """
+        Whether the symbolic tensors `ta` and `tb` contract to the identity
+        between their remaining (not shared) axes.
+        """
+        stn = self.net
+        shared = set(ta.bids) & set(tb.bids)
+        if not shared:
+            return False
+        # each bond may only be referenced once by each of the tensors
+        if len(set(ta.bids)) != ta.ndim or len(set(tb.bids)) != tb.ndim:
+            return False
+        summed    = [bid for bid in ta.bids if bid in shared and len(stn.bonds[bid].tids) == 2]
+        spectator = [bid for bid in ta.bids if bid in shared and len(stn.bonds[bid].tids) > 2]
+        # spectator bonds must remain valid after removing the tensors
+        if any(len(stn.bonds[bid].tids) < 4 for bid in spectator):
+            return False
+        rem_a = [ax for ax, bid in enumerate(ta.bids) if bid not in shared]
+        rem_b = [ax for ax, bid in enumerate(tb.bids) if bid not in shared]
+        if len(rem_a) != len(rem_b) or any(ta.shape[i] != tb.shape[j] for i, j in zip(rem_a, rem_b)):
+            return False
+        if not rem_a:
+            return False
+        for bid in summed + spectator:
+            if ta.shape[ta.bids.index(bid)] != tb.shape[tb.bids.index(bid)]:
+                return False
+        # einsum indices: shared bonds, then remaining axes of both tensors
+        index = { bid: i for i, bid in enumerate(summed + spectator) }
+        c = len(index)
+        idx_a = [index[bid] if bid in index else c + rem_a.index(ax) for ax, bid in enumerate(ta.bids)]
+        c += len(rem_a)
+        idx_b = [index[bid] if bid in index else c + rem_b.index(ax) for ax, bid in enumerate(tb.bids)]
+        idx_out = [index[bid] for bid in spectator] + list(range(len(index), c + len(rem_b)))
+        cnt = np.einsum(self.data[ta.dataref], idx_a, self.data[tb.dataref], idx_b, idx_out)
+        dims = [ta.shape[ax] for ax in rem_a]
+        d = int(np.prod(dims, dtype=int))
+        cnt = cnt.reshape((-1, d, d))
+        return np.allclose(cnt, np.identity(d), rtol=0, atol=tol)
+
+    def _remove_identity_tensors(self, tol: float) -> bool:
+        """
+        Remove rank-2 tensors equal to the identity by joining their bonds.
+        """
+        stn = self.net
+        changed = False
+        for tid in list(stn.tensors.keys()):
+            if tid == -1:
+                continue
+            tensor = stn.tensors[tid]
+            if tensor.ndim != 2 or tensor.shape[0] != tensor.shape[1] or tensor.bids[0] == tensor.bids[1]:
+                continue
+            if not np.allclose(self.data[tensor.dataref], np.identity(tensor.shape[0]), rtol=0, atol=tol):
+                continue
+            bid1, bid2 = tensor.bids
+            self._remove_tensor_references(tid)
+            stn.merge_bonds(bid1, bid2)
+            changed = True
+        return changed
+
+    def _absorb_low_rank_tensors(self) -> bool:
+        """
+        Absorb rank-1 and rank-2 tensors into a neighboring tensor.
+        """
+        stn = self.net
+        changed = False
+        for tid in list(stn.tensors.keys()):
+            if tid == -1 or tid not in stn.tensors:
+                continue
+            tensor = stn.tensors[tid]
+            if tensor.ndim == 1:
+                bond = stn.bonds[tensor.bids[0]]
+                targets = [t for t in bond.tids if t not in (-1, tid)]
+                if not targets:
+                    continue
+                target = stn.tensors[targets[0]]
+                ax = target.bids.index(bond.bid)
+                vec = self.data[tensor.dataref]
+                tdata = self.data[target.dataref]
+                if len(bond.tids) == 2:
+                    # contraction
+                    tdata = np.tensordot(tdata, vec, axes=(ax, 0))
+                    target.shape = target.shape[:ax] + target.shape[ax+1:]
+                    target.bids.pop(ax)
+                    del stn.bonds[bond.bid]
+                    stn.tensors.pop(tid)
+                else:
+                    # bond is shared with further tensors, multiply entrywise
+                    tdata = tdata * np.expand_dims(vec, tuple(i for i in range(target.ndim) if i != ax))
+                    self._remove_tensor_references(tid)
+                target.dataref = self._add_absorbed_data(tdata)
+                changed = True
+            elif tensor.ndim == 2:
+                bid1, bid2 = tensor.bids
+                if bid1 == bid2:
+                    continue
+                # absorb via a simple bond to another tensor
+                for k, (bid_in, bid_out) in enumerate([(bid1, bid2), (bid2, bid1)]):
+                    bond = stn.bonds[bid_in]
+                    if len(bond.tids) != 2 or -1 in bond.tids:
+                        continue
+                    tid_t = bond.tids[0] if bond.tids[1] == tid else bond.tids[1]
+                    if tid_t == tid:
+                        continue
+                    target = stn.tensors[tid_t]
+                    ax = target.bids.index(bid_in)
+                    mat = self.data[tensor.dataref]
+                    if k == 1:
+                        mat = mat.T
+                    tdata = np.moveaxis(np.tensordot(self.data[target.dataref], mat, axes=(ax, 0)), -1, ax)
+                    target.shape = target.shape[:ax] + (mat.shape[1],) + target.shape[ax+1:]
+                    target.bids[ax] = bid_out
+                    del stn.bonds[bid_in]
+                    stn.tensors.pop(tid)
+                    # replace reference to absorbed tensor in outgoing bond
+                    bond_out = stn.bonds[bid_out]
+                    bond_out.tids.remove(tid)
+                    bond_out.tids.append(tid_t)
+                    bond_out.tids.sort()
+                    target.dataref = self._add_absorbed_data(tdata)
+                    changed = True
+                    break
+        return changed
+
     def is_consistent(self, verbose=False) -> bool:
         """
         Perform an internal consistency check,
@@ -167,23 +399,88 @@ class TensorNetwork:
         return True
 
 
-def to_full_tensor(tensor: np.ndarray, axes_map):
+def to_full_tensor(tensor: np.ndarray, axes_map, lazy=False):
     """
     Utility function for generating the full (dense) tensor
     from the compressed tensor and `axes_map` returned by `contract_einsum` and `contract_tree`.
+
+    Logical output axes mapped to the same axis of the compressed tensor
+    form a "diagonal", i.e., all other entries of the full tensor are zero.
+    If `lazy` is True, a `FullTensorView` is returned instead,
+    which does not allocate the full tensor.
     """
+    if sorted(set(axes_map)) != list(range(tensor.ndim)):
+        raise ValueError(f"`axes_map` must refer to each of the {tensor.ndim} axes of the compressed tensor")
+    if lazy:
+        return FullTensorView(tensor, axes_map)
+    if len(axes_map) == tensor.ndim:
+        # no duplicate output axes, full tensor is a transposition of the compressed tensor
+        return np.transpose(tensor, axes_map)
     ft = np.zeros(shape=[tensor.shape[i] for i in axes_map], dtype=tensor.dtype)
-    it = np.nditer(ft, flags=['multi_index'], op_flags=["writeonly"])
-    while not it.finished:
-        i = it.multi_index
-        idx = tensor.ndim * [-1]
-        valid = True
-        for j, ax in enumerate(axes_map):
-            if idx[ax] == -1:
-                idx[ax] = i[j]
-            elif idx[ax] != i[j]:
-                valid = False
-        if valid:
-            ft[i] = tensor[tuple(idx)]
-        it.iternext()
+    # strided view of the "diagonal" of the full tensor:
+    # stepping along an axis of the compressed tensor advances
+    # all logical output axes mapped to it simultaneously
+    strides = tensor.ndim * [0]
+    for j, ax in enumerate(axes_map):
+        strides[ax] += ft.strides[j]
+    ft_diag = np.lib.stride_tricks.as_strided(ft, shape=tensor.shape, strides=strides, writeable=True)
+    ft_diag[...] = tensor
     return ft
+
+
+class FullTensorView:
+    """
+    Lazy view of the full (dense) tensor represented by a compressed tensor
+    and an `axes_map` as returned by `contract_einsum` and `contract_tree`,
+    without allocating the full tensor.
+    """
+    def __init__(self, tensor: np.ndarray, axes_map):
+        self.tensor = tensor
+        self.axes_map = list(axes_map)
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Logical shape of the full tensor.
+        """
+        return tuple(self.tensor.shape[i] for i in self.axes_map)
+
+    @property
+    def ndim(self) -> int:
+        """
+        Logical number of dimensions (degree) of the full tensor.
+        """
+        return len(self.axes_map)
+
+    @property
+    def dtype(self):
+        """
+        Data type of the tensor entries.
+        """
+        return self.tensor.dtype
+
+    def __getitem__(self, idx):
+        """
+        Access an individual entry of the full tensor by its multi-index.
+        """
+        if not isinstance(idx, tuple):
+            idx = (idx,)
+        if len(idx) != self.ndim:
+            raise IndexError(f"expecting a multi-index of length {self.ndim}, received {len(idx)}")
+        cidx = self.tensor.ndim * [None]
+        for i, ax in zip(idx, self.axes_map):
+            if cidx[ax] is None:
+                cidx[ax] = i
+            elif cidx[ax] != i:
+                # entry is not on the "diagonal"
+                return self.tensor.dtype.type(0)
+        return self.tensor[tuple(cidx)]
+
+    def __array__(self, dtype=None):
+        """
+        Generate the full (dense) tensor.
+        """
+        ft = to_full_tensor(self.tensor, self.axes_map)
+        if dtype is not None:
+            ft = ft.astype(dtype, copy=False)
+        return ft
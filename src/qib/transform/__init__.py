@@ -1,3 +1,5 @@
 from qib.transform.jordan_wigner_encoding import jordan_wigner_encode_field_operator
 from qib.transform.parity_encoding import parity_encode_field_operator
 from qib.transform.compact_encoding import compact_encode_field_operator
+from qib.transform.bravyi_kitaev_encoding import bravyi_kitaev_encode_field_operator
+from qib.transform.qubit_tapering import find_z2_symmetries, taper_pauli_operator
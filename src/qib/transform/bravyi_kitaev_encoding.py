@@ -0,0 +1,94 @@
+import numpy as np
+from qib.field import ParticleType
+from qib.operator import FieldOperator, PauliString, PauliOperator
+from qib.transform.pauli_table import encode_field_operator_tables
+
+
+def bravyi_kitaev_encode_field_operator(fieldop: FieldOperator) -> PauliOperator:
+    """
+    Bravyi-Kitaev encode a fermionic field operator,
+    resulting in Pauli strings of weight O(log L) per fermionic operator.
+
+    Qubit `i` stores the parity of the occupations of the modes in the subtree of
+    mode `i` of a Fenwick tree, with the modes ordered consistently with the
+    Jordan-Wigner convention (parity strings acting on the sites following `i`).
+
+    Reference:
+        Vojtěch Havlíček, Matthias Troyer, James D. Whitfield
+        Operator locality in the quantum simulation of fermionic models
+        Phys. Rev. A 95, 032332 (2017)
+    """
+    fields = fieldop.fields()
+    if len(fields) != 1 or fields[0].ptype != ParticleType.FERMION:
+        # currently only a single fermionic field supported
+        raise NotImplementedError("only a single fermionic field supported")
+
+    # number of lattice sites
+    L = fields[0].lattice.nsites
+    update_sets, parity_sets, flip_sets = _fenwick_sets(L)
+    # represent fermionic operators as Pauli strings based on Bravyi-Kitaev transformation
+    clist = []
+    alist = []
+    for i in range(L):
+        x  = np.zeros(L, dtype=int)
+        za = np.zeros(L, dtype=int)
+        zb = np.zeros(L, dtype=int)
+        x[update_sets[i] + [i]] = 1
+        za[parity_sets[i]] = 1
+        # remainder set: parity set without the flip set
+        zb[[j for j in parity_sets[i] if j not in flip_sets[i]] + [i]] = 1
+        # require two Pauli strings per fermionic operator
+        clist.append([PauliString(za, x, 0), PauliString(zb, x, 1)])
+        alist.append([PauliString(za, x, 0), PauliString(zb, x, 3)])
+
+    # assemble overall operator
+    return encode_field_operator_tables(fieldop, L, clist, alist)
+
+
+def _fenwick_sets(nmodes: int):
+    """
+    Construct the update, parity and flip sets of the Bravyi-Kitaev transformation
+    based on a Fenwick tree, as lists of site indices per mode.
+
+    The tree is built on the reversed mode ordering, such that the parity set of
+    mode `i` covers the modes `i + 1, ..., nmodes - 1`.
+    """
+    # parent in Fenwick tree (with respect to reversed ordering), and
+    # lower boundary of the contiguous range of modes in each subtree
+    parent = nmodes * [-1]
+    lower = list(range(nmodes))
+
+    def build(l, r):
+        if l >= r:
+            return
+        m = (l + r) // 2
+        parent[m] = r
+        build(l, m)
+        build(m + 1, r)
+        # set after recursion, since the right half shares the upper boundary
+        lower[r] = l
+
+    build(0, nmodes - 1)
+    update_sets = []
+    parity_sets = []
+    flip_sets = []
+    for i in range(nmodes):
+        k = nmodes - 1 - i
+        # update set: ancestors
+        update = []
+        j = parent[k]
+        while j >= 0:
+            update.append(j)
+            j = parent[j]
+        # parity set: subtrees covering the preceding modes
+        parity = []
+        j = k - 1
+        while j >= 0:
+            parity.append(j)
+            j = lower[j] - 1
+        # flip set: children
+        flip = [j for j in range(lower[k], k) if parent[j] == k]
+        update_sets.append([nmodes - 1 - j for j in update])
+        parity_sets.append([nmodes - 1 - j for j in parity])
+        flip_sets.append([nmodes - 1 - j for j in flip])
+    return update_sets, parity_sets, flip_sets
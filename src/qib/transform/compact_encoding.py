@@ -1,8 +1,9 @@
+import math
 import numpy as np
-from qib.lattice import IntegerLattice, OddFaceCenteredLattice
+from qib.lattice import IntegerLattice, LayeredLattice, OddFaceCenteredLattice
 from qib.field import ParticleType
-from qib.operator import (IFOType, FieldOperator,
-                          PauliString, WeightedPauliString, PauliOperator)
+from qib.operator import IFOType, FieldOperator, PauliString, PauliOperator
+from qib.transform.pauli_table import _pauli_operator_from_table
 
 
 def compact_encode_field_operator(fieldop: FieldOperator):
@@ -10,6 +11,12 @@ def compact_encode_field_operator(fieldop: FieldOperator):
     "Compact" encode a fermionic field operator on a square lattice
     into a qubit Hamiltonian.
 
+    Supported are quadratic terms with real symmetric coefficients (on-site and
+    nearest neighbor hopping) and density-density interaction terms n_i n_j.
+    For a layered square lattice (like for the spinful Fermi-Hubbard model),
+    each layer is encoded separately, and the encoded lattice is a layered
+    odd face centered lattice.
+
     Reference:
         Charles Derby, Joel Klassen, Johannes Bausch, Toby Cubitt
         Compact fermion to qubit mappings
@@ -20,60 +27,155 @@ def compact_encode_field_operator(fieldop: FieldOperator):
         # currently only a single fermionic field supported
         raise NotImplementedError
     latt_fermi = fields[0].lattice
-    if not isinstance(latt_fermi, IntegerLattice):
+    if isinstance(latt_fermi, LayeredLattice):
+        latt_base = latt_fermi.base_lattice
+        nlayers = latt_fermi.nlayers
+    else:
+        latt_base = latt_fermi
+        nlayers = 1
+    if not isinstance(latt_base, IntegerLattice):
         raise RuntimeError("only integer lattices supported")
-    if latt_fermi.ndim != 2:
+    if latt_base.ndim != 2:
         raise RuntimeError("only two-dimensional lattices supported")
-    if any(latt_fermi.pbc):
+    if any(latt_base.pbc):
         raise RuntimeError("only open boundary conditions supported")
-    adj = latt_fermi.adjacency_matrix()
 
-    latt_enc = OddFaceCenteredLattice(latt_fermi.shape, pbc=False)
+    latt_enc = OddFaceCenteredLattice(latt_base.shape, pbc=False)
+    nqubits = nlayers * latt_enc.nsites
+    nbase = latt_base.nsites
+    vertex_table, edge_keys, edge_z, edge_x, edge_q = _compact_operator_tables(latt_base.shape)
+    # vertex qubit of each fermionic mode
+    modes_all = np.arange(nlayers * nbase)
+    vertex = (modes_all // nbase) * latt_enc.nsites + vertex_table[modes_all % nbase]
+
+    # Pauli table, as list of (z, x, q, weights) tuples with unpacked bits
+    tables = []
 
-    pauliop = PauliOperator()
+    def add_vertex_strings(sites, weights):
+        # products of vertex operators (Z at vertex qubits) given by `sites` of shape (n, k)
+        z = np.zeros((len(weights), nqubits), dtype=np.uint8)
+        for k in range(sites.shape[1]):
+            z[np.arange(len(weights)), vertex[sites[:, k]]] = 1
+        tables.append((z, np.zeros_like(z), np.zeros(len(weights), dtype=int), weights))
 
     for term in fieldop.terms:
 
-        if (len(term.opdesc) == 2
-            and term.opdesc[0].otype == IFOType.FERMI_CREATE
-            and term.opdesc[1].otype == IFOType.FERMI_ANNIHIL):
+        otypes = [desc.otype for desc in term.opdesc]
+        modes, coeffs = term.nonzero()
 
-            if not np.issubdtype(term.coeffs.dtype, float):
+        if otypes == [IFOType.FERMI_CREATE, IFOType.FERMI_ANNIHIL]:
+
+            if not np.issubdtype(coeffs.dtype, np.floating):
                 raise ValueError("only real coefficient matrices for on-site and kinetic hopping term supported")
-            if not np.allclose(term.coeffs, term.coeffs.T):
+            if not term.is_hermitian():
                 raise ValueError("only symmetric coefficient matrices for on-site and kinetic hopping term supported")
 
             # on-site term
-            id_coeff = 0
-            for i in range(latt_fermi.nsites):
-                ic = latt_fermi.index_to_coord(i)
-                Vi = _encode_vertex_operator(latt_enc, ic)
-                pauliop.add_pauli_string(WeightedPauliString(Vi, -0.5 * term.coeffs[i, i]))
-                id_coeff += 0.5 * term.coeffs[i, i]
+            diag = modes[:, 0] == modes[:, 1]
+            add_vertex_strings(modes[diag, :1], -0.5 * coeffs[diag])
             # add identity
-            pauliop.add_pauli_string(WeightedPauliString(PauliString.identity(latt_enc.nsites), id_coeff))
-
-            # kinetic hopping term a_i^{\dagger} a_j + a_j^{\dagger} a_i
-            for i in range(latt_fermi.nsites):
-                for j in range(i + 1, latt_fermi.nsites):
-                    # note: i < j
-                    if term.coeffs[i, j] == 0:
-                        continue
-                    if adj[i, j] == 0:
-                        raise ValueError("only direct neighbor hopping terms supported")
-                    ic = latt_fermi.index_to_coord(i)
-                    jc = latt_fermi.index_to_coord(j)
-                    E = _encode_edge_operator(latt_enc, ic, jc)
-                    Vi = _encode_vertex_operator(latt_enc, ic)
-                    Vj = _encode_vertex_operator(latt_enc, jc)
-                    pauliop.add_pauli_string(WeightedPauliString(E @ Vj,  0.5j * term.coeffs[i, j]))
-                    pauliop.add_pauli_string(WeightedPauliString(E @ Vi, -0.5j * term.coeffs[i, j]))
+            add_vertex_strings(np.zeros((1, 0), dtype=int), np.array([0.5 * np.sum(coeffs[diag])]))
+
+            # kinetic hopping term a_i^{\dagger} a_j + a_j^{\dagger} a_i, iterating over edges i < j
+            upper = modes[:, 0] < modes[:, 1]
+            edges = modes[upper]
+            ecoeffs = coeffs[upper]
+            if len(edges) > 0:
+                layers = edges[:, 0] // nbase
+                # look up edges in precomputed table
+                keys = (edges[:, 0] % nbase) * nbase + edges[:, 1] % nbase
+                pos = np.minimum(np.searchsorted(edge_keys, keys), max(len(edge_keys) - 1, 0))
+                if (len(edge_keys) == 0 or np.any(edges[:, 1] // nbase != layers)
+                    or np.any(edge_keys[pos] != keys)):
+                    raise ValueError("only direct neighbor hopping terms supported")
+                # shift Pauli strings E_{ij} V_j and E_{ij} V_i to the qubits of their layer
+                n = 2 * len(edges)
+                z = np.zeros((n, nqubits), dtype=np.uint8)
+                x = np.zeros((n, nqubits), dtype=np.uint8)
+                cols = np.repeat(layers, 2)[:, None] * latt_enc.nsites + np.arange(latt_enc.nsites)
+                z[np.arange(n)[:, None], cols] = edge_z[pos].reshape((n, -1))
+                x[np.arange(n)[:, None], cols] = edge_x[pos].reshape((n, -1))
+                weights = np.outer(ecoeffs, [0.5j, -0.5j]).reshape(-1)
+                tables.append((z, x, edge_q[pos].reshape(-1), weights))
+
+        elif otypes == 2 * [IFOType.FERMI_CREATE, IFOType.FERMI_ANNIHIL]:
+
+            # density-density interaction term a_i^{\dagger} a_i a_j^{\dagger} a_j
+            if np.any(modes[:, 0] != modes[:, 1]) or np.any(modes[:, 2] != modes[:, 3]):
+                raise ValueError("only density-density interaction terms supported")
+            i, j = modes[:, 0], modes[:, 2]
+            # n_i = (1 - V_i) / 2
+            same = i == j
+            add_vertex_strings(np.zeros((1, 0), dtype=int),
+                               np.array([0.5 * np.sum(coeffs[same]) + 0.25 * np.sum(coeffs[~same])]))
+            add_vertex_strings(i[same, None], -0.5 * coeffs[same])
+            add_vertex_strings(i[~same, None], -0.25 * coeffs[~same])
+            add_vertex_strings(j[~same, None], -0.25 * coeffs[~same])
+            add_vertex_strings(np.stack((i[~same], j[~same]), axis=1), 0.25 * coeffs[~same])
+
         else:
             raise NotImplementedError
 
+    if nlayers > 1:
+        latt_enc = LayeredLattice(latt_enc, nlayers)
+    if not tables:
+        return PauliOperator(), latt_enc
+    z, x, q, weights = [np.concatenate(t) for t in zip(*tables)]
+    # include overall sign factor in weight coefficient
+    weights = weights * np.where(q % 4 < 2, 1, -1)
+    pauliop = _pauli_operator_from_table(np.packbits(z, axis=1), np.packbits(x, axis=1),
+                                         q % 2, weights, nqubits)
     return pauliop, latt_enc
 
 
+# cached vertex and edge operator tables, indexed by lattice shape
+_operator_tables_cache = {}
+
+
+def _compact_operator_tables(shape):
+    """
+    Tables of the vertex and edge operators of the compact encoding on an
+    `OddFaceCenteredLattice` with open boundary conditions, cached by lattice `shape`:
+      - vertex qubit index for each vertex (in the index ordering of an integer lattice)
+      - sorted keys i * nverts + j of the nearest neighbor edges (i, j) with i < j
+      - `z` and `x` bits and phase exponents `q` of the Pauli strings
+        E_{ij} V_j and E_{ij} V_i for each edge, with shape (number of edges, 2, number of qubits)
+
+    The returned arrays are read-only, since they are shared between encodings.
+    """
+    shape = tuple(shape)
+    if shape in _operator_tables_cache:
+        return _operator_tables_cache[shape]
+    latt = OddFaceCenteredLattice(shape, pbc=False)
+    nverts = math.prod(shape)
+    vertex = np.array([latt.coord_to_index(np.unravel_index(i, shape)) for i in range(nverts)])
+    keys = []
+    pstrings = []
+    for i in range(nverts):
+        ic = tuple(int(c) for c in np.unravel_index(i, shape))
+        # neighbors with larger index
+        for d in range(2):
+            jc = list(ic)
+            jc[d] += 1
+            if jc[d] >= shape[d]:
+                continue
+            jc = tuple(jc)
+            E = _encode_edge_operator(latt, ic, jc)
+            pstrings += [E @ _encode_vertex_operator(latt, jc), E @ _encode_vertex_operator(latt, ic)]
+            keys.append(i * nverts + latt.coord_to_index(jc))
+    keys = np.array(keys, dtype=int)
+    edge_z = np.array([ps.z for ps in pstrings], dtype=np.uint8).reshape((len(keys), 2, latt.nsites))
+    edge_x = np.array([ps.x for ps in pstrings], dtype=np.uint8).reshape((len(keys), 2, latt.nsites))
+    edge_q = np.array([ps.q for ps in pstrings], dtype=int).reshape((len(keys), 2))
+    # sort by keys
+    perm = np.argsort(keys)
+    tables = (vertex, keys[perm], edge_z[perm], edge_x[perm], edge_q[perm])
+    for t in tables:
+        t.flags.writeable = False
+    _operator_tables_cache[shape] = tables
+    return tables
+
+
 def _encode_vertex_operator(latt: OddFaceCenteredLattice, j):
     """
     Construct the vertex operator V_j, given the coordinate j = (jx, jy).
@@ -1,7 +1,6 @@
-import numpy as np
 from qib.field import ParticleType
-from qib.operator import (IFOType, FieldOperator,
-                          PauliString, WeightedPauliString, PauliOperator)
+from qib.operator import FieldOperator, PauliString, PauliOperator
+from qib.transform.pauli_table import encode_field_operator_tables
 
 
 def parity_encode_field_operator(fieldop: FieldOperator):
@@ -30,31 +29,4 @@ def parity_encode_field_operator(fieldop: FieldOperator):
         alist.append([PauliString(za, x, 0), PauliString(zb, x, 3)])
 
     # assemble overall operator
-    pauliop = PauliOperator()
-    for term in fieldop.terms:
-        it = np.nditer(term.coeffs, flags=["multi_index"])
-        for coeff in it:
-            if coeff == 0:
-                continue
-            pstrings = [PauliString.identity(L)]
-
-            for i, j in enumerate(it.multi_index):
-                if term.opdesc[i].otype == IFOType.FERMI_CREATE:
-                    pstrings = (  [ps @ clist[j][0] for ps in pstrings]
-                                + [ps @ clist[j][1] for ps in pstrings])
-                elif term.opdesc[i].otype == IFOType.FERMI_ANNIHIL:
-                    pstrings = (  [ps @ alist[j][0] for ps in pstrings]
-                                + [ps @ alist[j][1] for ps in pstrings])
-                else:
-                    raise RuntimeError(f"expecting fermionic operator, but received {term.opdesc[i].otype}")
-            # scaling factors 1/2 from representation of each fermionic operator as two Pauli strings
-            weight = 0.5 ** len(term.opdesc) * coeff
-            for ps in pstrings:
-                # include overall sign factor in weight coefficient;
-                # factoring out phase (instead of sign only)
-                # does not seem to be advantageous
-                sign = ps.refactor_sign()
-                pauliop.add_pauli_string(WeightedPauliString(ps, sign * weight))
-    pauliop.remove_zero_weight_strings(tol=1e-14)
-
-    return pauliop
+    return encode_field_operator_tables(fieldop, L, clist, alist)
@@ -0,0 +1,137 @@
+import numpy as np
+from typing import Sequence
+from qib.operator import (IFOType, FieldOperator,
+                          PauliString, WeightedPauliString, PauliOperator)
+
+
+# number of set bits per byte
+_popcount_table = np.array([bin(b).count("1") for b in range(256)], dtype=np.int64)
+
+# maximum number of bytes per (z or x) Pauli table generated at once
+_max_table_bytes = 2**22
+
+
+def _popcount(a: np.ndarray) -> np.ndarray:
+    """
+    Number of set bits of packed binary arrays, summed along the last axis.
+    """
+    return _popcount_table[a].sum(axis=-1)
+
+
+def _pack_pauli_strings(pstrings: Sequence[PauliString]):
+    """
+    Represent Pauli strings as table of packed `z` and `x` bits
+    (with site 0 corresponding to the most significant bit of the first byte),
+    together with the reduced phase exponents r = q + z.x mod 4.
+
+    Using the reduced phase exponents, the product of two Pauli strings
+    has the exponent r1 + r2 + 2 x1.z2 mod 4.
+    """
+    z = np.packbits(np.array([ps.z for ps in pstrings], dtype=np.uint8), axis=-1)
+    x = np.packbits(np.array([ps.x for ps in pstrings], dtype=np.uint8), axis=-1)
+    r = np.array([(ps.q + np.dot(ps.z, ps.x)) % 4 for ps in pstrings], dtype=np.int64)
+    return z, x, r
+
+
+def _reduce_pauli_table(z: np.ndarray, x: np.ndarray, q: np.ndarray, weights: np.ndarray):
+    """
+    Combine the weights of identical Pauli strings in a packed table by sorting.
+    """
+    keys = np.ascontiguousarray(np.concatenate((z, x, q[:, None].astype(np.uint8)), axis=1))
+    ncols = keys.shape[1]
+    ukeys, inv = np.unique(keys.view(np.dtype((np.void, ncols))).reshape(-1), return_inverse=True)
+    ukeys = ukeys.view(np.uint8).reshape((-1, ncols))
+    inv = inv.reshape(-1)
+    if np.iscomplexobj(weights):
+        uweights = (np.bincount(inv, weights.real, len(ukeys))
+               + 1j*np.bincount(inv, weights.imag, len(ukeys)))
+    else:
+        uweights = np.bincount(inv, weights, len(ukeys))
+    nb = z.shape[1]
+    return ukeys[:, :nb], ukeys[:, nb:2*nb], ukeys[:, 2*nb].astype(np.int64), uweights
+
+
+def encode_field_operator_tables(fieldop: FieldOperator, nqubits: int,
+                                 clist: Sequence[Sequence[PauliString]],
+                                 alist: Sequence[Sequence[PauliString]]) -> PauliOperator:
+    """
+    Encode a fermionic field operator as Pauli operator, given the representations
+    of the creation and annihilation operator of each mode as sum of two Pauli strings
+    (each with weight 1/2) in `clist` and `alist`.
+
+    The Pauli strings of all monomials of a term are generated at once
+    as packed bit tables, with the sign factors absorbed into the weights,
+    and duplicate strings are combined by sorting.
+    """
+    # packed tables of the Pauli strings representing the fermionic operators,
+    # with shape (number of modes, 2, number of bytes)
+    tables = {}
+    for otype, plist in ((IFOType.FERMI_CREATE, clist), (IFOType.FERMI_ANNIHIL, alist)):
+        z, x, r = _pack_pauli_strings([ps for pair in plist for ps in pair])
+        tables[otype] = (z.reshape((len(plist), 2, -1)),
+                         x.reshape((len(plist), 2, -1)),
+                         r.reshape((len(plist), 2)))
+    nb = (nqubits + 7) // 8
+    # reduced Pauli tables, merged once the number of pending strings becomes large
+    reduced = []
+    pending = []
+    npending = 0
+    for term in fieldop.terms:
+        k = len(term.opdesc)
+        for desc in term.opdesc:
+            if desc.otype not in tables:
+                raise RuntimeError(f"expecting fermionic operator, but received {desc.otype}")
+        modes, coeffs = term.nonzero()
+        # scaling factors 1/2 from representation of each fermionic operator as two Pauli strings
+        coeffs = 0.5**k * coeffs
+        bsize = max(1, _max_table_bytes // (2**k * nb))
+        for start in range(0, len(coeffs), bsize):
+            mb = modes[start:start + bsize]
+            n = len(mb)
+            z = np.zeros((n, 1, nb), dtype=np.uint8)
+            x = np.zeros((n, 1, nb), dtype=np.uint8)
+            r = np.zeros((n, 1), dtype=np.int64)
+            for i, desc in enumerate(term.opdesc):
+                tz, tx, tr = tables[desc.otype]
+                fz = tz[mb[:, i]][:, None, :, :]
+                fx = tx[mb[:, i]][:, None, :, :]
+                r = (r[:, :, None] + tr[mb[:, i]][:, None, :] + 2*_popcount(x[:, :, None, :] & fz)) % 4
+                z = (z[:, :, None, :] ^ fz).reshape((n, -1, nb))
+                x = (x[:, :, None, :] ^ fx).reshape((n, -1, nb))
+                r = r.reshape((n, -1))
+            z = z.reshape((-1, nb))
+            x = x.reshape((-1, nb))
+            q = (r.reshape(-1) - _popcount(z & x)) % 4
+            # include overall sign factor in weight coefficient;
+            # factoring out phase (instead of sign only)
+            # does not seem to be advantageous
+            weights = np.repeat(coeffs[start:start + bsize], 2**k) * np.where(q < 2, 1, -1)
+            pending.append(_reduce_pauli_table(z, x, q % 2, weights))
+            npending += len(pending[-1][3])
+            if npending > _max_table_bytes // nb:
+                reduced = [_reduce_pauli_table(*[np.concatenate(t) for t in zip(*(reduced + pending))])]
+                pending = []
+                npending = 0
+    chunks = reduced + pending
+    if not chunks:
+        return PauliOperator()
+    return _pauli_operator_from_table(*[np.concatenate(t) for t in zip(*chunks)], nqubits)
+
+
+def _pauli_operator_from_table(z: np.ndarray, x: np.ndarray, q: np.ndarray, weights: np.ndarray,
+                               nqubits: int, tol: float=1e-14) -> PauliOperator:
+    """
+    Construct a Pauli operator from a packed Pauli table (with phase exponents `q` equal to 0 or 1),
+    combining duplicate strings and removing strings with weight below `tol`.
+    """
+    z, x, q, weights = _reduce_pauli_table(z, x, q, weights)
+    if len(weights) == 0:
+        return PauliOperator()
+    keep = np.abs(weights) > tol
+    if not np.any(keep):
+        # retain one (zero weight) Pauli string to retain dimension information
+        keep[0] = True
+    z = np.unpackbits(z[keep], axis=1)[:, :nqubits]
+    x = np.unpackbits(x[keep], axis=1)[:, :nqubits]
+    return PauliOperator([WeightedPauliString(PauliString(zi, xi, qi), w)
+                          for zi, xi, qi, w in zip(z, x, q[keep], weights[keep])])
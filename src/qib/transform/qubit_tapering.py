@@ -0,0 +1,198 @@
+import numpy as np
+from typing import Sequence
+from qib.operator import PauliString, PauliOperator
+from qib.transform.pauli_table import _pauli_operator_from_table
+
+
+def find_z2_symmetries(pauliop: PauliOperator):
+    """
+    Find independent, mutually commuting Pauli strings (stabilizer generators)
+    which commute with all Pauli strings of `pauliop`, together with a qubit per generator
+    which can be tapered off.
+
+    The symmetries are the kernel of the check matrix [X | Z] of the operator over GF(2).
+    The generators are brought into a form such that generator `j` contains a Z or Y
+    factor at qubit `qubits[j]`, while all other generators act as I or X on this qubit.
+    Generators without any Z or Y factor at the remaining qubits (like X-type symmetries)
+    instead contain an X factor at `qubits[j]`, while all other generators act as I or Z on it,
+    corresponding to the former case after a Hadamard conjugation of this qubit.
+    Symmetries which do not admit a qubit which is not used by other generators are discarded.
+
+    Returns the list of generators (Hermitian Pauli strings) and the list of qubits.
+
+    Reference:
+        Sergey Bravyi, Jay M. Gambetta, Antonio Mezzacapo, Kristan Temme
+        Tapering off qubits to simulate fermionic Hamiltonians
+        arXiv:1701.08213
+    """
+    z, x, _, _ = _pauli_table(pauliop)
+    n = z.shape[1]
+    # symmetries (zs, xs) satisfy x.zs + z.xs = 0 for all Pauli strings
+    kernel = _gf2_nullspace(np.concatenate((x, z), axis=1))
+    # generators, as rows of z and x bits
+    gens_z = []
+    gens_x = []
+    qubits = []
+    # pivot bits of the generators: z bit (True) or x bit (False) at the tapered qubit
+    zpivots = []
+    for v in kernel:
+        vz = v[:n].copy()
+        vx = v[n:].copy()
+        # must commute with previously selected generators
+        if any((np.dot(gx, vz) + np.dot(gz, vx)) % 2 for gz, gx in zip(gens_z, gens_x)):
+            continue
+        # eliminate pivot bits of previously selected generators
+        for gz, gx, q, zp in zip(gens_z, gens_x, qubits, zpivots):
+            if (vz[q] if zp else vx[q]):
+                vz ^= gz
+                vx ^= gx
+        free = np.ones(n, dtype=bool)
+        free[qubits] = False
+        if np.any(vz[free]):
+            zp = True
+            q = int(np.argmax(vz & free))
+        elif np.any(vx[free]):
+            # symmetry acts as X (or identity) on all qubits not used by other generators
+            zp = False
+            q = int(np.argmax(vx & free))
+        else:
+            continue
+        # eliminate pivot bit from previously selected generators
+        for gz, gx in zip(gens_z, gens_x):
+            if (gz[q] if zp else gx[q]):
+                gz ^= vz
+                gx ^= vx
+        gens_z.append(vz)
+        gens_x.append(vx)
+        qubits.append(q)
+        zpivots.append(zp)
+    generators = [PauliString(gz, gx, 0) for gz, gx in zip(gens_z, gens_x)]
+    return generators, qubits
+
+
+def taper_pauli_operator(pauliop: PauliOperator, sector: Sequence[int],
+                         generators: Sequence[PauliString]=None, qubits: Sequence[int]=None) -> PauliOperator:
+    """
+    Taper off qubits of a Pauli operator using its Z2 symmetries,
+    restricting it to the common eigenspace of the symmetry generators with eigenvalues `sector` (each 1 or -1).
+
+    If `generators` and `qubits` are not provided, they are determined by `find_z2_symmetries`.
+    The Clifford transformation U = prod_j (sigma_j + tau_j) / sqrt(2) maps each generator tau_j
+    to the single-qubit sigma_j = X_{q_j}; the transformed operator acts as identity or X on qubit q_j,
+    which is then replaced by the eigenvalue and removed. If tau_j acts as X on qubit q_j,
+    sigma_j = Z_{q_j} is used instead.
+    The tapered operator acts on the remaining qubits in ascending order.
+    """
+    if generators is None:
+        if qubits is not None:
+            raise ValueError("'qubits' must be specified together with 'generators'")
+        generators, qubits = find_z2_symmetries(pauliop)
+    if qubits is None or len(qubits) != len(generators):
+        raise ValueError("a qubit must be specified per generator")
+    if len(sector) != len(generators):
+        raise ValueError(f"sector must specify {len(generators)} eigenvalues, received {len(sector)}")
+    if any(s not in (1, -1) for s in sector):
+        raise ValueError("eigenvalues of symmetry generators must be 1 or -1")
+    z, x, q, weights = _pauli_table(pauliop)
+    n = z.shape[1]
+    # single-qubit Pauli string per generator, as 'X' or 'Z'
+    sigmas = []
+    for j, (tau, qj) in enumerate(zip(generators, qubits)):
+        if tau.num_qubits != n:
+            raise ValueError(f"symmetry generator acts on {tau.num_qubits} qubits, but operator on {n} qubits")
+        others = [g for k, g in enumerate(generators) if k != j]
+        if tau.z[qj] and not any(g.z[qj] for g in others):
+            sigmas.append('X')
+        elif tau.x[qj] and not any(g.x[qj] for g in others):
+            sigmas.append('Z')
+        else:
+            raise ValueError("symmetry generators and qubits are not compatible")
+    if len(set(qubits)) != len(qubits):
+        raise ValueError("symmetry generators and qubits are not compatible")
+    for tau, qj, sigma in zip(generators, qubits, sigmas):
+        # Hermitian Pauli strings anticommuting with sigma_j are mapped to P tau_j sigma_j
+        anti = (z[:, qj] if sigma == 'X' else x[:, qj]) == 1
+        if np.any((x[anti] @ tau.z + z[anti] @ tau.x) % 2):
+            raise ValueError("operator does not commute with symmetry generator")
+        sq = PauliString.from_single_paulis(n, (sigma, qj))
+        zt, xt, qt = _pauli_product(z[anti], x[anti], q[anti], tau.z, tau.x, tau.q)
+        z[anti], x[anti], q[anti] = _pauli_product(zt, xt, qt, sq.z, sq.x, sq.q)
+    # replace sigma_j by eigenvalues and remove tapered qubits
+    for s, qj, sigma in zip(sector, qubits, sigmas):
+        if sigma == 'X':
+            assert not np.any(z[:, qj])
+            weights = np.where(x[:, qj] == 1, s * weights, weights)
+        else:
+            assert not np.any(x[:, qj])
+            weights = np.where(z[:, qj] == 1, s * weights, weights)
+    keep = np.setdiff1d(np.arange(n), qubits)
+    z = z[:, keep]
+    x = x[:, keep]
+    # include overall sign factor in weight coefficient
+    weights = weights * np.where(q < 2, 1, -1)
+    return _pauli_operator_from_table(np.packbits(z, axis=1), np.packbits(x, axis=1),
+                                      q % 2, weights, len(keep))
+
+
+def _pauli_table(pauliop: PauliOperator):
+    """
+    Represent the Pauli strings of an operator as table of (unpacked) `z` and `x` bits,
+    together with the phase exponents and weights.
+    """
+    if not pauliop.pstrings:
+        raise ValueError("Pauli operator does not contain any Pauli strings")
+    z = np.array([ps.paulis.z for ps in pauliop.pstrings], dtype=np.uint8)
+    x = np.array([ps.paulis.x for ps in pauliop.pstrings], dtype=np.uint8)
+    q = np.array([ps.paulis.q for ps in pauliop.pstrings], dtype=np.int64)
+    weights = np.array([ps.weight for ps in pauliop.pstrings])
+    return z, x, q, weights
+
+
+def _pauli_product(z1, x1, q1, z2, x2, q2):
+    """
+    Logical matrix multiplication of Pauli strings in table representation,
+    broadcasting over rows (see `PauliString.__matmul__`).
+    """
+    z1 = np.asarray(z1, dtype=np.int64)
+    x1 = np.asarray(x1, dtype=np.int64)
+    z2 = np.asarray(z2, dtype=np.int64)
+    x2 = np.asarray(x2, dtype=np.int64)
+    z_prod = (z1 + z2) % 2
+    x_prod = (x1 + x2) % 2
+    q_prod = (  np.sum(z1*x1, axis=-1)
+              + np.sum(z2*x2, axis=-1)
+              - np.sum(z_prod*x_prod, axis=-1)
+              + 2*np.sum(x1*z2, axis=-1))
+    return z_prod.astype(np.uint8), x_prod.astype(np.uint8), (q1 + q2 + q_prod) % 4
+
+
+def _gf2_nullspace(a: np.ndarray) -> np.ndarray:
+    """
+    Basis of the null space of a binary matrix over GF(2), as rows of the returned matrix.
+    """
+    a = np.array(a, dtype=bool)
+    nrows, ncols = a.shape
+    pivots = []
+    r = 0
+    for c in range(ncols):
+        if r == nrows:
+            break
+        rows = np.nonzero(a[r:, c])[0]
+        if len(rows) == 0:
+            continue
+        p = r + rows[0]
+        if p != r:
+            a[[r, p]] = a[[p, r]]
+        # eliminate column entries in all other rows
+        mask = a[:, c].copy()
+        mask[r] = False
+        a[mask] ^= a[r]
+        pivots.append(c)
+        r += 1
+    free = [c for c in range(ncols) if c not in set(pivots)]
+    basis = np.zeros((len(free), ncols), dtype=np.uint8)
+    for k, f in enumerate(free):
+        basis[k, f] = 1
+        for i, c in enumerate(pivots):
+            basis[k, c] = a[i, f]
+    return basis
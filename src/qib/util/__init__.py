@@ -1 +1,2 @@
-from qib.util.util import crandn, permute_gate_wires, map_particle_to_wire
+from qib.util.util import (crandn, permute_gate_wires, map_particle_to_wire,
+                           sector_basis_states, sector_basis_rank, in_sector)
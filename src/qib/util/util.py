@@ -1,3 +1,4 @@
+import math
 from typing import Sequence
 import numpy as np
 from qib.field import Field, Particle
@@ -38,3 +39,130 @@ def map_particle_to_wire(fields: Sequence[Field], p: Particle):
         i += f.lattice.nsites
     # not found
     return -1
+
+
+def _bit_parity(v: np.ndarray):
+    """
+    Parity of the number of set bits of each entry of `v`.
+    """
+    v = v.copy()
+    for s in (32, 16, 8, 4, 2, 1):
+        v ^= v >> s
+    return v & 1
+
+
+def _binomial_table(n: int, k: int) -> np.ndarray:
+    """
+    Table of binomial coefficients C(p, j) for 0 <= p <= n and 0 <= j <= k.
+    """
+    table = np.zeros((n + 1, k + 1), dtype=np.int64)
+    for p in range(n + 1):
+        for j in range(min(p, k) + 1):
+            table[p, j] = math.comb(p, j)
+    return table
+
+
+def _combination_unrank(n: int, k: int, ranks: np.ndarray) -> np.ndarray:
+    """
+    Unrank combinations of `k` out of `n` bits in the combinatorial number system,
+    such that ranks in ascending order yield integers with `k` set bits in ascending order.
+    """
+    binom = _binomial_table(n, k)
+    r = np.array(ranks, dtype=np.int64)
+    states = np.zeros(len(r), dtype=np.int64)
+    kk = np.full(len(r), k)
+    for p in reversed(range(n)):
+        c = binom[p, kk]
+        take = (kk > 0) & (r >= c)
+        states[take] |= 1 << p
+        r[take] -= c[take]
+        kk[take] -= 1
+    return states
+
+
+def _combination_rank(n: int, k: int, states: np.ndarray) -> np.ndarray:
+    """
+    Rank integers with `k` set bits among the lowest `n` bits in the combinatorial number system
+    (inverse of `_combination_unrank`).
+    """
+    binom = _binomial_table(n, k + 1)
+    states = np.asarray(states, dtype=np.int64)
+    ranks = np.zeros(len(states), dtype=np.int64)
+    count = np.zeros(len(states), dtype=np.int64)
+    for p in range(n):
+        bit = (states >> p) & 1 == 1
+        count += bit
+        ranks[bit] += binom[p, np.minimum(count[bit], k + 1)]
+    return ranks
+
+
+def _check_sector(nsites: int, sector):
+    """
+    Validate a particle number sector specification,
+    and return it as total particle number `N` or tuple `(N_up, N_down)`.
+    """
+    if isinstance(sector, (tuple, list)) and len(sector) == 1:
+        sector = sector[0]
+    if isinstance(sector, (tuple, list)):
+        if len(sector) != 2:
+            raise ValueError(f"expecting sector specification (N,) or (N_up, N_down), received {sector}")
+        if nsites % 2 != 0:
+            raise ValueError("number of sites must be even for a spin-resolved sector")
+        if any(s < 0 or s > nsites // 2 for s in sector):
+            raise ValueError(f"particle numbers {sector} out of range")
+        return tuple(sector)
+    if sector < 0 or sector > nsites:
+        raise ValueError(f"particle number {sector} out of range")
+    return sector
+
+
+def sector_basis_states(nsites: int, sector) -> np.ndarray:
+    """
+    Computational basis states (as integers in ascending order) of `nsites`
+    fermionic modes or qubits belonging to a particle number sector.
+
+    `sector` is either the total number of particles `N` (or `(N,)`), i.e., the Hamming
+    weight of the basis states, or a tuple `(N_up, N_down)` specifying the
+    number of particles in the first and second half of the sites, i.e.,
+    in the spin-up and spin-down layers of a spinful lattice.
+    Using the convention that site 0 corresponds to the most significant bit.
+    """
+    sector = _check_sector(nsites, sector)
+    if isinstance(sector, tuple):
+        n = nsites // 2
+        up = sector_basis_states(n, sector[0])
+        dn = sector_basis_states(n, sector[1])
+        return (up[:, None] << n | dn[None, :]).reshape(-1)
+    return _combination_unrank(nsites, sector, np.arange(math.comb(nsites, sector)))
+
+
+def sector_basis_rank(nsites: int, sector, states: np.ndarray) -> np.ndarray:
+    """
+    Positions of the basis states `states` in the list of basis states
+    of the particle number sector (see `sector_basis_states`).
+    The states must belong to the sector.
+    """
+    sector = _check_sector(nsites, sector)
+    states = np.asarray(states, dtype=np.int64)
+    if isinstance(sector, tuple):
+        n = nsites // 2
+        up = sector_basis_rank(n, sector[0], states >> n)
+        dn = sector_basis_rank(n, sector[1], states & ((1 << n) - 1))
+        return up * math.comb(n, sector[1]) + dn
+    return _combination_rank(nsites, sector, states)
+
+
+def in_sector(nsites: int, sector, states: np.ndarray) -> np.ndarray:
+    """
+    Whether the basis states `states` belong to the particle number sector (see `sector_basis_states`).
+    """
+    sector = _check_sector(nsites, sector)
+    states = np.asarray(states, dtype=np.int64)
+    if isinstance(sector, tuple):
+        n = nsites // 2
+        return (in_sector(n, sector[0], states >> n) &
+                in_sector(n, sector[1], states & ((1 << n) - 1)))
+    count = np.zeros(len(states), dtype=np.int64)
+    for p in range(nsites):
+        count += (states >> p) & 1
+    return count == sector
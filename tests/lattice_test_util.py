@@ -0,0 +1,14 @@
+import unittest
+import numpy as np
+
+
+def assert_edge_layers(test: unittest.TestCase, latt, layers):
+    """
+    Assert that the layers partition the edges of the lattice into disjoint matchings.
+    """
+    edges = latt.edges()
+    test.assertEqual(sum(len(layer) for layer in layers), len(edges))
+    test.assertTrue(np.array_equal(np.unique(np.concatenate(layers), axis=0), edges))
+    for layer in layers:
+        # each site appears at most once per layer
+        test.assertEqual(len(np.unique(layer)), 2*len(layer))
@@ -0,0 +1,55 @@
+import unittest
+import numpy as np
+from scipy import sparse
+import qib
+from qib.transform.bravyi_kitaev_encoding import _fenwick_sets
+
+
+class TestBravyiKitaevEncoding(unittest.TestCase):
+
+    def test_field_operator_encoding(self):
+        """
+        Test Bravyi-Kitaev encoding of a fermionic field operator.
+        """
+        rng = np.random.default_rng()
+
+        for L in [5, 8]:
+            # construct a random fermionic field operator with complex coefficients
+            latt = qib.lattice.FullyConnectedLattice((L,))
+            field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+            # terms with differring number of creation and annihilation operators
+            terms = [qib.operator.FieldOperatorTerm(
+                [qib.operator.IFODesc(field,
+                    rng.choice((qib.operator.IFOType.FERMI_CREATE,
+                                qib.operator.IFOType.FERMI_ANNIHIL))) for n in range(nops)],
+                qib.util.crandn(nops * (latt.nsites,), rng)) for nops in range(4)]
+            H = qib.FieldOperator(terms)
+
+            # encode Hamiltonian
+            P = qib.transform.bravyi_kitaev_encode_field_operator(H)
+
+            # basis transformation: qubit i stores the parity of mode i and its descendants
+            update_sets, _, _ = _fenwick_sets(L)
+            beta = np.array([[int(j == i or i in update_sets[j]) for j in range(L)] for i in range(L)])
+            states = np.arange(2**L)
+            occ = (states[:, None] >> (L - 1 - np.arange(L))) & 1
+            bk_states = ((occ @ beta.T) % 2) @ (1 << (L - 1 - np.arange(L)))
+            perm = sparse.csr_matrix((np.ones(2**L), (bk_states, states)), shape=(2**L, 2**L))
+
+            # compare
+            self.assertLess(sparse.linalg.norm(perm @ H.as_matrix() @ perm.T - P.as_matrix()), 1e-13)
+
+        # logarithmic weight of Pauli strings
+        L = 64
+        latt = qib.lattice.FullyConnectedLattice((L,))
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        term = qib.operator.FieldOperatorTerm(
+            [qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_CREATE)], np.ones(L))
+        P = qib.transform.bravyi_kitaev_encode_field_operator(qib.FieldOperator([term]))
+        self.assertEqual(len(P.pstrings), 2*L)
+        self.assertLessEqual(max(np.count_nonzero(ps.paulis.z | ps.paulis.x) for ps in P.pstrings),
+                             int(np.log2(L)) + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
 import qib
+from lattice_test_util import assert_edge_layers
 
 
 class TestBrickLattice(unittest.TestCase):
@@ -159,6 +160,31 @@ class TestBrickLattice(unittest.TestCase):
                         adj_ref[:, Lx*(2*Ly+2)] = 0
                 self.assertTrue(np.array_equal(adj, adj_ref))
 
+    def test_lattice_edges(self):
+        """
+        Test sparse adjacency matrices and edge lists.
+        """
+        for convention in qib.lattice.ShiftedLatticeConvention:
+            for delete in [False, True]:
+                latt = qib.lattice.BrickLattice((3, 4), delete=delete, convention=convention)
+                adj = latt.adjacency_matrix()
+                adj_sp = latt.sparse_adjacency_matrix()
+                self.assertEqual(adj_sp.format, "csr")
+                self.assertTrue(np.array_equal(adj_sp.toarray(), adj))
+                self.assertTrue(np.array_equal(latt.edges(), np.argwhere(np.triu(adj, k=1))))
+                # only the sparse adjacency matrix is cached
+                self.assertTrue(all(not isinstance(v, np.ndarray) or v.size < latt.nsites**2
+                                    for v in latt._geometry_cache.values()))
+                # large lattice, number of edges according to Euler's formula
+                Lx, Ly = 60, 50
+                latt = qib.lattice.BrickLattice((Lx, Ly), delete=delete, convention=convention)
+                self.assertEqual(len(latt.edges()), 2*Lx*Ly + 2*(Lx + Ly) + Lx*Ly - 1)
+                self.assertLessEqual(np.max(latt.sparse_adjacency_matrix().sum(axis=1)), 3)
+                # cached adjacency must not be affected by modifications of returned matrices
+                adj = latt.sparse_adjacency_matrix()
+                adj.data[:] = 0
+                self.assertEqual(latt.sparse_adjacency_matrix().sum(), 2*len(latt.edges()))
+
     def test_lattice_coords(self):
         """
         Test lattice coordinate indexing.
@@ -178,6 +204,25 @@ class TestBrickLattice(unittest.TestCase):
                     self.assertEqual(i, latt_1.coord_to_index(latt_1.index_to_coord(i)))
                 for i in range(latt_2.nsites):
                     self.assertEqual(i, latt_2.coord_to_index(latt_2.index_to_coord(i)))
+                # batch mapping
+                for latt in [latt_1, latt_2]:
+                    coords = latt.indices_to_coords(np.arange(latt.nsites))
+                    self.assertTrue(np.array_equal(coords, [latt.index_to_coord(i) for i in range(latt.nsites)]))
+                    self.assertTrue(np.array_equal(latt.coords_to_indices(coords), np.arange(latt.nsites)))
+
+    def test_edge_coloring(self):
+        """
+        Test partitioning of the edges into layers of disjoint edges.
+        """
+        for Lx in range(1, 4):
+            for Ly in range(1, 4):
+                for convention in qib.lattice.ShiftedLatticeConvention:
+                    for delete in [False, True]:
+                        latt = qib.lattice.BrickLattice((Lx, Ly), delete=delete, convention=convention)
+                        layers = latt.edge_coloring()
+                        assert_edge_layers(self, latt, layers)
+                        # optimal number of layers
+                        self.assertEqual(len(layers), np.max(latt.adjacency_matrix().sum(axis=1)))
 
 
 if __name__ == "__main__":
@@ -34,6 +34,30 @@ class TestCircuit(unittest.TestCase):
         self.assertTrue(np.allclose(np.reshape(circtens, (2**5, 2**5)),
                                     circuit.as_matrix([field1, field2]).toarray()))
 
+    def test_circuit_tensornet(self):
+        """
+        Test tensor network representation of a quantum circuit.
+        """
+        rng = np.random.default_rng()
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((4,)))
+        q = [qib.field.Qubit(field, i) for i in range(4)]
+        circuit = qib.Circuit()
+        circuit.append_gate(qib.HadamardGate(q[2]))
+        circuit.append_gate(qib.ControlledGate(qib.RxGate(rng.uniform(0, 2*np.pi), q[0]), 2, [0, 1]).set_control(q[3], q[2]))
+        circuit.append_gate(qib.PhaseFactorGate(rng.uniform(0, 2*np.pi), 2).on(q[1], q[3]))
+        circuit.append_gate(qib.MultiplexedGate([qib.RyGate(rng.uniform(0, 2*np.pi), q[1]),
+                                                 qib.RzGate(rng.uniform(0, 2*np.pi), q[1])], 1).set_control(q[0]))
+        circuit.append_gate(qib.GeneralGate(np.linalg.qr(qib.util.crandn((4, 4), rng))[0], 2).on(q[3], q[0]))
+        circuit.append_gate(qib.ControlledGate(qib.PauliXGate(q[3]), 1).set_control(q[1]))
+        net = circuit.as_tensornet([field], debug=True)
+        self.assertTrue(net.is_consistent())
+        self.assertEqual(net.shape, 8 * (2,))
+        self.assertEqual(net.num_tensors, 10)
+        circtens, axes_map = net.contract_einsum()
+        circtens = qib.tensor_network.tensor_network.to_full_tensor(circtens, axes_map)
+        self.assertTrue(np.allclose(np.reshape(circtens, (2**4, 2**4)),
+                                    circuit.as_matrix([field]).toarray()))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,7 +3,7 @@ import numpy as np
 from scipy import sparse
 import scipy.sparse.linalg as spla
 import qib
-from qib.transform.compact_encoding import _encode_edge_operator, _encode_vertex_operator
+from qib.transform.compact_encoding import _encode_edge_operator, _encode_vertex_operator, _compact_operator_tables
 
 
 def comm(a, b):
@@ -189,6 +189,56 @@ class TestCompactEncoding(unittest.TestCase):
         en = np.linalg.eigvalsh(H_proj)
         self.assertTrue(np.allclose(en, en_ref, rtol=1e-11, atol=1e-14))
 
+    def test_operator_tables(self):
+        """
+        Test the cached tables of edge and vertex operators.
+        """
+        shape = (3, 4)
+        latt = qib.lattice.OddFaceCenteredLattice(shape, pbc=False)
+        vertex, keys, edge_z, edge_x, edge_q = _compact_operator_tables(shape)
+        # tables are shared between encodings
+        self.assertIs(_compact_operator_tables(shape)[2], edge_z)
+        self.assertFalse(edge_z.flags.writeable)
+        # number of nearest neighbor edges
+        self.assertEqual(len(keys), 3*3 + 2*4)
+        for k, key in enumerate(keys):
+            i, j = divmod(key, latt.shape[0]*latt.shape[1])
+            ic = np.unravel_index(i, shape)
+            jc = np.unravel_index(j, shape)
+            self.assertEqual(vertex[i], latt.coord_to_index(ic))
+            E = _encode_edge_operator(latt, ic, jc)
+            for p, V in enumerate([_encode_vertex_operator(latt, jc), _encode_vertex_operator(latt, ic)]):
+                ref = E @ V
+                self.assertEqual(qib.operator.PauliString(edge_z[k, p], edge_x[k, p], edge_q[k, p]), ref)
+
+    def test_fermi_hubbard_encoding(self):
+        """
+        Test encoding of Fermi-Hubbard Hamiltonians, including density-density interaction terms.
+        """
+        # with spin: each layer is encoded separately
+        latt_fermi = qib.lattice.LayeredLattice(qib.lattice.IntegerLattice((2, 2), pbc=False), 2)
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt_fermi)
+        H = qib.FermiHubbardHamiltonian(field, 1., 3., spin=True)
+        Henc, latt_enc = qib.transform.compact_encode_field_operator(H.as_field_operator())
+        self.assertIsInstance(latt_enc, qib.lattice.LayeredLattice)
+        self.assertEqual(Henc.num_qubits, latt_enc.nsites)
+        self.assertTrue(Henc.is_hermitian())
+        en_ref = np.linalg.eigvalsh(H.as_matrix().toarray())
+        en = np.linalg.eigvalsh(Henc.as_matrix().toarray())
+        # one redundant qubit per layer, without constraints from stabilizers
+        self.assertTrue(np.allclose(en, np.repeat(en_ref, 4), rtol=1e-11, atol=1e-12))
+
+        # spinless, with interaction along edges
+        latt_fermi = qib.lattice.IntegerLattice((2, 3), pbc=False)
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt_fermi)
+        H = qib.FermiHubbardHamiltonian(field, 1., 3., spin=False)
+        Henc, latt_enc = qib.transform.compact_encode_field_operator(H.as_field_operator())
+        self.assertEqual(Henc.num_qubits, latt_enc.nsites)
+        en_ref = np.linalg.eigvalsh(H.as_matrix().toarray())
+        en = np.linalg.eigvalsh(Henc.as_matrix().toarray())
+        # spectrum of field operator is contained in the spectrum of the encoded operator
+        self.assertTrue(all(np.any(np.isclose(e, en, rtol=1e-11, atol=1e-12)) for e in en_ref))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@ import math
 import unittest
 import numpy as np
 import qib
+from lattice_test_util import assert_edge_layers
 
 
 class TestCustomizedLattice(unittest.TestCase):
@@ -95,6 +96,22 @@ class TestCustomizedLattice(unittest.TestCase):
                     for i in range(latt.nsites):
                         self.assertEqual(i, latt.coord_to_index(latt.index_to_coord(i)))
 
+    def test_edge_coloring(self):
+        """
+        Test greedy partitioning of the edges into layers of disjoint edges.
+        """
+        rng = np.random.default_rng()
+        for n in [5, 8, 12]:
+            adj = rng.integers(0, 2, (n, n))
+            adj = np.triu(adj, k=1)
+            # ensure that there is at least one edge
+            adj[0, 1] = 1
+            adj += adj.T
+            latt = qib.lattice.CustomizedLattice((n,), adj)
+            layers = latt.edge_coloring()
+            assert_edge_layers(self, latt, layers)
+            self.assertLessEqual(len(layers), 2*np.max(adj.sum(axis=1)) - 1)
+
 
 if __name__ == "__main__":
     unittest.main()
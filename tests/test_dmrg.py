@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+from scipy.sparse.linalg import eigsh
+import qib
+
+
+class TestDMRG(unittest.TestCase):
+
+    def test_ground_state(self):
+        """
+        Test DMRG ground state approximation for various Hamiltonians.
+        """
+        rng = np.random.default_rng()
+
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((8,), pbc=False))
+        latt_spin = qib.lattice.LayeredLattice(qib.lattice.IntegerLattice((2, 2), pbc=False), 2)
+        field_spin = qib.field.Field(qib.field.ParticleType.FERMION, latt_spin)
+        pauli_op = qib.PauliOperator(
+            [qib.WeightedPauliString(qib.PauliString.from_single_paulis(8, ('X', i), ('Y', (i + 3) % 8)), rng.normal())
+             for i in range(8)] +
+            [qib.WeightedPauliString(qib.PauliString.from_single_paulis(8, ('Z', i)), rng.normal())
+             for i in range(8)])
+        for H in [qib.IsingHamiltonian(field, 1., 0.2, -0.9),
+                  qib.HeisenbergHamiltonian(field, rng.normal(size=3).tolist(), rng.normal(size=3).tolist()),
+                  qib.FermiHubbardHamiltonian(field_spin, 1., 4., spin=True),
+                  pauli_op]:
+            dmrg = qib.algorithms.dmrg.DMRG(max_bond_dim=16, rng=rng)
+            energy, mps = dmrg.run(H)
+            Hmat = H.as_matrix()
+            eref = eigsh(Hmat, k=1, which='SA')[0][0]
+            self.assertAlmostEqual(energy, eref, delta=1e-8)
+            self.assertTrue(all(chi <= 16 for chi in mps.bond_dims))
+            psi = mps.as_vector()
+            self.assertAlmostEqual(np.linalg.norm(psi), 1)
+            self.assertAlmostEqual(np.vdot(psi, Hmat @ psi).real, energy, delta=1e-8)
+
+
+if __name__ == "__main__":
+    unittest.main()
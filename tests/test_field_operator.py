@@ -123,6 +123,99 @@ class TestFieldOperator(unittest.TestCase):
         self.assertAlmostEqual(
             sparse.linalg.norm(op_a.as_matrix() @ op_b.as_matrix() - op_ab.as_matrix()), 0, delta=1e-12)
 
+    def test_sector_matrix(self):
+        """
+        Test the matrix representation restricted to particle number sectors.
+        """
+        rng = np.random.default_rng()
+        # underlying lattice
+        L = 6
+        latt = qib.lattice.FullyConnectedLattice((L,))
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        # particle number conserving operator
+        const = qib.operator.FieldOperatorTerm([], np.array(0.3))
+        term1 = qib.operator.FieldOperatorTerm(
+            [qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_CREATE),
+             qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_ANNIHIL)],
+            qib.util.crandn((L, L), rng))
+        term2 = qib.operator.FieldOperatorTerm(
+            [qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_CREATE),
+             qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_ANNIHIL),
+             qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_ANNIHIL),
+             qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_CREATE)],
+            qib.util.crandn((L, L, L, L), rng))
+        op = qib.FieldOperator([const, term1, term2])
+        opmat = op.as_matrix()
+        for sector in [0, 2, 3, 6]:
+            idx = qib.util.sector_basis_states(L, sector)
+            self.assertTrue(np.array_equal(qib.util.sector_basis_rank(L, sector, idx), np.arange(len(idx))))
+            self.assertAlmostEqual(sparse.linalg.norm(op.as_matrix(sector=sector) - opmat[idx][:, idx]), 0, delta=1e-12)
+            # total particle number specified as tuple
+            self.assertAlmostEqual(sparse.linalg.norm(op.as_matrix(sector=(sector,)) - opmat[idx][:, idx]), 0, delta=1e-12)
+        # operator not conserving particle number
+        term3 = qib.operator.FieldOperatorTerm(
+            [qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_CREATE)],
+            qib.util.crandn((L,), rng))
+        with self.assertRaises(ValueError):
+            qib.FieldOperator([term1, term3]).as_matrix(sector=2)
+        # spin-resolved sector of the Fermi-Hubbard model
+        latt = qib.lattice.LayeredLattice(qib.lattice.IntegerLattice((2, 3), pbc=False), 2)
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        H = qib.FermiHubbardHamiltonian(field, 1., 4., spin=True)
+        idx = qib.util.sector_basis_states(12, (2, 3))
+        self.assertEqual(len(idx), 15 * 20)
+        self.assertAlmostEqual(sparse.linalg.norm(H.as_matrix(sector=(2, 3)) - H.as_matrix()[idx][:, idx]), 0, delta=1e-12)
+
+    def test_sparse_coefficients(self):
+        """
+        Test field operator terms with coefficients stored in sparse coordinate format.
+        """
+        rng = np.random.default_rng()
+        # underlying lattice
+        L = 5
+        latt = qib.lattice.FullyConnectedLattice((L,))
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        opdesc = [qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_CREATE),
+                  qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_ANNIHIL),
+                  qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_CREATE),
+                  qib.operator.IFODesc(field, qib.operator.IFOType.FERMI_ANNIHIL)]
+        indices = rng.integers(0, L, size=(12, 4))
+        values = qib.util.crandn(12, rng)
+        term_sp = qib.operator.FieldOperatorTerm.from_coo(opdesc, indices, values, 4*(L,))
+        self.assertTrue(term_sp.is_sparse)
+        coeffs = np.zeros(4*(L,), dtype=complex)
+        np.add.at(coeffs, tuple(indices.T), values)
+        self.assertTrue(np.allclose(term_sp.coeffs, coeffs))
+        term_de = qib.operator.FieldOperatorTerm(opdesc, coeffs)
+        self.assertFalse(term_de.is_sparse)
+        # non-zero entries with thresholding
+        ind, val = term_sp.nonzero(tol=0.5)
+        self.assertTrue(np.all(np.abs(val) > 0.5))
+        self.assertTrue(np.allclose(coeffs[tuple(ind.T)], val))
+        self.assertEqual(len(val), np.count_nonzero(np.abs(coeffs) > 0.5))
+        # matrix representation and encoding
+        op_sp = qib.FieldOperator([term_sp])
+        op_de = qib.FieldOperator([term_de])
+        self.assertAlmostEqual(sparse.linalg.norm(op_sp.as_matrix() - op_de.as_matrix()), 0, delta=1e-12)
+        self.assertAlmostEqual(sparse.linalg.norm(op_sp.adjoint().as_matrix() - op_de.as_matrix().conj().T), 0, delta=1e-12)
+        self.assertAlmostEqual(sparse.linalg.norm(
+            qib.transform.jordan_wigner_encode_field_operator(op_sp).as_matrix() - op_de.as_matrix()), 0, delta=1e-12)
+        # logical product with dense term
+        term2 = qib.operator.FieldOperatorTerm(opdesc[:2], qib.util.crandn((L, L), rng))
+        self.assertTrue(np.allclose((term_sp @ term2).coeffs, (term_de @ term2).coeffs))
+        # Hermitian terms
+        self.assertFalse(term_sp.is_hermitian())
+        term_h = qib.operator.FieldOperatorTerm.from_coo(opdesc, np.concatenate((indices, indices[:, ::-1])),
+                                                         np.concatenate((values, values.conj())), 4*(L,))
+        self.assertTrue(term_h.is_hermitian())
+        self.assertTrue(qib.operator.FieldOperatorTerm(opdesc[:2], sparse.identity(L)).is_hermitian())
+        # Fermi-Hubbard interaction term does not require dense storage
+        latt = qib.lattice.LayeredLattice(qib.lattice.IntegerLattice((10, 10), pbc=True), 2)
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        T, V = qib.FermiHubbardHamiltonian(field, 1., 4., spin=True).as_field_operator().terms
+        self.assertTrue(T.is_sparse and V.is_sparse)
+        self.assertEqual(len(V.nonzero()[1]), 100)
+
 
 # Alternative implementation of fermionic operators, as reference
 
@@ -1,4 +1,5 @@
 import unittest
+from unittest.mock import patch
 from copy import copy
 import numpy as np
 from scipy.linalg import expm, block_diag
@@ -258,6 +259,12 @@ class TestGates(unittest.TestCase):
         h = qib.FieldOperator([term])
         # time
         t = 1.2
+        # time evolution gate applied to a state
+        psi = qib.util.crandn(2**5, rng)
+        exph_ref = expm(-1j*t*h.as_matrix().toarray())
+        self.assertTrue(np.allclose(qib.TimeEvolutionGate(h, t).as_matrix(), exph_ref))
+        for method in ["eigh", "krylov"]:
+            self.assertTrue(np.allclose(qib.TimeEvolutionGate(h, t).apply(psi, method), exph_ref @ psi))
         cexph = qib.ControlledGate(qib.TimeEvolutionGate(h, t), 1)
         self.assertEqual(cexph.num_wires, 6)
         cexph_mat_ref = (  np.kron(np.diag([1., 0.]), np.identity(2**5))
@@ -265,7 +272,7 @@ class TestGates(unittest.TestCase):
         self.assertTrue(np.allclose(cexph.as_matrix(), cexph_mat_ref))
         cexph.set_control(qc)
         self.assertTrue(cexph.fields() == [field2, field3])
-        self.assertTrue(np.array_equal(cexph.as_circuit_matrix([field3, field2]).toarray(),
+        self.assertTrue(np.allclose(cexph.as_circuit_matrix([field3, field2]).toarray(),
                                        qib.util.permute_gate_wires(np.kron(cexph_mat_ref, np.identity(2)), [1, 2, 3, 4, 5, 6, 0])))
         # inverse
         cexph_inverse = qib.ControlledGate(qib.TimeEvolutionGate(h, -t), 1)
@@ -345,7 +352,7 @@ class TestGates(unittest.TestCase):
         self.assertTrue(np.allclose(mplxg.as_matrix(), mplxg_mat_ref))
         mplxg.set_control(qc)
         self.assertTrue(mplxg.fields() == [field2, field3])
-        self.assertTrue(np.array_equal(mplxg.as_circuit_matrix([field2, field3]).toarray(),
+        self.assertTrue(np.allclose(mplxg.as_circuit_matrix([field2, field3]).toarray(),
                                         qib.util.permute_gate_wires(np.kron(mplxg_mat_ref, np.identity(2)), [6, 0, 1, 2, 3, 4, 5])))
         # inverse
         self.assertTrue(np.allclose(mplxg.inverse().as_matrix() @ mplxg.as_matrix(), np.identity(2**6)))
@@ -454,6 +461,23 @@ class TestGates(unittest.TestCase):
             g_copy = copy(gate)
             self.assertTrue(g_copy == gate)
             self.assertTrue(np.allclose(g_copy.as_matrix(), gate.as_matrix()))
+            # matrix-free application in eigenbasis of Hamiltonian
+            ψ = qib.util.crandn((2**(L + 1), 3), rng)
+            self.assertTrue(np.allclose(gate.apply(ψ), gmat @ ψ))
+            self.assertTrue(np.allclose(gate.apply(ψ[:, 0]), gmat @ ψ[:, 0]))
+            # gate and its inverse are formed from the cached eigendecomposition,
+            # without assembling the matrix of the Hamiltonian again
+            with patch.object(type(H), "as_matrix", side_effect=AssertionError):
+                self.assertTrue(np.allclose(gate.as_matrix(), gmat))
+                self.assertTrue(np.allclose(gate.inverse().as_matrix(), gmat.conj().T))
+        # cached eigendecomposition must be updated after changing the Hamiltonian
+        gate = qib.BlockEncodingGate(H, qib.operator.BlockEncodingMethod.R)
+        gmat = gate.as_matrix()
+        H.J *= 0.5
+        gmat2 = gate.as_matrix()
+        self.assertFalse(np.allclose(gmat2, gmat))
+        self.assertTrue(np.allclose(gmat2 @ gmat2, np.identity(2**gate.num_wires)))
+        self.assertTrue(np.allclose(gmat2[:2**L, :2**L], H.as_matrix().toarray()))
 
     def test_general_gate(self):
         """
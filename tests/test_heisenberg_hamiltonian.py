@@ -36,6 +36,11 @@ class TestHeisenbergHamiltonian(unittest.TestCase):
                 Href += np.kron(np.identity(2**i), np.kron(h[k]*gate, np.identity(2**(L-i-1))))
         # compare
         self.assertTrue(np.allclose(H.as_matrix().toarray(), Href))
+        # matrix product operator representation
+        mpo = H.as_mpo()
+        self.assertEqual(mpo.nsites, L)
+        self.assertTrue(max(mpo.bond_dims) <= 5)
+        self.assertTrue(np.allclose(mpo.as_matrix(), Href))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
 import qib
+from lattice_test_util import assert_edge_layers
 
 
 class TestHexagonalLattice(unittest.TestCase):
@@ -85,6 +86,20 @@ class TestHexagonalLattice(unittest.TestCase):
                 self.assertTrue(np.array_equal(adj, adj_ref))
                 self.assertTrue(np.array_equal(adj, adj_brick))
 
+    def test_lattice_edges(self):
+        """
+        Test sparse adjacency matrices and edge lists.
+        """
+        latt = qib.lattice.HexagonalLattice((3, 4))
+        adj_sp = latt.sparse_adjacency_matrix()
+        self.assertEqual(adj_sp.format, "csr")
+        self.assertTrue(np.array_equal(adj_sp.toarray(), latt.adjacency_matrix()))
+        # large lattice, number of edges according to Euler's formula
+        Lx, Ly = 60, 50
+        latt = qib.lattice.HexagonalLattice((Lx, Ly))
+        self.assertEqual(latt.sparse_adjacency_matrix().shape, (latt.nsites, latt.nsites))
+        self.assertEqual(len(latt.edges()), latt.nsites + Lx*Ly - 1)
+
     def test_lattice_coords(self):
         """
         Test lattice coordinate indexing.
@@ -100,6 +115,21 @@ class TestHexagonalLattice(unittest.TestCase):
                 for i in range(latt_2.nsites):
                     self.assertEqual(i, latt_2.coord_to_index(latt_2.index_to_coord(i)))
 
+    def test_edge_coloring(self):
+        """
+        Test partitioning of the edges into layers of disjoint edges.
+        """
+        for convention in qib.lattice.ShiftedLatticeConvention:
+            latt = qib.lattice.HexagonalLattice((3, 4), convention=convention)
+            layers = latt.edge_coloring()
+            assert_edge_layers(self, latt, layers)
+            self.assertEqual(len(layers), 3)
+        # large lattice
+        latt = qib.lattice.HexagonalLattice((60, 60))
+        layers = latt.edge_coloring()
+        assert_edge_layers(self, latt, layers)
+        self.assertEqual(len(layers), 3)
+
 
 if __name__ == "__main__":
     unittest.main()
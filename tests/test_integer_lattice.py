@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
 import qib
+from lattice_test_util import assert_edge_layers
 
 
 class TestIntegerLattice(unittest.TestCase):
@@ -76,6 +77,26 @@ class TestIntegerLattice(unittest.TestCase):
                             adj_ref[i, j] = 1
                 self.assertTrue(np.array_equal(adj, adj_ref))
 
+    def test_lattice_edges(self):
+        """
+        Test sparse adjacency matrices and edge lists.
+        """
+        for shape in [(7,), (3, 4), (2, 3, 4)]:
+            for pbc in [False, True]:
+                latt = qib.lattice.IntegerLattice(shape, pbc=pbc)
+                adj = latt.adjacency_matrix()
+                adj_sp = latt.sparse_adjacency_matrix()
+                self.assertEqual(adj_sp.format, "csr")
+                self.assertTrue(np.array_equal(adj_sp.toarray(), adj))
+                edges = latt.edges()
+                self.assertEqual(edges.shape, (np.count_nonzero(np.triu(adj, k=1)), 2))
+                self.assertTrue(np.all(edges[:, 0] < edges[:, 1]))
+                self.assertTrue(np.all(adj[edges[:, 0], edges[:, 1]] == 1))
+        # large lattice
+        latt = qib.lattice.IntegerLattice((100, 100), pbc=True)
+        self.assertEqual(latt.sparse_adjacency_matrix().nnz, 4 * latt.nsites)
+        self.assertEqual(len(latt.edges()), 2 * latt.nsites)
+
     def test_lattice_coords(self):
         """
         Test lattice coordinate indexing.
@@ -100,6 +121,35 @@ class TestIntegerLattice(unittest.TestCase):
                     latt = qib.lattice.IntegerLattice((Lx, Ly, Lz))
                     for i in range(latt.nsites):
                         self.assertEqual(i, latt.coord_to_index(latt.index_to_coord(i)))
+                    # batch mapping
+                    coords = latt.indices_to_coords(np.arange(latt.nsites))
+                    self.assertTrue(np.array_equal(coords, [latt.index_to_coord(i) for i in range(latt.nsites)]))
+                    self.assertTrue(np.array_equal(latt.coords_to_indices(coords), np.arange(latt.nsites)))
+
+        # cached geometry must not be affected by modifications of returned arrays
+        latt = qib.lattice.IntegerLattice((4, 5), pbc=True)
+        adj = latt.sparse_adjacency_matrix()
+        adj.data[:] = 0
+        edges = latt.edges()
+        edges[:] = 0
+        self.assertEqual(latt.sparse_adjacency_matrix().sum(), 4 * latt.nsites)
+        self.assertEqual(np.count_nonzero(latt.edges()[:, 1]), 2 * latt.nsites)
+
+    def test_edge_coloring(self):
+        """
+        Test partitioning of the edges into layers of disjoint edges.
+        """
+        for shape in [(5,), (6,), (3, 4), (3, 5), (2, 3, 4)]:
+            for pbc in [False, True, (True,) + (len(shape) - 1)*(False,)]:
+                latt = qib.lattice.IntegerLattice(shape, pbc=pbc)
+                layers = latt.edge_coloring()
+                assert_edge_layers(self, latt, layers)
+                # number of layers should be the maximum vertex degree,
+                # except for periodic boundary conditions along all axes with odd length
+                nlayers = np.max(latt.adjacency_matrix().sum(axis=1))
+                if all(latt.pbc) and all(n % 2 == 1 for n in shape):
+                    nlayers += 1
+                self.assertEqual(len(layers), nlayers)
 
 
 if __name__ == "__main__":
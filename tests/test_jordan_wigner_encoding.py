@@ -29,6 +29,28 @@ class TestJordanWignerEncoding(unittest.TestCase):
         # compare
         self.assertLess(sparse.linalg.norm(H.as_matrix() - P.as_matrix()), 1e-13)
 
+    def test_molecular_hamiltonian_encoding(self):
+        """
+        Test Jordan-Wigner encoding of a molecular Hamiltonian.
+        """
+        rng = np.random.default_rng()
+        L = 6
+        latt = qib.lattice.FullyConnectedLattice((L,))
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        tkin = rng.standard_normal((L, L))
+        tkin = 0.5*(tkin + tkin.T)
+        vint = rng.standard_normal((L, L, L, L))
+        vint = 0.5*(vint + vint.transpose(3, 2, 1, 0))
+        H = qib.operator.MolecularHamiltonian(field, rng.standard_normal(), tkin, vint,
+                                              qib.operator.MolecularHamiltonianSymmetry(0))
+        P = qib.transform.jordan_wigner_encode_field_operator(H.as_field_operator())
+        self.assertLess(sparse.linalg.norm(H.as_matrix() - P.as_matrix()), 1e-12)
+        # duplicate Pauli strings must be combined
+        keys = [(tuple(ps.paulis.z), tuple(ps.paulis.x), ps.paulis.q) for ps in P.pstrings]
+        self.assertEqual(len(set(keys)), len(keys))
+        # overall sign factors are absorbed into the weights
+        self.assertTrue(all(ps.paulis.q < 2 for ps in P.pstrings))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -37,6 +37,10 @@ class TestLayeredLattice(unittest.TestCase):
                     adj_ref[i, j] = 1
         # compare
         self.assertTrue(np.array_equal(latt.adjacency_matrix(), adj_ref))
+        self.assertTrue(np.array_equal(latt.sparse_adjacency_matrix().toarray(), adj_ref))
+        edges = latt.edges()
+        self.assertEqual(len(edges), np.count_nonzero(adj_ref) // 2)
+        self.assertTrue(np.all(adj_ref[edges[:, 0], edges[:, 1]] == 1))
 
     def test_lattice_coords(self):
         """
@@ -53,6 +57,12 @@ class TestLayeredLattice(unittest.TestCase):
                 latt = qib.lattice.LayeredLattice(hexlatt, nlayers)
                 for i in range(latt.nsites):
                     self.assertEqual(i, latt.coord_to_index(latt.index_to_coord(i)))
+            # batch mapping
+            for base in [qib.lattice.IntegerLattice((3, 4)), qib.lattice.OddFaceCenteredLattice((3, 4))]:
+                latt = qib.lattice.LayeredLattice(base, nlayers)
+                coords = latt.indices_to_coords(np.arange(latt.nsites))
+                self.assertTrue(np.allclose(coords, [latt.index_to_coord(i) for i in range(latt.nsites)]))
+                self.assertTrue(np.array_equal(latt.coords_to_indices(coords), np.arange(latt.nsites)))
 
 
 if __name__ == "__main__":
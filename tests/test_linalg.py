@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+import numpy as np
+from scipy import sparse
+import qib
+
+
+class TestLinalg(unittest.TestCase):
+
+    def test_linear_operator(self):
+        """
+        Test matrix-free application of operators.
+        """
+        rng = np.random.default_rng()
+        L = 7
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((L,), pbc=True))
+        H = qib.HeisenbergHamiltonian(field, rng.normal(size=3).tolist(), rng.normal(size=3).tolist())
+        P = qib.PauliOperator([
+            qib.WeightedPauliString(qib.PauliString.from_single_paulis(L, ('X', 0), ('Y', 3), q=1), 0.7 + 0.2j),
+            qib.WeightedPauliString(qib.PauliString.from_single_paulis(L, ('Y', 2), ('Z', 5)), -1.1)])
+        x = qib.util.crandn(2**L, rng)
+        for op in [H, P]:
+            A = qib.linalg.as_linear_operator(op)
+            opmat = op.as_matrix()
+            self.assertTrue(np.allclose(A.matvec(x), opmat @ x))
+            self.assertTrue(np.allclose(A.rmatvec(x), opmat.conj().T @ x))
+        # restriction to particle number sector
+        H = qib.HeisenbergHamiltonian(field, [1., 1., 0.5], [0., 0., 0.3])
+        idx = qib.linalg.sector_indices(L, 3)
+        self.assertEqual(len(idx), 35)
+        self.assertTrue(all(bin(i).count('1') == 3 for i in idx))
+        A = qib.linalg.as_linear_operator(H, sector=3)
+        self.assertTrue(np.allclose(A.matmat(np.identity(len(idx))), H.as_matrix().toarray()[np.ix_(idx, idx)]))
+
+    def test_eigensolvers(self):
+        """
+        Test matrix-free ground state, eigenpair and spectral norm computation.
+        """
+        rng = np.random.default_rng()
+        L = 8
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((L,), pbc=True))
+        H = qib.HeisenbergHamiltonian(field, [1., 1., 0.5], [0., 0., 0.3])
+        hmat = H.as_matrix().toarray()
+        evals = np.linalg.eigvalsh(hmat)
+        energy, psi = qib.linalg.ground_state(H)
+        self.assertAlmostEqual(energy, evals[0], delta=1e-8)
+        self.assertTrue(np.allclose(hmat @ psi, energy * psi, atol=1e-6))
+        with self.assertRaises(ValueError):
+            qib.linalg.ground_state(H, maxrestarts=0)
+        w, v = qib.linalg.lowest_eigenpairs(H, 4)
+        self.assertTrue(np.allclose(w, evals[:4]))
+        self.assertTrue(np.allclose(hmat @ v, v * w))
+        self.assertAlmostEqual(qib.linalg.spectral_norm(H), np.max(np.abs(evals)), delta=1e-8)
+        # non-Hermitian operator
+        P = qib.PauliOperator([
+            qib.WeightedPauliString(qib.PauliString.from_single_paulis(L, ('X', 0), ('Y', 3), q=1), 0.7 + 0.2j),
+            qib.WeightedPauliString(qib.PauliString.from_single_paulis(L, ('Y', 2), ('Z', 5)), -1.1)])
+        self.assertAlmostEqual(qib.linalg.spectral_norm(P), np.linalg.norm(P.as_matrix().toarray(), ord=2), delta=1e-8)
+        # spin-resolved particle number sector of Fermi-Hubbard model
+        latt = qib.lattice.LayeredLattice(qib.lattice.IntegerLattice((2, 2), pbc=False), 2)
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        H = qib.FermiHubbardHamiltonian(field, 1., 4., spin=True)
+        idx = qib.linalg.sector_indices(8, (2, 2))
+        self.assertEqual(len(idx), 36)
+        energy, _ = qib.linalg.ground_state(H, sector=(2, 2), rng=rng)
+        self.assertAlmostEqual(energy, np.linalg.eigvalsh(H.as_matrix().toarray()[np.ix_(idx, idx)])[0], delta=1e-8)
+
+    def test_parallel_matvec(self):
+        """
+        Test multi-threaded sparse matrix-vector and matrix-matrix products.
+        """
+        rng = np.random.default_rng()
+        qib.linalg.set_num_threads(3)
+        try:
+            self.assertEqual(qib.linalg.get_num_threads(), 3)
+            mat = sparse.random(3000, 2000, density=0.03, format="csr", random_state=rng) \
+                + 1j*sparse.random(3000, 2000, density=0.03, format="csr", random_state=rng)
+            pmat = qib.linalg.ParallelCSRMatrix(mat)
+            self.assertEqual(pmat.num_blocks, 3)
+            x = qib.util.crandn(2000, rng)
+            X = qib.util.crandn((2000, 4), rng)
+            self.assertTrue(np.allclose(pmat @ x, mat @ x))
+            self.assertTrue(np.allclose(pmat @ X, mat @ X))
+            self.assertTrue(np.allclose(qib.linalg.parallel_matvec(mat, X), mat @ X))
+            A = qib.linalg.as_parallel_operator(mat)
+            y = qib.util.crandn(3000, rng)
+            self.assertTrue(np.allclose(A.rmatvec(y), mat.conj().T @ y))
+            self.assertTrue(np.allclose(A.matmat(X), mat @ X))
+            # matrix-free Pauli operator, with rows distributed over threads
+            L = 16
+            field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((L,), pbc=True))
+            H = qib.HeisenbergHamiltonian(field, rng.normal(size=3).tolist(), rng.normal(size=3).tolist())
+            x = qib.util.crandn(2**L, rng)
+            self.assertTrue(np.allclose(qib.linalg.as_linear_operator(H).matvec(x), H.as_matrix() @ x))
+        finally:
+            qib.linalg.set_num_threads(None)
+
+    def test_cached_eigh(self):
+        """
+        Test caching of eigendecompositions of operators.
+        """
+        L = 6
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((L,), pbc=True))
+        H = qib.IsingHamiltonian(field, 1., 0.3, 0.7)
+        evals, evecs = qib.linalg.cached_eigh(H)
+        self.assertTrue(qib.linalg.is_eigh_cached(H))
+        self.assertTrue(np.allclose(evals, np.linalg.eigvalsh(H.as_matrix().toarray())))
+        # cached lookup must not assemble the matrix representation
+        with patch.object(qib.IsingHamiltonian, "as_matrix", side_effect=AssertionError):
+            evals2, evecs2 = qib.linalg.cached_eigh(H)
+        self.assertIs(evals2, evals)
+        self.assertIs(evecs2, evecs)
+        # modified parameters
+        H.g = 0.2
+        evals3, _ = qib.linalg.cached_eigh(H)
+        self.assertTrue(np.allclose(evals3, np.linalg.eigvalsh(H.as_matrix().toarray())))
+        self.assertFalse(np.allclose(evals3, evals))
+        # modified Pauli string of a Pauli operator
+        P = H.as_pauli_operator()
+        evals, _ = qib.linalg.cached_eigh(P)
+        P.pstrings[0].weight *= 2
+        evals2, _ = qib.linalg.cached_eigh(P)
+        self.assertTrue(np.allclose(evals2, np.linalg.eigvalsh(P.as_matrix().toarray())))
+        self.assertFalse(np.allclose(evals2, evals))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,6 +33,10 @@ class TestOddFaceCenteredLattice(unittest.TestCase):
                 latt = qib.lattice.OddFaceCenteredLattice((Lx, Ly))
                 for i in range(latt.nsites):
                     self.assertEqual(i, latt.coord_to_index(latt.index_to_coord(i)))
+                # batch mapping
+                coords = latt.indices_to_coords(np.arange(latt.nsites))
+                self.assertTrue(np.array_equal(coords, [latt.index_to_coord(i) for i in range(latt.nsites)]))
+                self.assertTrue(np.array_equal(latt.coords_to_indices(coords), np.arange(latt.nsites)))
 
     def test_odd_face_adjacency(self):
         """
@@ -97,6 +97,10 @@ class TestPauliOperator(unittest.TestCase):
             + weights[2] * (-1j)**q[2] * np.kron(np.kron(np.kron(np.kron(Y, Z), I), Z), X))
         # compare
         self.assertTrue(np.allclose(P.as_matrix().toarray(), Pref))
+        # matrix product operator representation
+        mpo = P.as_mpo()
+        self.assertEqual(mpo.nsites, L)
+        self.assertTrue(np.allclose(mpo.as_matrix(), Pref))
 
         # check summation of Pauli operators: first and last Pauli string
         # are the same as above, only with different weights
@@ -0,0 +1,98 @@
+import unittest
+import itertools
+import numpy as np
+import qib
+
+
+class TestQubitTapering(unittest.TestCase):
+
+    def test_taper_fermi_hubbard(self):
+        """
+        Test tapering off qubits of an encoded Fermi-Hubbard Hamiltonian.
+        """
+        # construct a Fermi-Hubbard Hamiltonian with spin
+        latt = qib.lattice.LayeredLattice(qib.lattice.IntegerLattice((2, 2), pbc=False), 2)
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        H = qib.FermiHubbardHamiltonian(field, 1., 3., spin=True).as_field_operator()
+        for encode in [qib.transform.jordan_wigner_encode_field_operator,
+                       qib.transform.parity_encode_field_operator]:
+            P = encode(H)
+            generators, qubits = qib.transform.find_z2_symmetries(P)
+            # particle number parity per spin
+            self.assertEqual(len(generators), 2)
+            for tau in generators:
+                self.assertTrue(all(ps.paulis.commutes_with(tau) for ps in P.pstrings))
+                self.assertTrue(tau.is_hermitian())
+            if encode == qib.transform.parity_encode_field_operator:
+                # parity encoding stores the parities on single qubits
+                self.assertEqual(sorted(qubits), [3, 7])
+            eigvals = []
+            for sector in itertools.product((1, -1), repeat=len(generators)):
+                T = qib.transform.taper_pauli_operator(P, sector, generators, qubits)
+                self.assertEqual(T.num_qubits, P.num_qubits - len(generators))
+                self.assertTrue(T.is_hermitian())
+                eigvals += list(np.linalg.eigvalsh(T.as_matrix().toarray()))
+            # union of spectra of tapered operators must agree with overall spectrum
+            self.assertTrue(np.allclose(np.sort(eigvals), np.linalg.eigvalsh(P.as_matrix().toarray())))
+
+    def test_taper_molecular_hamiltonian(self):
+        """
+        Test tapering off qubits of an encoded molecular Hamiltonian.
+        """
+        rng = np.random.default_rng()
+        L = 6
+        latt = qib.lattice.FullyConnectedLattice((L,))
+        field = qib.field.Field(qib.field.ParticleType.FERMION, latt)
+        tkin = rng.standard_normal((L, L))
+        tkin = 0.5*(tkin + tkin.T)
+        vint = rng.standard_normal((L, L, L, L))
+        vint = 0.5*(vint + vint.transpose(3, 2, 1, 0))
+        H = qib.operator.MolecularHamiltonian(field, rng.standard_normal(), tkin, vint,
+                                              qib.operator.MolecularHamiltonianSymmetry(0))
+        P = qib.transform.bravyi_kitaev_encode_field_operator(H.as_field_operator())
+        Pmat = P.as_matrix().toarray()
+        # overall particle number parity
+        generators, qubits = qib.transform.find_z2_symmetries(P)
+        self.assertEqual(len(generators), 1)
+        for sector in [(1,), (-1,)]:
+            T = qib.transform.taper_pauli_operator(P, sector)
+            # compare with restriction to eigenspace of symmetry generator
+            tau_eigvals, tau_eigvecs = np.linalg.eigh(generators[0].as_matrix().toarray())
+            v = tau_eigvecs[:, np.isclose(tau_eigvals, sector[0])]
+            self.assertTrue(np.allclose(np.linalg.eigvalsh(T.as_matrix().toarray()),
+                                        np.linalg.eigvalsh(v.conj().T @ Pmat @ v)))
+
+    def test_taper_x_symmetries(self):
+        """
+        Test tapering off qubits of symmetries without Z factors.
+        """
+        rng = np.random.default_rng()
+        L = 6
+        # transverse-field Ising chain with global spin flip symmetry,
+        # and XX + ZZ chain additionally commuting with the product of Z
+        for couplings, num_sym in [(['ZZ'], 1), (['XX', 'ZZ'], 2)]:
+            P = qib.operator.PauliOperator()
+            for i in range(L):
+                for c in couplings:
+                    P.add_pauli_string(qib.operator.WeightedPauliString(
+                        qib.operator.PauliString.from_single_paulis(L, (c[0], i), (c[1], (i + 1) % L)),
+                        rng.standard_normal()))
+                if couplings == ['ZZ']:
+                    P.add_pauli_string(qib.operator.WeightedPauliString(
+                        qib.operator.PauliString.from_single_paulis(L, ('X', i)),
+                        rng.standard_normal()))
+            generators, qubits = qib.transform.find_z2_symmetries(P)
+            self.assertEqual(len(generators), num_sym)
+            # product of X on all qubits
+            self.assertTrue(any(np.all(tau.x) and not np.any(tau.z) for tau in generators))
+            eigvals = []
+            for sector in itertools.product((1, -1), repeat=len(generators)):
+                T = qib.transform.taper_pauli_operator(P, sector, generators, qubits)
+                self.assertEqual(T.num_qubits, L - len(generators))
+                self.assertTrue(T.is_hermitian())
+                eigvals += list(np.linalg.eigvalsh(T.as_matrix().toarray()))
+            self.assertTrue(np.allclose(np.sort(eigvals), np.linalg.eigvalsh(P.as_matrix().toarray())))
+
+
+if __name__ == "__main__":
+    unittest.main()
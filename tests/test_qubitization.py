@@ -93,10 +93,60 @@ class TestQubitization(unittest.TestCase):
                     mat_class = eigen_transform.as_matrix()
                     circ_class = eigen_transform.as_circuit().as_matrix([field2, field1]).toarray()[:2**6, :2**6]
                     self.assertTrue(np.allclose(mat_class, circ_class))
+                    # application to states, without forming the matrix
+                    ψ = qib.util.crandn((2**6, 2), rng)
+                    self.assertTrue(np.allclose(eigen_transform.apply(ψ), mat_class @ ψ))
+                    self.assertTrue(np.allclose(eigen_transform.apply(ψ[:, 0], method="spectral"), mat_class @ ψ[:, 0]))
+                # spectral blocks: top-left entries are the transformed polynomial
+                eigen_transform.set_theta_seq(theta[:4])
+                evals, evecs, blocks = eigen_transform.spectral_blocks()
+                mat_class = eigen_transform.as_matrix()
+                self.assertTrue(np.allclose(evecs.conj().T @ mat_class[:2**5, :2**5] @ evecs, np.diag(blocks[:, 0, 0])))
 
                 # TODO: add more tests
                 #print("method encoding: ", method_enc, "method processing: ", method_proc, "/ state: ", [0], "\t...OK!")
 
+    def test_qsp_phase_angles(self):
+        """
+        Test the computation of the eigenvalue transformation angles for a target polynomial.
+        """
+        rng = np.random.default_rng()
+
+        # construct a simple Hamiltonian
+        latt = qib.lattice.IntegerLattice((4,), pbc=True)
+        field1 = qib.field.Field(qib.field.ParticleType.QUBIT, latt)
+        H = qib.operator.HeisenbergHamiltonian(field1, rng.normal(size=3),
+                                                       rng.normal(size=3))
+        # rescale parameters (effectively rescales overall Hamiltonian)
+        scale = 1.25 * np.linalg.norm(H.as_matrix().toarray(), ord=2)
+        H.J /= scale
+        H.h /= scale
+        field2 = qib.field.Field(qib.field.ParticleType.QUBIT,
+                                 qib.lattice.IntegerLattice((2,), pbc=False))
+        q_enc = qib.field.Qubit(field2, 1)
+        q_anc = qib.field.Qubit(field2, 0)
+        ccos, csin = qib.algorithms.qubitization.time_evolution_coefficients(2.5, 21)
+        cfilt = qib.algorithms.qubitization.eigenstate_filter_coefficients(0.3, 16)
+        self.assertTrue(np.allclose(np.polynomial.chebyshev.chebval([0.2, 0.7], ccos), np.cos([0.5, 1.75])))
+        self.assertTrue(np.allclose(np.polynomial.chebyshev.chebval([0.2, 0.7], csin), np.sin([0.5, 1.75])))
+        self.assertAlmostEqual(np.polynomial.chebyshev.chebval(0, cfilt), 1)
+        for method_enc in qib.operator.BlockEncodingMethod:
+            block = qib.BlockEncodingGate(H, method_enc)
+            block.set_auxiliary_qubits(q_enc)
+            processing = qib.algorithms.qubitization.ProjectorControlledPhaseShift(0., [0], q_enc, q_anc, "c-phase")
+            eigen_transform = qib.algorithms.qubitization.EigenvalueTransformation(block, processing)
+            for coeffs in [0.5*ccos, 0.5*csin, 0.8*cfilt]:
+                eigen_transform.set_polynomial(coeffs)
+                self.assertEqual(len(eigen_transform.theta_seq), len(coeffs) - 1)
+                evals, _, blocks = eigen_transform.spectral_blocks()
+                self.assertTrue(np.allclose(blocks[:, 0, 0].real, np.polynomial.chebyshev.chebval(evals, coeffs)))
+            # compare with circuit for small degree
+            eigen_transform.set_polynomial([0, 0.3, 0, -0.2])
+            circ_mat = eigen_transform.as_circuit().as_matrix([field2, field1]).toarray()[:2**4, :2**4]
+            hmat = H.as_matrix().toarray()
+            pmat = 0.3*hmat - 0.2*(4*hmat @ hmat @ hmat - 3*hmat)
+            self.assertTrue(np.allclose(0.5*(circ_mat + circ_mat.conj().T), pmat))
+
 
 if __name__ == "__main__":
     unittest.main()
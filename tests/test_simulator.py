@@ -34,6 +34,120 @@ class TestSimulator(unittest.TestCase):
         tens_out = qib.simulator.TensorNetworkSimulator().run(circuit, [field1, field2], None)
         self.assertTrue(np.allclose(tens_out.reshape(-1), psi_ref))
 
+    def test_expectation(self):
+        """
+        Test computation of expectation values by tensor network contraction.
+        """
+        rng = np.random.default_rng()
+        L = 6
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((L,)))
+        q = [qib.field.Qubit(field, i) for i in range(L)]
+        # brickwall circuit
+        circuit = qib.Circuit()
+        for layer in range(3):
+            for i in range(L):
+                circuit.append_gate(qib.RxGate(rng.uniform(0, 2*np.pi), q[i]))
+            for i in range(layer % 2, L - 1, 2):
+                circuit.append_gate(qib.ControlledGate(qib.PauliXGate(q[i + 1]), 1).set_control(q[i]))
+        psi = qib.simulator.StatevectorSimulator().run(circuit, [field], None)
+        sim = qib.simulator.TensorNetworkSimulator()
+        # Hamiltonian as observable
+        H = qib.HeisenbergHamiltonian(field, rng.normal(size=3), rng.normal(size=3)).as_pauli_operator()
+        self.assertAlmostEqual(sim.expectation(circuit, [field], H), np.vdot(psi, H.as_matrix() @ psi).real)
+        # single Pauli string
+        P = qib.PauliString.from_single_paulis(L, ('X', 0), ('Y', 2), ('Z', 3), q=3)
+        self.assertTrue(np.allclose(sim.expectation(circuit, [field], P), np.vdot(psi, P.as_matrix() @ psi)))
+        # local observable
+        cz = qib.ControlledGate(qib.PauliZGate(q[4]), 1).set_control(q[1])
+        self.assertAlmostEqual(sim.expectation(circuit, [field], cz), np.vdot(psi, cz.as_circuit_matrix([field]) @ psi).real)
+
+    def test_amplitudes(self):
+        """
+        Test computation of amplitudes by tensor network contraction.
+        """
+        rng = np.random.default_rng()
+        L = 6
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((L,)))
+        q = [qib.field.Qubit(field, i) for i in range(L)]
+        # brickwall circuit
+        circuit = qib.Circuit()
+        for layer in range(3):
+            for i in range(L):
+                circuit.append_gate(qib.RxGate(rng.uniform(0, 2*np.pi), q[i]))
+            for i in range(layer % 2, L - 1, 2):
+                circuit.append_gate(qib.ControlledGate(qib.PauliXGate(q[i + 1]), 1).set_control(q[i]))
+        psi = qib.simulator.StatevectorSimulator().run(circuit, [field], None)
+        sim = qib.simulator.TensorNetworkSimulator()
+        self.assertAlmostEqual(sim.amplitude(circuit, [field], "010011"), psi[0b010011])
+        bitstrings = rng.integers(0, 2, size=(5, L))
+        self.assertTrue(np.allclose(sim.amplitudes(circuit, [field], bitstrings),
+                                    [psi[int("".join(str(b) for b in bs), 2)] for bs in bitstrings]))
+        # leave wires 1 and 4 open
+        bitstrings = rng.integers(0, 2, size=(3, L - 2))
+        amps = sim.amplitudes(circuit, [field], bitstrings, open_wires=[4, 1])
+        self.assertEqual(amps.shape, (3, 2, 2))
+        psi = psi.reshape(L*[2])
+        for bs, amp in zip(bitstrings, amps):
+            self.assertTrue(np.allclose(amp, psi[bs[0], :, bs[1], bs[2], :, bs[3]]))
+
+    def test_mps_simulation(self):
+        """
+        Test matrix product state simulation of a quantum circuit.
+        """
+        rng = np.random.default_rng()
+        L = 7
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((L,)))
+        q = [qib.field.Qubit(field, i) for i in range(L)]
+        # brickwall circuit
+        circuit = qib.Circuit()
+        for layer in range(4):
+            for i in range(L):
+                circuit.append_gate(qib.RxGate(rng.uniform(0, 2*np.pi), q[i]))
+                circuit.append_gate(qib.RzGate(rng.uniform(0, 2*np.pi), q[i]))
+            for i in range(layer % 2, L - 1, 2):
+                circuit.append_gate(qib.ControlledGate(qib.PauliXGate(q[i + 1]), 1).set_control(q[i]))
+        # gates acting on non-adjacent wires
+        circuit.append_gate(qib.ControlledGate(qib.PauliZGate(q[1]), 1).set_control(q[5]))
+        circuit.append_gate(qib.ControlledGate(qib.PauliXGate(q[3]), 2).set_control(q[6], q[0]))
+        psi = qib.simulator.StatevectorSimulator().run(circuit, [field], None)
+        mps = qib.simulator.MPSSimulator().run(circuit, [field], None)
+        self.assertEqual(mps.nsites, L)
+        self.assertTrue(np.allclose(mps.as_vector(), psi))
+        self.assertLess(mps.truncation_error, 1e-12)
+        # truncated simulation
+        mps = qib.simulator.MPSSimulator(max_bond_dim=2).run(circuit, [field], None)
+        self.assertTrue(all(chi <= 2 for chi in mps.bond_dims))
+        self.assertGreater(mps.truncation_error, 1e-3)
+        self.assertAlmostEqual(mps.norm(), 1)
+
+    def test_mps_non_unitary_operator(self):
+        """
+        Test application of non-unitary operators to a matrix product state.
+        """
+        rng = np.random.default_rng()
+        L = 4
+        mps = qib.tensor_network.MatrixProductState.basis_state(L * [2])
+        # entangle neighboring sites
+        for i in range(L - 1):
+            u, _ = np.linalg.qr(qib.util.crandn((4, 4), rng))
+            mps.apply_operator(u, [i, i + 1])
+        psi = mps.as_vector()
+        self.assertAlmostEqual(mps.norm(), 1)
+        # without truncation
+        mps.apply_operator(2*np.identity(4), [0, 1])
+        self.assertAlmostEqual(mps.norm(), 2)
+        self.assertTrue(np.allclose(mps.as_vector(), 2*psi))
+        a = qib.util.crandn((4, 4), rng)
+        mps.apply_operator(a, [1, 3])
+        psi_ref = np.einsum(a.reshape((2, 2, 2, 2)), [1, 3, 5, 7],
+                            2*psi.reshape(L * [2]), [0, 5, 2, 7], [0, 1, 2, 3]).reshape(-1)
+        self.assertTrue(np.allclose(mps.as_vector(), psi_ref))
+        # with truncation, the norm is retained
+        nrm = mps.norm()
+        discarded = mps.apply_operator(3*np.identity(4), [1, 2], max_bond_dim=1)
+        self.assertGreater(discarded, 0)
+        self.assertAlmostEqual(mps.norm(), 3*nrm)
+
 
 if __name__ == "__main__":
     unittest.main()
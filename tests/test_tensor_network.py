@@ -44,6 +44,10 @@ class TestTensorNetwork(unittest.TestCase):
         self.assertEqual(axes_map_einsum, axes_map_tree)
         # compare einsum with tree contraction
         self.assertTrue(np.allclose(net1_einsum_contracted, net1_tree_contracted))
+        # greedy contraction ordering
+        net1_greedy_contracted, axes_map_greedy, _ = net1.contract_tree()
+        self.assertTrue(np.allclose(qib.tensor_network.tensor_network.to_full_tensor(net1_greedy_contracted, axes_map_greedy),
+                                    qib.tensor_network.tensor_network.to_full_tensor(net1_einsum_contracted, axes_map_einsum)))
 
         # probe axes permutations
         node = tree.children[0].children[1].children[1]
@@ -99,6 +103,77 @@ class TestTensorNetwork(unittest.TestCase):
         self.assertTrue(np.array_equal(net3.contract_einsum()[0], a))
         self.assertTrue(np.array_equal(net3.contract_tree(0)[0], a))
 
+    def test_full_tensor(self):
+        """
+        Test generation of the full tensor from a compressed tensor.
+        """
+        rng = np.random.default_rng()
+
+        tensor = rng.normal(size=(3, 4, 2))
+        # output axes 0 and 3 as well as 1 and 4 form a "diagonal"
+        axes_map = [1, 0, 2, 1, 0]
+        ft = qib.tensor_network.tensor_network.to_full_tensor(tensor, axes_map)
+        self.assertEqual(ft.shape, (4, 3, 2, 4, 3))
+        # reference calculation
+        ft_ref = np.zeros_like(ft)
+        for i in range(4):
+            for j in range(3):
+                ft_ref[i, j, :, i, j] = tensor[j, i, :]
+        self.assertTrue(np.array_equal(ft, ft_ref))
+        # lazy view of full tensor
+        ftv = qib.tensor_network.tensor_network.to_full_tensor(tensor, axes_map, lazy=True)
+        self.assertEqual(ftv.shape, ft.shape)
+        self.assertEqual(ftv[3, 1, 0, 3, 1], ft[3, 1, 0, 3, 1])
+        self.assertEqual(ftv[3, 1, 0, 2, 1], 0)
+        self.assertTrue(np.array_equal(np.asarray(ftv), ft_ref))
+        # axes permutation only
+        ft = qib.tensor_network.tensor_network.to_full_tensor(tensor, [2, 0, 1])
+        self.assertTrue(np.array_equal(ft, tensor.transpose((2, 0, 1))))
+
+    def test_simplify(self):
+        """
+        Test simplification of a tensor network.
+        """
+        rng = np.random.default_rng()
+        L = 5
+        field = qib.field.Field(qib.field.ParticleType.QUBIT, qib.lattice.IntegerLattice((L,)))
+        q = [qib.field.Qubit(field, i) for i in range(L)]
+        # brickwall circuit
+        circuit = qib.Circuit()
+        for layer in range(3):
+            for i in range(L):
+                circuit.append_gate(qib.RyGate(rng.uniform(0, 2*np.pi), q[i]))
+            for i in range(layer % 2, L - 1, 2):
+                circuit.append_gate(qib.ControlledGate(qib.PauliXGate(q[i + 1]), 1).set_control(q[i]))
+        # circuit followed by its inverse
+        inv_circuit = qib.Circuit([g.inverse() for g in reversed(circuit.gates)])
+        net = circuit.as_tensornet([field])
+        net.merge(inv_circuit.as_tensornet([field]), [(i, L + i) for i in range(L)])
+        net.simplify()
+        self.assertTrue(net.is_consistent())
+        self.assertEqual(net.num_tensors, 0)
+        self.assertTrue(np.array_equal(qib.tensor_network.tensor_network.to_full_tensor(*net.contract_einsum()).reshape((2**L, 2**L)),
+                                       np.identity(2**L)))
+        # sandwich of local observable between circuit and its conjugate
+        builder = qib.tensor_network.CircuitNetworkBuilder(L*[2])
+        builder.append(qib.PauliZGate().as_tensornet(), [0])
+        net = builder.build()
+        ket = circuit.as_tensornet([field])
+        net.merge(ket, [(L + i, i) for i in range(L)])
+        net.merge(ket.conj(), [(i, i) for i in range(L)])
+        ref = qib.tensor_network.tensor_network.to_full_tensor(*net.contract_einsum())
+        self.assertEqual(net.num_tensors, 1 + 2*len(circuit.gates))
+        net.simplify()
+        self.assertTrue(net.is_consistent())
+        # only the backward light cone of the observable remains (4 controlled-NOT
+        # and 9 rotation gates per circuit copy), with rotations absorbed into
+        # neighboring tensors where possible, resulting in the 4 controlled-NOT
+        # and 3 single-qubit tensors per circuit copy and the observable
+        self.assertEqual(net.num_tensors, 15)
+        # distinct data for each absorbed tensor
+        self.assertEqual(len(net.data), 15)
+        self.assertTrue(np.allclose(qib.tensor_network.tensor_network.to_full_tensor(*net.contract_einsum()), ref))
+
 
 if __name__ == "__main__":
     unittest.main()
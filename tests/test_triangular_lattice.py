@@ -1,6 +1,7 @@
 import unittest
 import numpy as np
 import qib
+from lattice_test_util import assert_edge_layers
 
 
 class TestTriangularLattice(unittest.TestCase):
@@ -82,6 +83,32 @@ class TestTriangularLattice(unittest.TestCase):
                             adj_ref[i, j] = 1
                 self.assertTrue(np.array_equal(adj, adj_ref))
 
+    def test_lattice_edges(self):
+        """
+        Test sparse adjacency matrices and edge lists.
+        """
+        for shape in [(7,), (3, 4), (5, 5)]:
+            for pbc in [False, True, (False, True), (True, False)]:
+                if not isinstance(pbc, bool) and len(shape) == 1:
+                    continue
+                latt = qib.lattice.TriangularLattice(shape, pbc=pbc)
+                adj = latt.adjacency_matrix()
+                adj_sp = latt.sparse_adjacency_matrix()
+                self.assertEqual(adj_sp.format, "csr")
+                self.assertTrue(np.array_equal(adj_sp.toarray(), adj))
+                self.assertTrue(np.array_equal(latt.edges(), np.argwhere(np.triu(adj, k=1))))
+                # only the sparse adjacency matrix is cached
+                self.assertTrue(all(not isinstance(v, np.ndarray) or v.size < latt.nsites**2
+                                    for v in latt._geometry_cache.values()))
+        # large lattice
+        latt = qib.lattice.TriangularLattice((100, 100), pbc=True)
+        self.assertEqual(latt.sparse_adjacency_matrix().nnz, 6 * latt.nsites)
+        self.assertEqual(len(latt.edges()), 3 * latt.nsites)
+        # cached adjacency must not be affected by modifications of returned matrices
+        adj = latt.sparse_adjacency_matrix()
+        adj.data[:] = 0
+        self.assertEqual(latt.sparse_adjacency_matrix().sum(), 6 * latt.nsites)
+
     def test_lattice_coords(self):
         """
         Test lattice coordinate indexing.
@@ -99,6 +126,25 @@ class TestTriangularLattice(unittest.TestCase):
                 for i in range(latt.nsites):
                     self.assertEqual(i, latt.coord_to_index(latt.index_to_coord(i)))
 
+    def test_edge_coloring(self):
+        """
+        Test partitioning of the edges into layers of disjoint edges.
+        """
+        for shape, pbc in [((5,), False), ((6,), True), ((3, 4), False), ((4, 6), True),
+                           ((3, 2), False), ((4, 2), False), ((6, 2), False), ((2, 5), False),
+                           ((3, 3), (True, False)), ((3, 4), (True, False)), ((4, 3), (False, True)),
+                           ((9, 9), (True, False)), ((6, 7), True), ((3, 3), True), ((5, 5), True)]:
+            latt = qib.lattice.TriangularLattice(shape, pbc=pbc)
+            layers = latt.edge_coloring()
+            assert_edge_layers(self, latt, layers)
+            # optimal number of layers
+            degrees = latt.adjacency_matrix().sum(axis=1)
+            nlayers = np.max(degrees)
+            if np.all(degrees == nlayers) and latt.nsites % 2 == 1:
+                # each layer can cover at most nsites - 1 sites
+                nlayers += 1
+            self.assertEqual(len(layers), nlayers)
+
 
 if __name__ == "__main__":
     unittest.main()